@@ -0,0 +1,645 @@
+"""An asyncio interface to `MORSE <http://morse.openrobots.org>`_.
+
+This module offers the same API as :py:class:`pymorse.Morse`, for
+programs based on `asyncio <https://docs.python.org/3/library/asyncio.html>`_
+(it requires Python 3.7 or later). It does not use any thread: the
+simulator connections are handled by the event loop of the program.
+
+.. code-block:: python
+
+    import asyncio
+    from pymorse.aio import AsyncMorse
+
+    async def main():
+        async with AsyncMorse() as simu:
+
+            # calls a service, and waits for its result
+            print(await simu.r2d2.motion.get_status())
+
+            # waits for the next pose
+            print(await simu.r2d2.pose.get())
+
+            # iterates over the poses, as they are received
+            async for pose in simu.r2d2.pose:
+                if pose['x'] > 10.0:
+                    break
+
+    asyncio.run(main())
+
+Services are coroutines: cancelling the task which awaits a service
+cancels the service in the simulator.
+
+The streams read the data received from the simulator in reusable
+buffers: the messages are split in place, and the payload of binary
+frames (see :py:class:`pymorse.stream.StreamFrame`) is written directly in
+a ring of preallocated bytearrays.
+"""
+import os
+import json
+import asyncio
+import logging
+import itertools
+from collections import deque
+
+from .stream import MSG_SEPARATOR, FRAME_HEADER, Frame, _NOT_DECODED
+from .pymorse import parse_response, rpc_get_result, normalize_name, \
+                     attach_component, group_robots, MorseServiceFailed, \
+                     MorseServiceError, MorseServicePreempted
+
+logger = logging.getLogger("pymorse")
+
+# Minimal free space in the buffer of a stream before each read
+READ_SIZE = 65536
+_CLOSED = object()
+
+
+class _LineProtocol(asyncio.BufferedProtocol):
+    """ Read a stream of messages separated by MSG_SEPARATOR in a reusable
+    bytearray """
+    def __init__(self, stream):
+        self._stream = stream
+        self._buffer = bytearray(READ_SIZE)
+        self._start = 0
+        self._end = 0
+
+    def connection_made(self, transport):
+        self._stream._connection_made(transport)
+
+    def connection_lost(self, exc):
+        self._stream._connection_lost(exc)
+
+    def get_buffer(self, sizehint):
+        buf = self._buffer
+        if len(buf) - self._end < READ_SIZE:
+            # move the incomplete message to the beginning of the buffer,
+            # and grow it if it is still too small
+            size = self._end - self._start
+            if self._start:
+                buf[:size] = buf[self._start:self._end]
+                self._start = 0
+                self._end = size
+            if len(buf) - size < READ_SIZE:
+                buf.extend(bytes(max(len(buf), READ_SIZE)))
+        return memoryview(buf)[self._end:]
+
+    def buffer_updated(self, nbytes):
+        buf = self._buffer
+        # only look for a separator in the new data
+        index = buf.find(MSG_SEPARATOR, self._end, self._end + nbytes)
+        self._end += nbytes
+        while index >= 0:
+            self._stream._on_message(buf[self._start:index])
+            self._start = index + 1
+            index = buf.find(MSG_SEPARATOR, self._start, self._end)
+        if self._start == self._end:
+            self._start = self._end = 0
+
+
+class _FrameProtocol(asyncio.BufferedProtocol):
+    """ Read binary frames: the header, then the payload directly in the
+    buffers given by the stream """
+    def __init__(self, stream):
+        self._stream = stream
+        self._header = bytearray(FRAME_HEADER.size)
+        self._fields = None
+        self._view = memoryview(self._header)
+        self._offset = 0
+
+    def connection_made(self, transport):
+        self._stream._connection_made(transport)
+
+    def connection_lost(self, exc):
+        self._stream._connection_lost(exc)
+
+    def get_buffer(self, sizehint):
+        return self._view[self._offset:]
+
+    def buffer_updated(self, nbytes):
+        self._offset += nbytes
+        if self._offset < len(self._view):
+            return
+        if self._fields is None:
+            self._fields = FRAME_HEADER.unpack(self._header)
+            self._view = self._stream._next_view(self._fields[-1])
+            self._offset = 0
+            if self._fields[-1]:
+                return
+        timestamp, width, height, encoding, _ = self._fields
+        self._stream._on_message(Frame(timestamp, width, height, encoding,
+                                       self._view))
+        self._fields = None
+        self._view = memoryview(self._header)
+        self._offset = 0
+
+
+class AsyncStream(object):
+    """ Asynchronous I/O stream handler (raw bytes)
+
+    The asyncio counterpart of :py:class:`pymorse.stream.StreamB`. Open it
+    with :py:meth:`open`:
+
+    .. code-block:: python
+
+        stream = await AsyncStreamJSON.open('localhost', 60000)
+        print(await stream.get())
+        async for message in stream:
+            print(message)
+        stream.close()
+
+    As with :py:class:`pymorse.stream.StreamB`, each message is decoded at
+    most once, when it is first read, unless lazy is False.
+    """
+    protocol_class = _LineProtocol
+
+    def __init__(self, maxlen=100, lazy=True):
+        self.maxlen = maxlen
+        self.lazy = lazy
+        self.transport = None
+        self._in_queue = deque([], maxlen)
+        self._callbacks = []
+        self._waiters = []
+        self._iterators = []
+
+    @classmethod
+    async def open(cls, host='localhost', port=1234, **kwargs):
+        """ Connect to host:port, and return the stream """
+        stream = cls(**kwargs)
+        loop = asyncio.get_running_loop()
+        await loop.create_connection(lambda: stream.protocol_class(stream),
+                                     host, port)
+        return stream
+
+    def is_up(self):
+        return self.transport is not None and not self.transport.is_closing()
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self._callbacks.remove(callback)
+
+    def close(self):
+        if self.transport:
+            self.transport.close()
+
+    def _connection_made(self, transport):
+        self.transport = transport
+
+    def _connection_lost(self, exc):
+        if exc:
+            logger.warning("stream closed: %s" % exc)
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        del self._waiters[:]
+        for queue in self._iterators:
+            _put(queue, _CLOSED)
+
+    #### IN ####
+    def _on_message(self, raw):
+        # [raw message, decoded message]
+        entry = [raw, _NOT_DECODED]
+        self._in_queue.append(entry)
+        if self.lazy and not (self._waiters or self._iterators or
+                              self._callbacks):
+            return
+        msg = self._decoded(entry)
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(msg)
+        del self._waiters[:]
+        for queue in self._iterators:
+            _put(queue, msg)
+        for callback in self._callbacks:
+            callback(msg)
+
+    def _decoded(self, entry):
+        decoded_msg = entry[1]
+        if decoded_msg is _NOT_DECODED:
+            decoded_msg = entry[1] = self.decode(entry[0])
+        return decoded_msg
+
+    def last(self, n=None):
+        """ get the last message received, or the list of the n last
+        messages (oldest first) if n is given
+
+        :returns: decoded message or None if no message available
+        """
+        if n is None:
+            return self._decoded(self._in_queue[-1]) if self._in_queue else None
+        entries = list(self._in_queue)[-n:] if n > 0 else []
+        return [self._decoded(entry) for entry in entries]
+
+    async def get(self, timeout=None):
+        """ wait :param timeout: for a new message
+
+        :returns: decoded message or None in case of timeout, or if the
+                  stream is closed
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            logger.debug("get: timed out")
+            return None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        """ Yield the messages received from now on, until the stream is
+        closed. If the consumer is too slow, the oldest messages are
+        dropped (at most maxlen messages are kept). """
+        queue = asyncio.Queue(self.maxlen)
+        self._iterators.append(queue)
+        try:
+            while True:
+                msg = await queue.get()
+                if msg is _CLOSED:
+                    return
+                yield msg
+        finally:
+            self._iterators.remove(queue)
+
+    #### OUT ####
+    def publish(self, msg):
+        """ encode :param msg: and write the resulting bytes """
+        self.transport.write(self.encode(msg))
+
+    #### CODEC ####
+    def decode(self, msg_bytes):
+        """ returns message as is (raw bytes) """
+        return bytes(msg_bytes)
+
+    def encode(self, msg_bytes):
+        """ returns message as is (raw bytes) plus the MSG_SEPARATOR """
+        return msg_bytes + MSG_SEPARATOR
+
+
+def _put(queue, msg):
+    """ Add msg to queue, dropping the oldest message if it is full """
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(msg)
+
+
+class AsyncStreamJSON(AsyncStream):
+    """ JSON Stream """
+    def decode(self, msg_bytes):
+        return json.loads(msg_bytes)
+
+    def encode(self, msg_obj):
+        return json.dumps(msg_obj).encode() + MSG_SEPARATOR
+
+
+class AsyncStreamMultiplexed(AsyncStreamJSON):
+    """ JSON Stream on a MORSE multiplexed datastream port, see
+    :py:class:`pymorse.stream.StreamMultiplexed` """
+    def __init__(self, name='', maxlen=100, lazy=True):
+        AsyncStreamJSON.__init__(self, maxlen, lazy)
+        self.name = name
+        self._prefix_len = len(name.encode()) + 1
+
+    def _connection_made(self, transport):
+        AsyncStreamJSON._connection_made(self, transport)
+        transport.write(("subscribe %s" % self.name).encode() + MSG_SEPARATOR)
+
+    def decode(self, msg_bytes):
+        return json.loads(msg_bytes[self._prefix_len:])
+
+    def encode(self, msg_obj):
+        return ("publish %s %s" % (self.name, json.dumps(msg_obj))).encode() \
+                + MSG_SEPARATOR
+
+
+class AsyncStreamFrame(AsyncStream):
+    """ Binary frame stream, see :py:class:`pymorse.stream.StreamFrame`
+
+    The payloads are read in a ring of preallocated bytearrays. A frame
+    is not overwritten while it is one of the maxlen last frames, nor while
+    it is the frame being handled by an iterator: copy its data
+    (``bytes(frame.data)``) if you need to keep it longer.
+    """
+    protocol_class = _FrameProtocol
+
+    def __init__(self, maxlen=2):
+        AsyncStream.__init__(self, maxlen)
+        self._buffers = [bytearray() for _ in range(maxlen + 2)]
+        self._buffer_index = 0
+
+    def _next_view(self, length):
+        self._buffer_index = (self._buffer_index + 1) % len(self._buffers)
+        buf = self._buffers[self._buffer_index]
+        if len(buf) < length:
+            # do not resize in place, old frames may still export it
+            buf = bytearray(length)
+            self._buffers[self._buffer_index] = buf
+        return memoryview(buf)[:length]
+
+    def decode(self, frame):
+        return frame
+
+
+async def open_stream(host, port, stream_format='json', name=''):
+    """ Open the stream of a component, according to the format given by
+    the ``simulation.get_stream_format`` service """
+    if stream_format == 'binary':
+        return await AsyncStreamFrame.open(host, port)
+    elif stream_format == 'multiplexed':
+        return await AsyncStreamMultiplexed.open(host, port, name=name)
+    return await AsyncStreamJSON.open(host, port)
+
+
+class AsyncComponent(object):
+    """ Proxy of a MORSE component
+
+    Its services are exposed as coroutine methods. If the component has a
+    socket datastream, it is opened at the first call to
+    :py:meth:`get`, :py:meth:`last`, :py:meth:`publish` or
+    :py:meth:`subscribe`, or at the first iteration.
+    """
+    def __init__(self, morse, name, fqn, stream = None, port = None,
+                 services = [], stream_format = 'json'):
+        self._morse = morse
+        self.name = name
+        self.fqn = fqn
+        self.stream = None
+        self._port = port
+        self._stream_format = stream_format
+        self._stream_dir = set([s[1] for s in stream or []])
+
+        for service in services:
+            logger.debug("Adding service %s to component %s" % (service, self.name))
+            self._add_service(service)
+
+    def _add_service(self, method):
+        async def innermethod(*args):
+            return await self._morse.rpc(self.fqn, method, *args)
+
+        innermethod.__doc__ = "This method is a proxy for the MORSE %s service." % method
+        innermethod.__name__ = str(method)
+        setattr(self, innermethod.__name__, innermethod)
+
+    async def connect(self):
+        """ Open the datastream of the component, and return it """
+        if self.stream is None:
+            if not self._port:
+                raise MorseServiceError("Component <%s> has no socket "
+                                        "datastream" % self.fqn)
+            self.stream = await open_stream(self._morse.host, self._port,
+                                            self._stream_format, self.fqn)
+            self._morse._streams.append(self.stream)
+        return self.stream
+
+    async def get(self, timeout=None):
+        return await (await self.connect()).get(timeout)
+
+    async def last(self, n=None):
+        return (await self.connect()).last(n)
+
+    async def publish(self, msg):
+        if 'IN' not in self._stream_dir:
+            raise MorseServiceError("Component <%s> has no input "
+                                    "datastream" % self.fqn)
+        (await self.connect()).publish(msg)
+
+    async def subscribe(self, callback):
+        (await self.connect()).subscribe(callback)
+
+    def unsubscribe(self, callback):
+        self.stream.unsubscribe(callback)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        async for msg in await self.connect():
+            yield msg
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+
+
+class AsyncRobot(dict, AsyncComponent):
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+    def __init__(self, morse, name, fqn, services = []):
+        AsyncComponent.__init__(self, morse, name, fqn, None, None, services)
+
+    def __getattr__(self, name):
+        return dict.__getitem__(self, name)
+
+
+class AsyncMorse(object):
+    """ Asyncio proxy of the MORSE simulator
+
+    :param host: the simulator host (default: localhost)
+    :param port: the port of the simulator socket interface (default:
+                 the MORSE_SERVICE_PORT environment variable, or 4000)
+
+    Use it as an asynchronous context manager, or call :py:meth:`connect`
+    and :py:meth:`close`.
+    """
+    def __init__(self, host = "localhost", port = None):
+        if port is None:
+            port = int(os.environ.get('MORSE_SERVICE_PORT', 4000))
+        self.host = host
+        self.port = port
+        self.robots = []
+        self.simulator_service = None
+        self._ids = itertools.count()
+        # request id -> future of the response
+        self._pending = {}
+        self._streams = []
+
+    async def connect(self):
+        """ Connect to the simulator, and create the proxies of the
+        robots and their components """
+        self.simulator_service = await AsyncStream.open(self.host, self.port,
+                                                        maxlen=1)
+        self.simulator_service.subscribe(self._on_response)
+        await self.initialize_api()
+        return self
+
+    def is_up(self):
+        return self.simulator_service is not None and \
+               self.simulator_service.is_up()
+
+    async def initialize_api(self):
+        """ Ask MORSE for the scene structure, and create the
+        corresponding objects in 'self' """
+        details = await self.rpc_t(15, 'simulation', 'details')
+        if not details:
+            raise ValueError("simulation details not available")
+        self.robots = []
+        for robot_detail in details["robots"]:
+            name = normalize_name(robot_detail["name"])
+            self.robots.append(name)
+            robot = AsyncRobot(self, robot_detail['name'], robot_detail['name'],
+                               services = robot_detail.get('services', []))
+            setattr(self, name, robot)
+
+            components = robot_detail["components"]
+            # parents must be created before their children
+            for component in sorted(components.keys()):
+                await self._add_component(robot, component,
+                                          components[component])
+        group_robots(self)
+
+    async def _add_component(self, robot, fqn, details):
+        stream = details.get('stream_interfaces', None)
+        port = None
+        stream_format = 'json'
+        if stream:
+            try:
+                port = await self.get_stream_port(fqn)
+            except MorseServiceFailed:
+                logger.warning('Component <%s> has a non-socket stream: '
+                               'datastream via pymorse not supported', fqn)
+                stream = None
+        if port:
+            try:
+                stream_format = await self.get_stream_format(fqn)
+            except (MorseServiceFailed, MorseServiceError):
+                pass
+
+        name = fqn.split('.')[1:]
+        if not name:
+            logger.error("Component <%s> of robot <%s> has an invalid name!"
+                         % (fqn, robot.name))
+            return
+        attach_component(robot, name,
+                         AsyncComponent(self, name[-1], fqn, stream, port,
+                                        details.get('services', []),
+                                        stream_format))
+
+    def _on_response(self, raw):
+        response = parse_response(raw.decode())
+        future = self._pending.get(response['id'])
+        if future and not future.done():
+            future.set_result(response)
+
+    async def _rpc_send(self, req_id, raw, timeout=None):
+        if not self.is_up():
+            raise RuntimeError("simulation service is down")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = future
+        logger.debug(raw)
+        try:
+            self.simulator_service.publish(raw.encode())
+            response = await asyncio.wait_for(future, timeout)
+        except asyncio.CancelledError:
+            if self.is_up():
+                self.cancel(req_id)
+            raise
+        finally:
+            del self._pending[req_id]
+        return rpc_get_result(response)
+
+    async def rpc(self, component, service, *args):
+        """ Call a service from the simulator, and return its result
+
+        :param component: the component that expose the service (like a robot name)
+        :param service: the name of the service
+        :param args...: (variadic) each service parameter, as a separate argument
+        """
+        return await self.rpc_t(None, component, service, *args)
+
+    async def rpc_t(self, timeout, component, service, *args):
+        """ Same as :py:meth:`rpc`, raising asyncio.TimeoutError if the
+        result is not received within timeout seconds """
+        req_id = str(next(self._ids))
+        raw = "%s %s %s %s" % (req_id, component, service, json.dumps(args))
+        return await self._rpc_send(req_id, raw, timeout)
+
+    async def rpc_batch(self, calls, timeout=None, return_exceptions=False):
+        """ Call several services in a single round-trip, see
+        :py:meth:`pymorse.Morse.rpc_batch` """
+        req_id = str(next(self._ids))
+        batch = [[call[0], call[1], list(call[2:])] for call in calls]
+        raw = "%s batch %s" % (req_id, json.dumps(batch))
+        results = await self._rpc_send(req_id, raw, timeout) or []
+
+        res = []
+        for status, result in results:
+            try:
+                res.append(rpc_get_result({'status': status, 'result': result}))
+            except (MorseServiceError, MorseServiceFailed,
+                    MorseServicePreempted, TypeError) as error:
+                if not return_exceptions:
+                    raise
+                res.append(error)
+        return res
+
+    def cancel(self, service_id):
+        """ Send a cancelation request for an existing (running) service """
+        self.simulator_service.publish(("%i cancel" % int(service_id)).encode())
+
+    async def close(self, cancel_async_services = False):
+        """ Close the connections to the simulator
+
+        Unless cancel_async_services is True, wait for the running services
+        to complete.
+        """
+        pending = list(self._pending.values())
+        if cancel_async_services:
+            for req_id in list(self._pending.keys()):
+                self.cancel(req_id)
+            for future in pending:
+                future.cancel()
+        elif pending:
+            logger.info('Waiting for all asynchronous requests to complete...')
+            await asyncio.wait(pending)
+        for stream in self._streams:
+            stream.close()
+        del self._streams[:]
+        if self.simulator_service:
+            self.simulator_service.close()
+        logger.info('Done. Bye bye!')
+
+    #####################################################################
+    ###### Predefined methods to interact with the simulator
+
+    async def quit(self):
+        await self.rpc("simulation", "quit")
+        await self.close()
+
+    async def reset(self):
+        return await self.rpc("simulation", "reset_objects")
+
+    async def streams(self):
+        return await self.rpc("simulation", "list_streams")
+
+    async def get_stream_port(self, stream):
+        return await self.rpc("simulation", "get_stream_port", stream)
+
+    async def get_stream_format(self, stream):
+        return await self.rpc("simulation", "get_stream_format", stream)
+
+    async def get_all_poses(self):
+        return await self.rpc("simulation", "get_all_poses")
+
+    async def activate(self, cmpnt):
+        return await self.rpc("simulation", "activate", cmpnt)
+
+    async def deactivate(self, cmpnt):
+        return await self.rpc("simulation", "deactivate", cmpnt)
+
+    async def sleep(self, time):
+        """ Wait for time second of simulated time """
+        return await self.rpc("time", "sleep", time)
+
+    async def time(self):
+        """ Return the simulated time, in seconds, since Epoch """
+        return await self.rpc("time", "now")
+
+    #### async with statement ####
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close(exc_type is not None)
+        return False
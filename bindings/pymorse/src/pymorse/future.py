@@ -11,10 +11,22 @@ class MorseFuture():
         self.running = future.running
         self.result = future.result
         self.exception = future.exception
-        self.add_done_callback = future.add_done_callback
 
         self.rqst_id = rqst_id
         self._morse = morse
+        self._future = future
+
+    def add_done_callback(self, fn):
+        """ Call fn(future) once the future is done, in a thread of the
+        executor of morse: the futures of the services are resolved by the
+        thread reading the responses of the simulator, which must not be
+        blocked by the callbacks (which may call other services). """
+        executor = getattr(self._morse, 'executor', None)
+        if executor is None:
+            self._future.add_done_callback(fn)
+        else:
+            self._future.add_done_callback(
+                    lambda future: executor.run_callback(fn, future))
 
     def cancel(self):
         self._morse.cancel(self.rqst_id)
@@ -65,6 +77,13 @@ class MorseExecutor(ThreadPoolExecutor):
         return mf
 
 
+    def run_callback(self, fn, future):
+        try:
+            ThreadPoolExecutor.submit(self, fn, future)
+        except RuntimeError:
+            # the executor is shut down
+            fn(future)
+
     def cancel_all(self):
         for f in self.futures:
             if not f.done():
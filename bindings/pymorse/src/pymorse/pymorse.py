@@ -202,6 +202,12 @@ below:
 Use the `cancel` method on the `future` returned by the RPC call to
 abort the service.
 
+The requests are sent at once, and no thread waits for their responses: a
+single dispatcher routes each response to the future of its request, so
+thousands of services (for instance, a `goto` on each robot of a fleet) can
+be pending at the same time. The callbacks registered with
+`add_done_callback` run in a pool of threads, and may call other services.
+
 To actually wait for a result, call the `result` method on the future:
 
 .. code-block:: python
@@ -228,6 +234,36 @@ be rewritten:
         if simu.r2d2.motion.get_status() == "Arrived":
             print("Here we are")
 
+To call many services at once (for instance, to read the state of a whole
+fleet), use `rpc_batch`: all the calls are sent in one request, and their
+results come back together:
+
+.. code-block:: python
+
+    import pymorse
+
+    with pymorse.Morse() as simu:
+
+        poses = simu.rpc_batch([(robot, 'get_local_data') for robot in
+                                ['r2d2.pose', 'c3po.pose']])
+
+
+asyncio
+-------
+
+Programs based on `asyncio` can use :py:class:`pymorse.aio.AsyncMorse`
+instead, which offers the same API with coroutines and asynchronous
+iterators over the streams:
+
+.. code-block:: python
+
+    from pymorse.aio import AsyncMorse
+
+    async def main():
+        async with AsyncMorse() as simu:
+            async for pose in simu.r2d2.pose:
+                print(pose)
+
 
 Simulator control
 -----------------
@@ -291,14 +327,18 @@ configure it to print debug messages on the console.
             print('Oups! An error occured!')
             print(mse)
 """
+import os
 import json
 import logging
 import asyncore
 import threading
+import itertools
 import re
+from concurrent.futures import Future, TimeoutError, wait
 
-from .future import MorseExecutor
-from .stream import Stream, StreamJSON, PollThread
+from .future import MorseExecutor, MorseFuture
+from .stream import Stream, StreamJSON, StreamFrame, StreamMultiplexed, \
+                    PollThread
 
 logger = logging.getLogger("pymorse")
 logger.setLevel(logging.WARNING)
@@ -321,7 +361,8 @@ class MorseServicePreempted(Exception):
 
 
 class Component(object):
-    def __init__(self, morse, name, fqn, stream = None, port = None, services = []):
+    def __init__(self, morse, name, fqn, stream = None, port = None, services = [],
+                 stream_format = 'json'):
         self._morse = morse
         self.name = name
         self.fqn = fqn # fully qualified name
@@ -329,6 +370,7 @@ class Component(object):
         self.stream = None
         self._init = False
         self._port = port
+        self._stream_format = stream_format
         if not stream:
             self._stream_dir = set()
         else:
@@ -343,9 +385,16 @@ class Component(object):
             return
 
         if self._port:
-            self.stream = StreamJSON(self._morse.host, self._port)
-
-            if 'IN' in self._stream_dir:
+            if self._stream_format == 'binary':
+                self.stream = StreamFrame(self._morse.host, self._port)
+            elif self._stream_format == 'multiplexed':
+                self.stream = StreamMultiplexed(self._morse.host, self._port,
+                                                self.fqn)
+            else:
+                self.stream = StreamJSON(self._morse.host, self._port)
+
+            # binary frame streams are only published by MORSE
+            if 'IN' in self._stream_dir and self._stream_format != 'binary':
                 self.publish = self.stream.publish
             if 'OUT' in self._stream_dir:
                 self.get = self.stream.get
@@ -359,11 +408,9 @@ class Component(object):
         def innermethod(*args):
             logger.debug("Sending asynchronous request %s with args %s." % (method, args))
             req = self._morse._rpc_request(self.fqn, method, *args)
-            future = self._morse.executor.submit(self._morse._rpc_process, req)
-            #TODO: find a way to throw an execption in the main thread
-            # if the RPC request fails at invokation for stupid reasons
-            # like wrong # of params
-            return future
+            # The request is sent at once, and its future is resolved by
+            # the ResponseDispatcher: no thread waits for the response
+            return self._morse._rpc_future(req)
 
         innermethod.__doc__ = "This method is a proxy for the MORSE %s service." % method
         innermethod.__name__ = str(method)
@@ -399,6 +446,45 @@ def normalize_name(name):
         normalized = normalized.replace(illegal, "_")
     return normalized
 
+def attach_component(robot, name, cmpt):
+    """ Add the component cmpt to robot, name being the list of the tokens
+    of its fully qualified name, without the robot name """
+    if len(name) == 1: # this component belongs to the robot directly.
+        robot[name[0]] = cmpt
+    else:
+        subcmpt = robot[name[0]]
+        for sub in name[1:-1]:
+            subcmpt = getattr(subcmpt, sub)
+
+        if hasattr(subcmpt, name[-1]): # pathologic cmpt name!
+            raise RuntimeError("Sub-component name <%s> conflicts with"
+                    "<%s.%s> member. To use pymorse with this scenario,"
+                    "please change the name of the sub-component." %
+                    (name[-1], subcmpt.name, name[-1]))
+        setattr(subcmpt, name[-1], cmpt)
+
+def group_robots(morse):
+    """ Handle robots created in loop.
+
+    Basically, consider robot where name match the pattern 'robot_XXX'
+    and puts them in a list called 'robots', allowing to iterate easily on
+    them
+    """
+    robot_names = morse.robots[:]
+    robot_names.sort()
+    while robot_names:
+        name = robot_names.pop(0)
+        regexp_name = "^" + name + "_[0-9]{3}$"
+        regexp = re.compile(regexp_name)
+        loop_name = [name for name in robot_names if regexp.match(name)]
+        if loop_name:
+            list_robots = []
+            list_robots.append(getattr(morse, name))
+            for _name in loop_name:
+                list_robots.append(getattr(morse, _name))
+                robot_names.remove(_name)
+            setattr(morse, name + "s", list_robots)
+
 def parse_response(raw):
     result = None
     try:
@@ -438,41 +524,101 @@ def rpc_get_result(response):
     else:
         raise MorseServiceError(result)
 
-class ResponseCallback:
-    _conditions = []
-    def __init__(self, req_id):
-        self.request_id = req_id
-        self.response = None
-        self.condition = threading.Condition()
-        ResponseCallback._conditions.append(self.condition)
-
-    def callback(self, res_bytes):
-        response = parse_response(res_bytes)
-        if response['id'] == self.request_id:
-            self.response = response
-            with self.condition:
-                ResponseCallback._conditions.remove(self.condition)
-                self.condition.notify_all()
-
-    def cancel_all():
-        for condition in ResponseCallback._conditions:
-            with condition:
-                condition.notify_all()
-        del ResponseCallback._conditions[:] # clear list
+class ResponseDispatcher(object):
+    """ Route the responses of the simulator to the pending requests
+
+    A single dispatcher is subscribed to the service stream of a
+    :py:class:`Morse` instance. Each response is parsed once, and resolves
+    the future of its request, found by id: the cost of a response does
+    not depend on the number of pending requests.
+
+    The futures are resolved with the result of the service, or with the
+    exception raised by :py:func:`rpc_get_result`.
+    """
+    def __init__(self, stream):
+        self._lock = threading.Lock()
+        # request id -> Future
+        self._pending = {}
+        self._stream = stream
+        stream.subscribe(self.dispatch)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def register(self, req_id):
+        """ Return the future of the response to the request req_id. It
+        must be called before sending the request. """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            self._pending[req_id] = future
+        return future
+
+    def forget(self, req_id):
+        """ Stop waiting for the response to the request req_id """
+        with self._lock:
+            self._pending.pop(req_id, None)
+
+    def pending(self):
+        """ Return the ids of the requests waiting for a response """
+        with self._lock:
+            return list(self._pending.keys())
+
+    def dispatch(self, raw):
+        try:
+            response = parse_response(raw)
+            req_id = response['id']
+        except ValueError as error:
+            logger.error("Invalid response from MORSE: <%s>" % raw)
+            response = None
+            req_id = raw.split(' ', 1)[0]
+        with self._lock:
+            future = self._pending.pop(req_id, None)
+        if future is None:
+            logger.debug("No pending request for response %s" % raw)
+            return
+        try:
+            if response is None:
+                raise MorseServiceError("invalid response: %s" % raw)
+            future.set_result(rpc_get_result(response))
+        except Exception as error:
+            future.set_exception(error)
+
+    def wait_all(self, timeout=None):
+        """ Wait for the responses of all the pending requests """
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures, timeout)
+
+    def cancel_all(self):
+        """ Fail all the pending requests, without waiting for their
+        responses """
+        with self._lock:
+            futures = list(self._pending.values())
+            self._pending.clear()
+        for future in futures:
+            future.set_exception(RuntimeError("request cancelled"))
+
+    def close(self):
+        self._stream.unsubscribe(self.dispatch)
 
 class Morse(object):
     poll_thread = None
-    def __init__(self, host = "localhost", port = 4000):
+    def __init__(self, host = "localhost", port = None):
         """ Creates an instance of the MORSE simulator proxy.
 
         This is the main object you need to instanciate to communicate with the simulator.
 
         :param host: the simulator host (default: localhost)
-        :param port: the port of the simulator socket interface (default: 4000)
+        :param port: the port of the simulator socket interface (default:
+                     the MORSE_SERVICE_PORT environment variable, or 4000)
         """
+        if port is None:
+            port = int(os.environ.get('MORSE_SERVICE_PORT', 4000))
         self.host = host
         self.simulator_service = Stream(host, port)
-        self.simulator_service_id = 0
+        self._ids = itertools.count()
+        self._dispatcher = ResponseDispatcher(self.simulator_service)
         if not Morse.poll_thread:
             Morse.poll_thread = PollThread()
             Morse.poll_thread.start()
@@ -507,33 +653,35 @@ class Morse(object):
             for component in sorted(components.keys()):
                 self._add_component(robot, component, components[component])
 
-        # Handle robots created in loop. Basically, consider robot where
-        # name match the pattern 'robot_XXX' and puts them in a list
-        # called 'robots', allowing to iterate easily on them
-        robot_names = self.robots[:]
-        robot_names.sort()
-        while robot_names:
-            name = robot_names.pop(0)
-            regexp_name = "^" + name + "_[0-9]{3}$"
-            regexp = re.compile(regexp_name)
-            loop_name = [name for name in robot_names if regexp.match(name)]
-            if loop_name:
-                list_robots = []
-                list_robots.append(getattr(self, name))
-                for _name in loop_name:
-                    list_robots.append(getattr(self, _name))
-                    robot_names.remove(_name)
-                setattr(self, name + "s", list_robots)
+        group_robots(self)
+
+        self._world_state = None
+        try:
+            port = self.get_stream_port('world_state')
+            stream_format = self.get_stream_format('world_state')
+            self._world_state = Component(self, 'world_state', 'world_state',
+                                          [('socket', 'OUT')], port, [],
+                                          stream_format)
+        except (MorseServiceFailed, MorseServiceError):
+            # the world state is not published by this simulation
+            pass
 
     def _add_component(self, robot, fqn, details):
         stream = details.get('stream_interfaces', None)
         port = None
+        stream_format = 'json'
         if stream:
             try:
                 port = self.get_stream_port(fqn)
             except MorseServiceFailed:
                 logger.warn('Component <%s> has a non-socket stream: datastream via pymorse not supported', fqn)
                 stream = None
+        if port:
+            try:
+                stream_format = self.get_stream_format(fqn)
+            except (MorseServiceFailed, MorseServiceError):
+                # simulator without binary streams support
+                pass
 
         services = details.get('services', [])
 
@@ -545,21 +693,10 @@ class Morse(object):
             return
 
         logger.debug("Component %s" % str((name[-1], fqn, stream, port, services)) )
-        cmpt = Component(self, name[-1], fqn, stream, port, services)
+        cmpt = Component(self, name[-1], fqn, stream, port, services,
+                         stream_format)
 
-        if len(name) == 1: # this component belongs to the robot directly.
-            robot[name[0]] = cmpt
-        else:
-            subcmpt = robot[name[0]]
-            for sub in name[1:-1]:
-                subcmpt = getattr(subcmpt, sub)
-
-            if hasattr(subcmpt, name[-1]): # pathologic cmpt name!
-                raise RuntimeError("Sub-component name <%s> conflicts with"
-                        "<%s.%s> member. To use pymorse with this scenario,"
-                        "please change the name of the sub-component." %
-                        (name[-1], subcmpt.name, name[-1]))
-            setattr(subcmpt, name[-1], cmpt)
+        attach_component(robot, name, cmpt)
 
     def rpc_t(self, timeout, component, service, *args):
         req = self._rpc_request(component, service, *args)
@@ -579,29 +716,69 @@ class Morse(object):
 
     def _rpc_request(self, component, service, *args):
         req = {
-            'id': '%i'%self.simulator_service_id,
+            'id': '%i'%next(self._ids),
             'component': component,
             'service': service,
             'args': json.dumps(args),
         }
-        self.simulator_service_id += 1
         return req
 
+    def rpc_batch(self, calls, timeout=None, return_exceptions=False):
+        """ Calls several services from the simulator in a single
+        round-trip.
+
+        The call will block until all the services are completed.
+
+        .. code-block:: python
+
+            x, y = morse.rpc_batch([('robot.pose', 'get_local_data'),
+                                    ('robot2.pose', 'get_local_data')])
+
+        :param calls: a list of (component, service, arg1, arg2, ...) tuples
+        :param timeout: the maximum time to wait for the results (default:
+                        no limit)
+        :param return_exceptions: if True, the exception of a failed service
+                                  is returned in place of its result.
+                                  Otherwise, the first one is raised.
+        :returns: the list of the results, in the order of calls
+        """
+        req_id = '%i'%next(self._ids)
+        batch = [[call[0], call[1], list(call[2:])] for call in calls]
+        raw = "%s batch %s" % (req_id, json.dumps(batch))
+        results = self._rpc_send(req_id, raw, timeout) or []
+
+        res = []
+        for status, result in results:
+            try:
+                res.append(rpc_get_result({'status': status, 'result': result}))
+            except (MorseServiceError, MorseServiceFailed,
+                    MorseServicePreempted, TypeError) as error:
+                if not return_exceptions:
+                    raise
+                res.append(error)
+        return res
+
     def _rpc_process(self, req, timeout=None):
         raw = "{id} {component} {service} {args}".format(**req)
+        return self._rpc_send(req['id'], raw, timeout)
+
+    def _rpc_future(self, req):
+        """ Send the request, and return a MorseFuture of its result,
+        without waiting for the response """
+        raw = "{id} {component} {service} {args}".format(**req)
+        future = self._dispatcher.register(req['id'])
+        logger.debug(raw)
+        self.simulator_service.publish(raw)
+        return MorseFuture(future, self, req['id'])
+
+    def _rpc_send(self, req_id, raw, timeout=None):
+        future = self._dispatcher.register(req_id)
         logger.debug(raw)
-        response_callback = ResponseCallback(req['id'])
-        self.simulator_service.subscribe(response_callback.callback)
+        self.simulator_service.publish(raw)
         try:
-            with response_callback.condition:
-                self.simulator_service.publish(raw)
-                # if self.is_up() and response_callback.condition.wait(timeout):
-                # XXX Python 3.2.2 is_up() returns False when connecting...
-                response_callback.condition.wait(timeout)
-                if response_callback.response:
-                    return rpc_get_result(response_callback.response)
-        finally:
-            self.simulator_service.unsubscribe(response_callback.callback)
+            return future.result(timeout)
+        except TimeoutError:
+            self._dispatcher.forget(req_id)
 
         if not self.is_up():
             raise RuntimeError("simulation service is down")
@@ -630,11 +807,15 @@ class Morse(object):
                     time.sleep(0.001)
         if cancel_async_services:
             logger.info('Cancelling all running asynchronous requests...')
-            ResponseCallback.cancel_all()
+            for req_id in self._dispatcher.pending():
+                self.cancel(req_id)
             self.executor.cancel_all()
+            self._dispatcher.cancel_all()
         else:
             logger.info('Waiting for all asynchronous requests to complete...')
+            self._dispatcher.wait_all()
         self.executor.shutdown(wait = True)
+        self._dispatcher.close()
         # Close all other asyncore sockets (StreanJSON)
         if Morse.poll_thread:
             Morse.poll_thread.syncstop(TIMEOUT)
@@ -662,6 +843,30 @@ class Morse(object):
     def get_stream_port(self, stream):
        return self.rpc("simulation", "get_stream_port", stream)
 
+    def get_stream_format(self, stream):
+       return self.rpc("simulation", "get_stream_format", stream)
+
+    def get_all_poses(self):
+        """ Return the state (pose and velocities) of all the robots, see
+        the ``simulation.get_all_poses`` service """
+        return self.rpc("simulation", "get_all_poses")
+
+    @property
+    def world_state(self):
+        """ The stream publishing the state of all the robots at each step,
+        or None if the socket datastream manager is not configured with
+        ``world_state = True``.
+
+        In binary format, each :py:class:`pymorse.stream.Frame` holds a
+        height x width matrix of little-endian float64 (one row per robot,
+        sorted by name, see :py:meth:`get_all_poses` for the names and the
+        fields): ``numpy.frombuffer(frame.data, '<f8').reshape(frame.height,
+        frame.width)``.
+        """
+        if self._world_state:
+            self._world_state.lazy_init()
+        return self._world_state
+
     def activate(self, cmpnt):
         return self.rpc("simulation", "activate", cmpnt)
 
@@ -7,6 +7,7 @@ s.publish("GET /\r\n")
 s.get(.5) or s.last()
 """
 import json
+import struct
 import socket
 import logging
 import asyncore
@@ -21,6 +22,20 @@ logger.setLevel(logging.WARNING)
 
 MSG_SEPARATOR=b"\n"
 
+# Header of MORSE binary frames: timestamp, width, height, encoding and
+# length of the raw buffer which follows.
+# Keep in sync with morse.middleware.socket_datastream.BINARY_HEADER
+FRAME_HEADER = struct.Struct('<dIIII')
+
+ENCODING_RAW = 0
+ENCODING_RGBA8 = 1
+ENCODING_MONO8 = 2
+ENCODING_XYZ32F = 3
+ENCODING_STATE64F = 4
+
+# Marks a message of the input queue which has not been decoded yet
+_NOT_DECODED = object()
+
 class PollThread(threading.Thread):
     def __init__(self, timeout=0.01):
         threading.Thread.__init__(self)
@@ -41,16 +56,25 @@ class StreamB(asynchat.async_chat):
     threading.Thread( target = asyncore.loop, kwargs = {'timeout': .1} ).start()
 
     where timeout is used with select.select / select.poll.poll.
+
+    The input queue keeps the raw messages along with their decoded value:
+    each message is decoded at most once, when it is first read (or
+    given to the callbacks). With lazy=False, the messages are decoded as
+    soon as they are received, by the polling thread, even if nobody
+    reads them.
     """
 
     use_encoding = 0 # Python2 compat.
 
-    def __init__(self, host='localhost', port='1234', maxlen=100, sock=None):
+    def __init__(self, host='localhost', port='1234', maxlen=100, sock=None,
+                 lazy=True):
         self.error = False
+        self.lazy = lazy
         if not sock:
             sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_STREAM)
             sock.connect( (host, port) )
-        self._in_buffer  = b""
+        # chunks of the message being received, joined once it is complete
+        self._in_chunks  = []
         self._in_queue   = deque([], maxlen)
         self._callbacks  = []
         self._cv_new_msg = threading.Condition()
@@ -85,40 +109,59 @@ class StreamB(asynchat.async_chat):
     #### IN ####
     def collect_incoming_data(self, data):
         """Buffer the data"""
-        self._in_buffer += data
+        self._in_chunks.append(data)
+
+    def _pop_incoming_data(self):
+        data = b"".join(self._in_chunks)
+        del self._in_chunks[:]
+        return data
 
     def found_terminator(self):
-        self.handle_msg(self._in_buffer)
-        self._in_buffer = b""
+        self.handle_msg(self._pop_incoming_data())
 
     def handle_msg(self, msg):
         """ append new raw :param msg: in the input queue
 
         and call subscribed callback methods if any
         """
+        # [raw message, decoded message]
+        entry = [msg, _NOT_DECODED]
+        if not self.lazy:
+            self._decoded(entry)
         with self._cv_new_msg:
-            self._in_queue.append(msg)
+            self._in_queue.append(entry)
             self._cv_new_msg.notify_all()
         # handle callback(s)
-        decoded_msg = None
-        for callback in self._callbacks:
-            if not decoded_msg:
-                decoded_msg = self.decode( msg )
-            callback( decoded_msg )
+        if self._callbacks:
+            decoded_msg = self._decoded(entry)
+            for callback in self._callbacks:
+                callback( decoded_msg )
+
+    def _decoded(self, entry):
+        """ Return the decoded message of an entry of the input queue,
+        decoding it if it is the first access """
+        decoded_msg = entry[1]
+        if decoded_msg is _NOT_DECODED:
+            decoded_msg = entry[1] = self.decode(entry[0])
+        return decoded_msg
 
     def _msg_available(self):
         return bool(self._in_queue)
 
     def _get_last_msg(self):
-        return self.decode( self._in_queue[-1] )
+        return self._decoded(self._in_queue[-1])
 
-    # TODO implement last n msg decode and msg_queue with hash(msg) -> decoded msg
-    def last(self, n=1):
-        """ get the last message received
+    def last(self, n=None):
+        """ get the last message received, or the list of the n last
+        messages received (oldest first) if n is given
 
-        :returns: decoded message or None if no message available
+        :returns: decoded message or None if no message available (or a
+                  list of at most n decoded messages)
         """
         with self._cv_new_msg:
+            if n is not None:
+                entries = list(self._in_queue)[-n:] if n > 0 else []
+                return [self._decoded(entry) for entry in entries]
             if self._msg_available():
                 return self._get_last_msg()
         logger.debug("last: no message in queue")
@@ -192,8 +235,9 @@ class StreamB(asynchat.async_chat):
 
 class Stream(StreamB):
     """ String Stream """
-    def __init__(self, host='localhost', port='1234', maxlen=100, sock=None):
-        StreamB.__init__(self, host, port, maxlen, sock)
+    def __init__(self, host='localhost', port='1234', maxlen=100, sock=None,
+                 lazy=True):
+        StreamB.__init__(self, host, port, maxlen, sock, lazy)
 
     #### CODEC ####
     def decode(self, msg_bytes):
@@ -207,8 +251,9 @@ class Stream(StreamB):
 
 class StreamJSON(Stream):
     """ JSON Stream """
-    def __init__(self, host='localhost', port='1234', maxlen=100, sock=None):
-        Stream.__init__(self, host, port, maxlen, sock)
+    def __init__(self, host='localhost', port='1234', maxlen=100, sock=None,
+                 lazy=True):
+        Stream.__init__(self, host, port, maxlen, sock, lazy)
 
     def decode(self, msg_bytes):
         """ decode bytes to json object """
@@ -217,3 +262,106 @@ class StreamJSON(Stream):
     def encode(self, msg_obj):
         """ encode object to json string and then bytes """
         return Stream.encode(self, json.dumps(msg_obj))
+
+
+class StreamMultiplexed(StreamJSON):
+    """ JSON Stream on a MORSE multiplexed datastream port
+
+    All the streams of the simulator share the same port: the stream
+    subscribes to its component at connection, and messages are prefixed
+    with the component name.
+    """
+    def __init__(self, host='localhost', port='1234', name='', maxlen=100,
+                 sock=None, lazy=True):
+        self.name = name
+        self._prefix_len = len(name.encode()) + 1
+        StreamJSON.__init__(self, host, port, maxlen, sock, lazy)
+        self.push(("subscribe %s" % name).encode() + MSG_SEPARATOR)
+
+    def decode(self, msg_bytes):
+        """ strip the stream name, then decode the json object """
+        return StreamJSON.decode(self, msg_bytes[self._prefix_len:])
+
+    def encode(self, msg_obj):
+        """ encode object to a 'publish' command """
+        return ("publish %s %s" % (self.name, json.dumps(msg_obj))).encode() \
+                + MSG_SEPARATOR
+
+
+class Frame(object):
+    """ A binary frame received from MORSE
+
+    ``data`` is a memoryview on the raw buffer of the frame. It may be
+    reused by the stream once the frame has left the input queue, so copy
+    it (``bytes(frame.data)``) if you need to keep it longer.
+    """
+    __slots__ = ['timestamp', 'width', 'height', 'encoding', 'data']
+
+    def __init__(self, timestamp, width, height, encoding, data):
+        self.timestamp = timestamp
+        self.width = width
+        self.height = height
+        self.encoding = encoding
+        self.data = data
+
+    def __repr__(self):
+        return "Frame(timestamp=%f, width=%d, height=%d, encoding=%d, " \
+               "length=%d)" % (self.timestamp, self.width, self.height,
+                               self.encoding, len(self.data))
+
+
+class StreamFrame(StreamB):
+    """ Binary frame stream
+
+    Reads the frames published by MORSE binary publishers (see
+    :py:class:`morse.middleware.socket_datastream.SocketBinaryPublisher`):
+    a fixed header (see FRAME_HEADER) followed by a raw buffer.
+
+    The payloads are read directly in a ring of preallocated bytearrays,
+    without any intermediate copy or base64 decoding. The ring holds one
+    more buffer than the input queue, so a frame still in the queue is
+    never overwritten.
+    """
+    def __init__(self, host='localhost', port='1234', maxlen=2, sock=None):
+        self._buffers = [bytearray() for _ in range(maxlen + 1)]
+        self._buffer_index = 0
+        self._header = None
+        self._view = None
+        self._offset = 0
+        StreamB.__init__(self, host, port, maxlen, sock)
+        self.set_terminator(FRAME_HEADER.size)
+
+    def _next_view(self, length):
+        """ Return a memoryview of length bytes on the next buffer of
+        the ring """
+        self._buffer_index = (self._buffer_index + 1) % len(self._buffers)
+        buf = self._buffers[self._buffer_index]
+        if len(buf) < length:
+            # do not resize in place, old frames may still export it
+            buf = bytearray(length)
+            self._buffers[self._buffer_index] = buf
+        return memoryview(buf)[:length]
+
+    #### IN ####
+    def collect_incoming_data(self, data):
+        if self._header is None:
+            self._in_chunks.append(data)
+        else:
+            end = self._offset + len(data)
+            self._view[self._offset:end] = data
+            self._offset = end
+
+    def found_terminator(self):
+        if self._header is None:
+            self._header = FRAME_HEADER.unpack(self._pop_incoming_data())
+            length = self._header[-1]
+            self._view = self._next_view(length)
+            self._offset = 0
+            if length:
+                self.set_terminator(length)
+                return
+
+        timestamp, width, height, encoding, _ = self._header
+        self._header = None
+        self.set_terminator(FRAME_HEADER.size)
+        self.handle_msg(Frame(timestamp, width, height, encoding, self._view))
@@ -1,3 +1,4 @@
+import sys
 import unittest
 import threading
 import time
@@ -8,6 +9,10 @@ import asyncore
 
 import logging; logger = logging.getLogger("pymorse")
 from pymorse import StreamJSON, TIMEOUT
+from pymorse.stream import StreamFrame, StreamMultiplexed, FRAME_HEADER, \
+                          ENCODING_RGBA8
+from pymorse.pymorse import Component, ResponseDispatcher, \
+                            MorseServiceFailed, MorseServiceError
 
 class SocketWriter(threading.Thread):
     def __init__(self, port = 61000, freq = 10):
@@ -46,7 +51,7 @@ class SocketWriter(threading.Thread):
                 self._client_sockets.append(sock)
 
             if outputready != []:
-                message = (self.get_data() + '\n').encode()
+                message = self.get_message()
                 for o in outputready:
                     try:
                         #print("Writing " + message + " to the socket")
@@ -78,6 +83,9 @@ class SocketWriter(threading.Thread):
         self.join()
         print("Done")
         
+    def get_message(self):
+        return (self.get_data() + '\n').encode()
+
     def get_data(self):
         
         data = json.dumps([self.i])
@@ -117,6 +125,32 @@ class TestPyMorseStreamSlow(unittest.TestCase):
         time.sleep(d)
         self.assertEqual(self.stream.last(), [3])
 
+    def test_last_n(self):
+
+        d = 1/float(self.freq)
+        self.assertEqual(self.stream.last(3), [])
+        time.sleep(3 * d + d * 0.5)
+        self.assertEqual(self.stream.last(2), [[1], [2]])
+        self.assertEqual(self.stream.last(10), [[0], [1], [2]])
+
+    def test_decode_once(self):
+
+        decoded = []
+        decode = self.stream.decode
+        def counting_decode(msg_bytes):
+            decoded.append(msg_bytes)
+            return decode(msg_bytes)
+        self.stream.decode = counting_decode
+
+        self.assertEqual(self.stream.get(), [0])
+        for i in range(100):
+            self.assertEqual(self.stream.last(), [0])
+        self.assertEqual(len(decoded), 1)
+
+        # the messages nobody reads are not decoded
+        time.sleep(3/float(self.freq))
+        self.assertEqual(len(decoded), 1)
+
     def test_subscribe(self):
 
         d = 1/float(self.freq)
@@ -160,6 +194,174 @@ class TestPyMorseStreamSlow(unittest.TestCase):
         self._asyncore_thread.join(TIMEOUT)
         self._asyncore_thread = None # in case we want to re-create
 
+class FrameSocketWriter(SocketWriter):
+    """ Write 4x2 RGBA binary frames, filled with the frame index """
+
+    def get_message(self):
+        payload = bytes([self.i % 256]) * (4 * 2 * 4)
+        header = FRAME_HEADER.pack(float(self.i), 4, 2, ENCODING_RGBA8,
+                                   len(payload))
+        self.i += 1
+        time.sleep(1/float(self.freq))
+        return header + payload
+
+class FakeMorse(object):
+    host = 'localhost'
+
+class TestPyMorseStreamFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.freq = 10
+        self._server = FrameSocketWriter(port = 61001, freq = self.freq)
+
+        self.stream = StreamFrame("localhost", 61001)
+        self._asyncore_thread = threading.Thread( target = asyncore.loop, kwargs = {'timeout': 0.01} )
+        self._asyncore_thread.start()
+
+    def test_get(self):
+        for i in range(4):
+            frame = self.stream.get(TIMEOUT)
+            self.assertEqual(frame.timestamp, float(i))
+            self.assertEqual(frame.width, 4)
+            self.assertEqual(frame.height, 2)
+            self.assertEqual(frame.encoding, ENCODING_RGBA8)
+            self.assertEqual(bytes(frame.data), bytes([i]) * 32)
+
+    def test_component(self):
+        camera = Component(FakeMorse(), 'camera', 'robot.camera',
+                           [('socket', 'OUT')], 61001, [], 'binary')
+        camera.lazy_init()
+        self.assertIsInstance(camera.stream, StreamFrame)
+        self.assertFalse(hasattr(camera, 'publish'))
+        self.assertEqual(camera.get(TIMEOUT).encoding, ENCODING_RGBA8)
+
+    def tearDown(self):
+        self._server.close()
+        asyncore.close_all()
+        self._asyncore_thread.join(TIMEOUT)
+        self._asyncore_thread = None
+
+class MultiplexedSocketWriter(SocketWriter):
+    """ Write messages prefixed by the stream name """
+
+    def get_message(self):
+        return ('robot.pose ' + self.get_data() + '\n').encode()
+
+class TestPyMorseStreamMultiplexed(unittest.TestCase):
+
+    def setUp(self):
+        self.freq = 10
+        self._server = MultiplexedSocketWriter(port = 61002, freq = self.freq)
+
+        self.stream = StreamMultiplexed("localhost", 61002, 'robot.pose')
+        self._asyncore_thread = threading.Thread( target = asyncore.loop, kwargs = {'timeout': 0.01} )
+        self._asyncore_thread.start()
+
+    def test_get(self):
+        self.assertEqual(self.stream.get(TIMEOUT), [0])
+        self.assertEqual(self.stream.get(TIMEOUT), [1])
+
+    def test_encode(self):
+        self.assertEqual(self.stream.encode({'x': 1}),
+                         b'publish robot.pose {"x": 1}\n')
+
+    def tearDown(self):
+        self._server.close()
+        asyncore.close_all()
+        self._asyncore_thread.join(TIMEOUT)
+        self._asyncore_thread = None
+
+@unittest.skipIf(sys.version_info < (3, 7),
+                 "pymorse.aio requires Python 3.7 (asyncio.BufferedProtocol)")
+class TestPyMorseAsyncStream(unittest.TestCase):
+
+    def setUp(self):
+        import asyncio
+        from pymorse import aio
+        self.asyncio = asyncio
+        self.aio = aio
+        self.freq = 10
+
+    def test_json(self):
+        self._server = SocketWriter(port = 61003, freq = self.freq)
+
+        async def run():
+            stream = await self.aio.AsyncStreamJSON.open("localhost", 61003)
+            self.assertIsNone(stream.last())
+            self.assertEqual(await stream.get(TIMEOUT), [0])
+            received = []
+            async for msg in stream:
+                received.append(msg)
+                if len(received) == 3:
+                    break
+            self.assertEqual(received, [[1], [2], [3]])
+            self.assertEqual(stream.last(), [3])
+            self.assertEqual(stream.last(2), [[2], [3]])
+            stream.close()
+        self.asyncio.run(run())
+
+    def test_frame(self):
+        self._server = FrameSocketWriter(port = 61004, freq = self.freq)
+
+        async def run():
+            stream = await self.aio.AsyncStreamFrame.open("localhost", 61004)
+            for i in range(4):
+                frame = await stream.get(TIMEOUT)
+                self.assertEqual(frame.timestamp, float(i))
+                self.assertEqual((frame.width, frame.height), (4, 2))
+                self.assertEqual(frame.encoding, ENCODING_RGBA8)
+                self.assertEqual(bytes(frame.data), bytes([i]) * 32)
+            stream.close()
+        self.asyncio.run(run())
+
+    def test_publish_output_stream(self):
+        self._server = FrameSocketWriter(port = 61005, freq = self.freq)
+        camera = self.aio.AsyncComponent(None, 'camera', 'robot.camera',
+                                         [('socket', 'OUT')], 61005,
+                                         stream_format = 'binary')
+        with self.assertRaises(MorseServiceError):
+            self.asyncio.run(camera.publish({}))
+        # refused before opening the stream
+        self.assertIsNone(camera.stream)
+
+    def tearDown(self):
+        self._server.close()
+
+class FakeServiceStream(object):
+    def __init__(self):
+        self.callbacks = []
+
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        self.callbacks.remove(callback)
+
+class TestPyMorseResponseDispatcher(unittest.TestCase):
+
+    def test_routing(self):
+        stream = FakeServiceStream()
+        dispatcher = ResponseDispatcher(stream)
+        self.assertEqual(stream.callbacks, [dispatcher.dispatch])
+
+        futures = dict((str(i), dispatcher.register(str(i))) for i in range(3))
+        self.assertTrue(all(f.running() for f in futures.values()))
+
+        dispatcher.dispatch('2 SUCCESS [1, 2]')
+        dispatcher.dispatch('7 SUCCESS null') # unknown request: ignored
+        dispatcher.dispatch('0 FAILED "wrong argument"')
+        self.assertEqual(futures['2'].result(0), [1, 2])
+        self.assertRaises(MorseServiceFailed, futures['0'].result, 0)
+        self.assertFalse(futures['1'].done())
+        self.assertEqual(dispatcher.pending(), ['1'])
+
+        dispatcher.cancel_all()
+        self.assertRaises(RuntimeError, futures['1'].result, 0)
+        self.assertEqual(len(dispatcher), 0)
+
+        dispatcher.close()
+        self.assertEqual(stream.callbacks, [])
+
 if __name__ == '__main__':
     
     import logging
@@ -11,6 +11,7 @@ from morse.core.exceptions import MorseRPCInvokationError
 from morse.core.morse_time import time_isafter
 from morse.helpers.morse_math import normalise_angle
 from morse.helpers.components import add_property
+from morse.helpers.transformation import set_world_pose
 
 class Armature(morse.core.actuator.Actuator):
     """
@@ -325,9 +326,7 @@ class Armature(morse.core.actuator.Actuator):
                                                         euler_rotation, 
                                                         relative)
 
-        target.worldPosition = translation
-        if rotation:
-            target.worldOrientation = rotation
+        set_world_pose(target, translation, rotation or None)
 
         # save the joint state computed from IK in local_data
         self._store_current_joint_state()
@@ -858,7 +857,7 @@ class Armature(morse.core.actuator.Actuator):
             vx = math.copysign(min(lspeed / self.frequency, abs(distx)), distx)
             vy = math.copysign(min(lspeed / self.frequency, abs(disty)), disty)
             vz = math.copysign(min(lspeed / self.frequency, abs(distz)), distz)
-            target.worldPosition = [curPos[0] + vx, curPos[1] + vy, curPos[2] + vz]
+            set_world_pose(target, [curPos[0] + vx, curPos[1] + vy, curPos[2] + vz])
 
         # then, orientation (as quaternion!)
         oriReached = True
@@ -868,12 +867,12 @@ class Armature(morse.core.actuator.Actuator):
 
             if not rotation_duration > total_rotation_duration:
                 oriReached = False
-                target.worldOrientation = initial_orientation.slerp(
+                set_world_pose(target, orientation = initial_orientation.slerp(
                                                     final_orientation, 
-                                                    rotation_duration / total_rotation_duration)
+                                                    rotation_duration / total_rotation_duration))
             else:
                 # make sure we eventually reach the final position
-                target.worldOrientation = final_orientation 
+                set_world_pose(target, orientation = final_orientation)
 
         # Update the armature to reflect the changes we just performed
         armature.update()
@@ -4,6 +4,7 @@ from morse.core.services import service, async_service, interruptible
 from morse.core import status
 from morse.helpers.components import add_data, add_property
 from morse.core import mathutils
+from morse.helpers.transformation import forget_world_pose
 import math
 
 class Arucomarker(morse.core.actuator.Actuator):
@@ -114,6 +115,7 @@ class Arucomarker(morse.core.actuator.Actuator):
             me.worldPosition = position + parent_pose
         if orientation:
             me.worldOrientation = orientation
+        forget_world_pose(me)
     
     """ 
     The default action which is executed every LOGIC TICK
@@ -6,6 +6,7 @@ from morse.core import mathutils
 from morse.helpers.morse_math import normalise_angle, rotation_direction
 from morse.core.services import service
 from morse.helpers.components import add_data, add_property
+from morse.helpers.transformation import forget_world_pose
 
 class PA10(morse.core.actuator.Actuator):
     """
@@ -116,6 +117,7 @@ class PA10(morse.core.actuator.Actuator):
             # Give the movement instructions directly to the parent
             # The second parameter specifies a "local" movement
             segment.applyRotation([rx, ry, rz], True)
+            forget_world_pose(segment)
 
             if ry != 0.0 or rz != 0.0:
                 self._moving = True
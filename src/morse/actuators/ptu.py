@@ -8,6 +8,7 @@ from morse.core.services import async_service
 from morse.core.services import interruptible
 from morse.helpers.morse_math import normalise_angle, rotation_direction
 from morse.helpers.components import add_data, add_property
+from morse.helpers.transformation import forget_world_pose
 
 class PTU(Actuator):
     """
@@ -232,3 +233,4 @@ class PTU(Actuator):
         # The second parameter specifies a "local" movement
         self._pan_base.applyRotation([0.0, 0.0, rz], True)
         self._tilt_base.applyRotation([0.0, ry, 0.0], True)
+        forget_world_pose(self._pan_base)
@@ -5,6 +5,7 @@ from morse.core.mathutils import Vector, Matrix
 from math import radians, degrees, sin, cos, fabs, copysign
 from morse.helpers.morse_math import normalise_angle
 from morse.helpers.components import add_data, add_property
+from morse.helpers.transformation import set_world_pose
 
 import morse.core.actuator
 from morse.core.services import service, async_service, interruptible
@@ -218,8 +219,8 @@ class RotorcraftWaypoint(morse.core.actuator.Actuator):
         #logger.debug("Robot %s move status: '%s'", robot.bge_object.name, robot.move_status)
         # Place the target marker where the robot should go
         if self._wp_object:
-            self._wp_object.worldPosition = self._destination
-            self._wp_object.worldOrientation = Matrix.Rotation(self.local_data['yaw'], 3, 'Z')
+            set_world_pose(self._wp_object, self._destination,
+                           Matrix.Rotation(self.local_data['yaw'], 3, 'Z'))
 
         # current angles to horizontal plane (not quite, but approx good enough)
         roll = self.position_3d.roll
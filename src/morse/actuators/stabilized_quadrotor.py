@@ -4,6 +4,7 @@ import morse.core.actuator
 from morse.core import mathutils
 from morse.helpers.filt2 import Filt2
 from morse.helpers.components import add_data
+from morse.helpers.transformation import forget_world_pose
 
 class StabilizedQuadrotor(morse.core.actuator.Actuator):
     """ 
@@ -117,4 +118,5 @@ class StabilizedQuadrotor(morse.core.actuator.Actuator):
                 dt * mathutils.Vector([self.v[0],self.v[1],self.v[2]]))
         #Change the parent orientation
         parent.orientation = rot.to_matrix()
+        forget_world_pose(parent)
 
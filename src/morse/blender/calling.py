@@ -25,7 +25,8 @@ def robot_action(contr):
         # Do nothing if the component was not initialised.
         # Should be the case for external robots and components
         robot_object = simu.robotDict.get(obj, None)
-        if robot_object:
+        # The action may be run by morse.core.scheduler.TickScheduler
+        if robot_object and not robot_object.tick_scheduled:
             robot_object.action()
 
 def component_action(contr):
@@ -46,7 +47,8 @@ def component_action(contr):
         # Do nothing if the component was not initialised.
         # Should be the case for external robots and components
         cmpt_object = simu.componentDict.get(obj.name, None)
-        if cmpt_object:
+        # The action may be run by morse.core.scheduler.TickScheduler
+        if cmpt_object and not cmpt_object.tick_scheduled:
             cmpt_object.action()
 
 def sensor_action(contr):
@@ -21,6 +21,12 @@ from morse.core.modifier import register_modifier
 from morse.helpers.loading import create_instance, create_instance_level
 from morse.core.morse_time import TimeStrategies
 from morse.core.zone import ZoneManager
+from morse.core.spatial_index import create_spatial_index
+from morse.core.object_registry import create_object_registry
+from morse.core.datastream import finalize_worker_pool
+from morse.core.profiler import create_profiler, clock, SIMULATION
+from morse.core.scheduler import create_tick_scheduler
+from morse.helpers.transformation import set_world_pose
 
 # Override the default Python exception handler
 def morse_excepthook(*args, **kwargs):
@@ -157,7 +163,12 @@ def create_dictionaries ():
     # Create the zone manager
     persistantstorage.zone_manager = ZoneManager()
 
+    # Create the spatial index, used to find the objects close to a point
+    persistantstorage.spatial_index = create_spatial_index(
+                                        persistantstorage.object_registry)
+
     scene = morse.core.blenderapi.scene()
+    registry = persistantstorage.object_registry
 
     # Store the position and orientation of all objects
     for obj in scene.objects:
@@ -173,9 +184,9 @@ def create_dictionaries ():
     # (plus several other optional properties).
     # See the documentation for the up-to-date list
     # (doc/morse/user/others/passive_objects.rst) -- or read the code below :-)
-    for obj in scene.objects:
+    for obj in registry.with_property('Object'):
         # Check the object has an 'Object' property set to true
-        if 'Object' in obj and obj['Object']:
+        if obj['Object']:
             details = {
                        'label': obj['Label'] if 'Label' in obj else str(obj),
                        'description': obj['Description'] if 'Description' in obj else "",
@@ -191,25 +202,26 @@ def create_dictionaries ():
         logger.info("No passive objects in the scene.")
 
     # Get the robots
-    for obj in scene.objects:
-        if 'Robot_Tag' in obj or 'External_Robot_Tag' in obj:
-            if not 'classpath' in obj:
-                logger.error("No 'classpath' in %s\n  Please make sure you are "
-                             "using the new builder classes"%str(obj.name))
-                return False
-            # Create an object instance and store it
-            instance = create_instance_level(obj['classpath'],
-                                             obj.get('abstraction_level'),
-                                             obj)
+    robots = list(registry.with_property('Robot_Tag')) + \
+             list(registry.with_property('External_Robot_Tag'))
+    for obj in robots:
+        if not 'classpath' in obj:
+            logger.error("No 'classpath' in %s\n  Please make sure you are "
+                         "using the new builder classes"%str(obj.name))
+            return False
+        # Create an object instance and store it
+        instance = create_instance_level(obj['classpath'],
+                                         obj.get('abstraction_level'),
+                                         obj)
 
-            if not instance:
-                logger.error("Could not create %s"%str(obj['classpath']))
-                return False
-            # store instance in persistant storage dictionary
-            if 'Robot_Tag' in obj:
-                persistantstorage.robotDict[obj] = instance
-            else:
-                persistantstorage.externalRobotDict[obj] = instance
+        if not instance:
+            logger.error("Could not create %s"%str(obj['classpath']))
+            return False
+        # store instance in persistant storage dictionary
+        if 'Robot_Tag' in obj:
+            persistantstorage.robotDict[obj] = instance
+        else:
+            persistantstorage.externalRobotDict[obj] = instance
 
     if not (persistantstorage.robotDict or
             persistantstorage.externalRobotDict): # No robot!
@@ -219,9 +231,8 @@ def create_dictionaries ():
         return False
 
     # Get the zones
-    for obj in scene.objects:
-        if 'Zone_Tag' in obj:
-            persistantstorage.zone_manager.add(obj)
+    for obj in registry.with_property('Zone_Tag'):
+        persistantstorage.zone_manager.add(obj)
 
     # Get the robot and its instance
     for obj, robot_instance in persistantstorage.robotDict.items():
@@ -234,16 +245,12 @@ def create_dictionaries ():
             return False
 
     # Check we have no 'free' component (they all must belong to a robot)
-    for obj in scene.objects:
-        try:
-            obj['Component_Tag']
-            if obj.name not in persistantstorage.componentDict.keys():
-                logger.error("INITIALIZATION ERROR: the component '%s' "
-                             "does not belong to any robot: you need to fix "
-                             "that by parenting it to a robot." % obj.name)
-                return False
-        except KeyError as detail:
-            pass
+    for obj in registry.with_property('Component_Tag'):
+        if obj.name not in persistantstorage.componentDict.keys():
+            logger.error("INITIALIZATION ERROR: the component '%s' "
+                         "does not belong to any robot: you need to fix "
+                         "that by parenting it to a robot." % obj.name)
+            return False
 
     # Will return true always (for the moment)
     return True
@@ -496,6 +503,8 @@ def init_multinode():
     # Get the correct class reference according to the chosen protocol
     if protocol == "socket":
         classpath = "morse.multinode.socket.SocketNode"
+    elif protocol == "socket_binary":
+        classpath = "morse.multinode.socket.BinarySocketNode"
     elif protocol == "hla":
         classpath = "morse.multinode.hla.HLANode"
 
@@ -516,11 +525,17 @@ def init_multinode():
         import socket
         node_name = socket.gethostname()
 
+    try:
+        options = multinode_config.node_config.get("options", {})
+    except (NameError, AttributeError) as detail:
+        options = {}
+
     logger.info ("This is node '%s'" % node_name)
     # Create the instance of the node class
 
     persistantstorage.node_instance = create_instance(classpath,
-                                                      node_name, server_address, server_port)
+                                                      node_name, server_address, server_port,
+                                                      **options)
 
 def init(contr):
     """ General initialization of MORSE
@@ -540,7 +555,11 @@ def init(contr):
     logger.info("PID: %d" % os.getpid())
 
     persistantstorage.morse_initialised = False
+    # Index of the scene objects, used by the time strategy, the
+    # components, ...
+    persistantstorage.object_registry = create_object_registry()
     persistantstorage.time = TimeStrategies.make(morse.core.blenderapi.getssr()['time_management'])
+    persistantstorage.profiler = create_profiler()
     # Variable to keep trac of the camera being used
     persistantstorage.current_camera_index = 0
 
@@ -562,6 +581,9 @@ def init(contr):
 
     if init_ok:
         check_dictionaries()
+        scheduler = create_tick_scheduler()
+        if scheduler:
+            persistantstorage.tick_scheduler = scheduler
         persistantstorage.morse_initialised = True
         logger.log(ENDSECTION, 'SCENE INITIALIZED')
     else:
@@ -670,12 +692,25 @@ def simulation_main(contr):
 
     We do here all homeworks to manage the simulation at whole.
     """
+    profiler = persistantstorage.get('profiler')
+    profiling = profiler and profiler.enabled
+    if profiling:
+        time_start = clock()
+        profiler.tick(time_start)
+
+    # Detect the objects added to or removed from the scene
+    if 'object_registry' in persistantstorage:
+        persistantstorage.object_registry.update()
+
     # Call datastream manager action handler
     # Call it early at the synchronisation management may be done here
     if 'stream_managers' in persistantstorage:
         for ob in persistantstorage.stream_managers.values():
             ob.action()
 
+    if profiling:
+        time_before_time = clock()
+
     # Update the time variable
     try:
         persistantstorage.time.update()
@@ -688,6 +723,9 @@ def simulation_main(contr):
                         "mailing list.")
         quit(contr)
 
+    if profiling:
+        time_before_services = clock()
+
     if 'serviceObjectDict' in persistantstorage:
         for ob in persistantstorage.serviceObjectDict.values():
             ob.action()
@@ -696,10 +734,37 @@ def simulation_main(contr):
         # let the service managers process their inputs/outputs
         persistantstorage.morse_services.process()
 
+    if profiling:
+        time_before_components = clock()
+
+    # Run the robots and the components, when they are not run by their
+    # own Game Logic bricks
+    scheduler = persistantstorage.get('tick_scheduler')
+    if scheduler:
+        scheduler.run()
+
+    if profiling:
+        time_before_multinode = clock()
+
     if MULTINODE_SUPPORT:
         # Register the locations of all the robots handled by this node
         persistantstorage.node_instance.synchronize()
 
+    if profiling:
+        time_now = clock()
+        profiler.record(SIMULATION, 'stream_managers', time_start,
+                        time_before_time)
+        profiler.record(SIMULATION, 'time', time_before_time,
+                        time_before_services)
+        profiler.record(SIMULATION, 'services', time_before_services,
+                        time_before_components)
+        if scheduler:
+            profiler.record(SIMULATION, 'components', time_before_components,
+                            time_before_multinode)
+        if MULTINODE_SUPPORT:
+            profiler.record(SIMULATION, 'multinode', time_before_multinode,
+                            time_now)
+
 
 def switch_camera(contr):
     """ Cycle through the cameras in the scene during the game.
@@ -724,6 +789,13 @@ def close_all(contr):
     the methods to close middlewares
     """
     logger.log(ENDSECTION, 'COMPONENTS FINALIZATION')
+    # Flush the threaded datastreams before closing them
+    finalize_worker_pool()
+
+    profiler = persistantstorage.get('profiler')
+    if profiler and profiler.trace_file:
+        profiler.dump(profiler.trace_file)
+
     # Force the deletion of the sensor objects
     if 'componentDict' in persistantstorage:
         for component_instance in persistantstorage.componentDict.values():
@@ -734,6 +806,10 @@ def close_all(contr):
         for robot_instance in persistantstorage.robotDict.values():
            robot_instance.finalize()
 
+    # Forget the synchronisations of the camera scenes
+    persistantstorage.pop('scene_syncs', None)
+    persistantstorage.pop('tick_scheduler', None)
+
     logger.log(ENDSECTION, 'CLOSING REQUEST MANAGERS...')
     del persistantstorage.morse_services
     del persistantstorage.serviceObjectDict
@@ -800,7 +876,6 @@ def reset_objects(contr):
         b_obj.applyTorque([0.0, 0.0, 0.0], True)
 
         logger.debug("%s goes to %s" % (b_obj, state[0]))
-        b_obj.worldPosition = state[0]
-        b_obj.worldOrientation = state[1]
+        set_world_pose(b_obj, state[0], state[1])
         # Reset physics simulation
         b_obj.restoreDynamics()
@@ -547,7 +547,7 @@ class AbstractComponent(object):
         else:
             sensor.frequency = delay
 
-    def frequency(self, frequency=None, delay=0):
+    def frequency(self, frequency=None, delay=0, phase=None):
         """ Set the frequency of the Python module
 
         :param frequency: (int) Desired frequency,
@@ -555,9 +555,14 @@ class AbstractComponent(object):
         :param delay: (int) Delay between repeated pulses
             (in logic tics, 0 = no delay)
             if frequency is set, delay is obtained by fps / frequency.
+        :param phase: (int) Tick, between 0 and delay, on which the
+            component runs. Only used with the tick scheduler (see
+            Environment.use_tick_scheduler())
         """
         if frequency:
             delay = max(0, bpymorse.get_fps() // frequency - 1)
+        if phase is not None:
+            self.properties(tick_phase = int(phase))
         sensors = [s for s in self._bpy_object.game.sensors if s.type == 'ALWAYS']
         # New MORSE_LOGIC sensor, see AbstractComponent.morseable() bellow
         morselogic = [s for s in sensors if s.name.startswith('MORSE_LOGIC')]
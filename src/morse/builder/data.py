@@ -96,12 +96,22 @@ MORSE_MODIFIER_DICT = {
     'IMUNoise' : {
         'morse.sensors.imu.IMU': "morse.modifiers.imu_noise.IMUNoiseModifier",
     },
+    'ArrayNoise' : {
+        'morse.sensors.laserscanner.LaserScanner': "morse.modifiers.noise.ArrayNoiseModifier",
+        'morse.sensors.laserscanner.LaserScannerRotationZ': "morse.modifiers.noise.ArrayNoiseModifier",
+        'morse.sensors.depth_camera.DepthCamera': "morse.modifiers.noise.ArrayNoiseModifier",
+        'morse.sensors.depth_camera.DepthCameraRotationZ': "morse.modifiers.noise.ArrayNoiseModifier",
+    },
     'Noise' : {
         'morse.sensors.imu.IMU': "morse.modifiers.imu_noise.IMUNoiseModifier",
         'morse.sensors.odometry.Odometry': "morse.modifiers.pose_noise.PoseNoiseModifier",
         'morse.sensors.pose.Pose': "morse.modifiers.pose_noise.PoseNoiseModifier",
         'morse.sensors.gps.GPS': "morse.modifiers.pose_noise.PositionNoiseModifier",
         'morse.sensors.gyroscope.Gyroscope': "morse.modifiers.pose_noise.OrientationNoiseModifier",
+        'morse.sensors.laserscanner.LaserScanner': "morse.modifiers.noise.ArrayNoiseModifier",
+        'morse.sensors.laserscanner.LaserScannerRotationZ': "morse.modifiers.noise.ArrayNoiseModifier",
+        'morse.sensors.depth_camera.DepthCamera': "morse.modifiers.noise.ArrayNoiseModifier",
+        'morse.sensors.depth_camera.DepthCameraRotationZ': "morse.modifiers.noise.ArrayNoiseModifier",
     }
 }
 
@@ -242,6 +252,8 @@ MORSE_DATASTREAM_DICT = {
             "moos": 'morse.middleware.moos.sick.LIDARNotifier'
             },
         "rssi": {
+            "ros": ['morse.middleware.ros.laserscanner.LaserScanPublisher',
+                    'morse.middleware.ros.laserscanner.PointCloud2Publisher'],
             "socket": INTERFACE_DEFAULT_OUT
             },        
         "range": {
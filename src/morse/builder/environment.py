@@ -112,7 +112,8 @@ class Environment(AbstractComponent):
         node_config = { 'protocol': self._protocol,
                         'node_name': node_name,
                         'server_address': self._server_address,
-                        'server_port': self._server_port,}
+                        'server_port': self._server_port,
+                        'options': self._multinode_options,}
         # Create the config file if it does not exist
         if not 'multinode_config.py' in bpymorse.get_texts().keys():
             bpymorse.new_text()
@@ -525,6 +526,70 @@ class Environment(AbstractComponent):
 
         self.properties(time_management = strategy)
 
+    def set_datastream_workers(self, nb_workers):
+        """ Set the number of threads used to run the output datastreams
+        added with the ``threaded`` option:
+
+        .. code-block:: python
+
+            camera.add_stream('socket', threaded = True)
+            env.set_datastream_workers(4)
+
+        :param nb_workers: the number of worker threads (default: 2)
+        """
+        self.properties(datastream_workers = int(nb_workers))
+
+    def set_noise_seed(self, seed):
+        """ Seed the random generators of the noise modifiers, so that the
+        noise is the same from one run to the other. Each modifier draws
+        from its own stream, derived from this seed and from the name of its
+        component (see :py:func:`morse.modifiers.noise.random_generator`).
+
+        .. code-block:: python
+
+            imu.alter('Noise', gyro_std = 0.01, accel_std = 0.1)
+            env.set_noise_seed(run_index)
+
+        A ``seed`` given to a modifier (``imu.alter('Noise', seed = 3)``)
+        overrides this one.
+
+        :param seed: a non-negative integer
+        """
+        self.properties(noise_seed = int(seed))
+
+    def enable_profiler(self, trace_file = None, window = 1000):
+        """ Record the duration of each phase of the simulation loop and of
+        the action, modifiers and datastreams of each component.
+
+        The statistics (p50, p95, p99, ...) can be retrieved with the
+        ``simulation.get_profile`` service.
+
+        :param trace_file: if set, record each event and write them, when
+                           the simulation ends, in this file in the Chrome
+                           trace format (see chrome://tracing)
+        :param window: number of samples used to compute the percentiles
+                       of each phase (default: 1000)
+        """
+        self.properties(profiler = True, profiler_window = int(window),
+                        profiler_trace = trace_file or '')
+
+    def use_tick_scheduler(self, stagger = True):
+        """ Run the robots and the components from the main simulation
+        loop, following a precomputed schedule (see
+        :py:class:`morse.core.scheduler.TickScheduler`), instead of running
+        each of them from its own Game Logic brick.
+
+        .. code-block:: python
+
+            env.use_tick_scheduler()
+
+        :param stagger: spread the components of the same frequency over
+                        the ticks, instead of running all of them on the
+                        same tick (default: True)
+        """
+        self.properties(tick_scheduler = True,
+                        tick_scheduler_stagger = bool(stagger))
+
     def set_time_scale(self, slowdown_by = None, accelerate_by = None):
         """ Slow down or accelerate the simulation relative to real-time
         (default behaviour: real-time simulation) by modifying the *time
@@ -603,15 +668,27 @@ class Environment(AbstractComponent):
         self._physics_step_sub = step_sub
 
     def configure_multinode(self, protocol='socket',
-            server_address='localhost', server_port='65000', distribution=None):
+            server_address='localhost', server_port='65000', distribution=None,
+            **options):
         """ Provide the information necessary for the node to connect to a multi-node server.
 
-        :param protocol: Either 'socket' or 'hla'
+        :param protocol: Either 'socket', 'socket_binary' or 'hla'
         :param server_address: IP address where the multi-node server can be found
-        :param server_port: Used only for 'socket' protocol. Currently it should always be 65000
+        :param server_port: Used only for 'socket' protocols. Currently it should always be 65000
         :param distribution: A Python dictionary. The keys are the names of the
                 nodes, and the values are lists with the names of the robots handled by
                 each node
+        :param options: options of the protocol. For 'socket_binary':
+                ``position_threshold`` (in meters, default 0.001) and
+                ``orientation_threshold`` (in radians, default 0.001), the
+                motion under which a robot is not sent, and
+                ``max_staleness``, the maximum age of the data received
+                from the server before the node waits for it (in seconds,
+                default 0.1). ``interest_regions`` (a list of (x min, y min,
+                x max, y max) boxes) and ``interest_range`` (the radius of
+                the area around each robot of the node, as a number or a
+                dict robot name -> radius) restrict the robots received by
+                the node to these areas of interest.
 
         .. code-block:: python
 
@@ -632,6 +709,7 @@ class Environment(AbstractComponent):
         self._protocol = protocol
         self._server_address = server_address
         self._server_port = server_port
+        self._multinode_options = options
         if distribution is not None:
             self.multinode_distribution = distribution
         self._multinode_configured = True
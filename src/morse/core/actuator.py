@@ -1,6 +1,7 @@
 import logging; logger = logging.getLogger("morse." + __name__)
 from abc import ABCMeta, abstractmethod
 import morse.core.object
+from morse.core.profiler import clock
 
 class Actuator(morse.core.object.Object):
     """ Basic Class for all actuator objects.
@@ -38,15 +39,35 @@ class Actuator(morse.core.object.Object):
         received = False
         status = False
 
+        profiler = self._profiler
+        profiling = profiler and profiler.enabled
+        if profiling:
+            time_before_datastreams = clock()
+
         # First the input functions
         for function in self.input_functions:
             status = function(self)
             received = received or status
 
+        if profiling:
+            time_before_modifiers = clock()
+
         if received:
             # Data modification functions
             for function in self.input_modifiers:
                 function()
 
+        if profiling:
+            time_before_action = clock()
+
         # Call the regular action function of the component
         self.default_action()
+
+        if profiling:
+            time_now = clock()
+            name = self.name()
+            profiler.record(name, 'datastreams', time_before_datastreams,
+                            time_before_modifiers)
+            profiler.record(name, 'modifiers', time_before_modifiers,
+                            time_before_action)
+            profiler.record(name, 'action', time_before_action, time_now)
@@ -4,6 +4,8 @@ import os
 import sys
 import re
 import types
+import threading
+from collections import deque
 
 from abc import ABCMeta, abstractmethod
 
@@ -11,6 +13,155 @@ from morse.core.sensor import Sensor
 from morse.core.actuator import Actuator
 from morse.middleware import AbstractDatastream
 from morse.helpers.loading import create_instance
+from morse.core import blenderapi
+
+# Default number of threads used to run 'threaded' output datastreams
+DEFAULT_WORKERS = 2
+# Default maximum number of pending snapshots per worker
+DEFAULT_WORKER_QUEUE_SIZE = 16
+
+
+# Types of the values shared as is by the snapshots
+IMMUTABLE_TYPES = (bool, int, float, str, bytes, tuple, type(None))
+
+def snapshot(local_data):
+    """ Return a shallow copy of local_data, safe to be encoded in another
+    thread while the component keeps on updating its local_data
+
+    Each value with a 'copy' method (list, dict, NumPy arrays, mathutils
+    objects) is copied, immutable values are shared. The other values
+    exposing a mutable buffer (memoryview, bytearray, bge image buffers,
+    such as the 'image' of the cameras or the 'points' of the depth
+    cameras) are copied as bytes.
+    """
+    snap = local_data.copy()
+    for key, value in snap.items():
+        copy = getattr(value, 'copy', None)
+        if copy:
+            snap[key] = copy()
+        elif not isinstance(value, IMMUTABLE_TYPES):
+            try:
+                view = memoryview(value)
+            except TypeError:
+                continue
+            if not isinstance(view.obj, bytes):
+                snap[key] = view.tobytes()
+    return snap
+
+
+class DatastreamWorker(threading.Thread):
+    """ Run output datastreams on snapshots of local_data
+
+    Jobs are processed in order. When the queue is full, the oldest job
+    is dropped.
+    """
+    def __init__(self, maxlen):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self._jobs = deque()
+        self._maxlen = maxlen
+        self._cv = threading.Condition()
+        self._running = True
+        self.processed = 0
+        self.dropped = 0
+
+    def submit(self, datastream, data):
+        with self._cv:
+            if len(self._jobs) >= self._maxlen:
+                self._jobs.popleft()
+                self.dropped += 1
+            self._jobs.append((datastream, data))
+            self._cv.notify()
+
+    def run(self):
+        while True:
+            with self._cv:
+                while self._running and not self._jobs:
+                    self._cv.wait()
+                if not self._jobs:
+                    return
+                datastream, data = self._jobs.popleft()
+            try:
+                datastream.default_snapshot(data)
+            except Exception as e:
+                logger.error("Error in threaded datastream %s: %s" %
+                             (datastream, e))
+            self.processed += 1
+
+    def stop(self, timeout=None):
+        """ Process the pending jobs, then stop the thread """
+        with self._cv:
+            self._running = False
+            self._cv.notify()
+        self.join(timeout)
+
+
+class DatastreamWorkerPool(object):
+    """ Pool of threads used to encode and send output datastreams
+    outside the Blender game-logic thread
+
+    Each datastream is bound to one worker, so its frames are processed
+    in order.
+    """
+    def __init__(self, nb_workers = DEFAULT_WORKERS,
+                       maxlen = DEFAULT_WORKER_QUEUE_SIZE):
+        self._workers = [DatastreamWorker(maxlen) for _ in range(nb_workers)]
+        for worker in self._workers:
+            worker.start()
+        # datastream -> worker
+        self._assignment = {}
+        logger.info("Datastream worker pool started with %d threads" %
+                    nb_workers)
+
+    def submit(self, datastream, data):
+        worker = self._assignment.get(datastream)
+        if not worker:
+            worker = self._workers[len(self._assignment) % len(self._workers)]
+            self._assignment[datastream] = worker
+        worker.submit(datastream, data)
+
+    def statistics(self):
+        return [{'processed': w.processed, 'dropped': w.dropped}
+                for w in self._workers]
+
+    def finalize(self, timeout=1.0):
+        for worker in self._workers:
+            worker.stop(timeout)
+
+
+_worker_pool = None
+
+def worker_pool():
+    """ Return the datastream worker pool, creating it if needed
+
+    The number of threads can be configured in the Builder with
+    ``env.set_datastream_workers(n)``.
+    """
+    global _worker_pool
+    if not _worker_pool:
+        nb_workers = DEFAULT_WORKERS
+        ssr = blenderapi.getssr()
+        if ssr and 'datastream_workers' in ssr:
+            nb_workers = ssr['datastream_workers']
+        _worker_pool = DatastreamWorkerPool(nb_workers)
+    return _worker_pool
+
+def finalize_worker_pool():
+    """ Flush and stop the datastream worker pool, if any """
+    global _worker_pool
+    if _worker_pool:
+        _worker_pool.finalize()
+        _worker_pool = None
+
+
+class ThreadedOutput(object):
+    """ Output function which only takes a snapshot of local_data, the
+    datastream being run by the worker pool """
+    def __init__(self, datastream):
+        self.datastream = datastream
+
+    def __call__(self, component):
+        worker_pool().submit(self.datastream, snapshot(component.local_data))
 
 
 def register_datastream(classpath, component, direction, args):
@@ -19,7 +170,10 @@ def register_datastream(classpath, component, direction, args):
     if not isinstance(datastream, AbstractDatastream):
         logger.warning("%s should implement morse.middleware.AbstractDatastream"%classpath)
     if direction == 'OUT':
-        component.output_functions.append(datastream.default)
+        if args and args.get('threaded', False):
+            component.output_functions.append(ThreadedOutput(datastream))
+        else:
+            component.output_functions.append(datastream.default)
     else:
         component.input_functions.append(datastream.default)
     # from morse.core.abstractobject.AbstractObject
@@ -29,10 +29,8 @@ class BestEffortStrategy:
         self._last_time = 0.0
         self._nb_frame = 0
 
-        scene = blenderapi.scene()
-        for obj in scene.objects:
-            if obj.name == '__morse_dt_analyser':
-                self._morse_dt_analyser = obj
+        registry = blenderapi.persistantstorage().object_registry
+        self._morse_dt_analyser = registry.get('__morse_dt_analyser')
 
         self._prepare_compute_dt()
 
@@ -109,6 +107,7 @@ class FixedSimulationStepStrategy:
 
         self._stat_jitter = Stats()
         self._last_time = 0.0
+        self._statistics_providers = []
 
         logger.info('Morse configured in Fixed Simulation Step Mode with '
                     'time step of %f sec ( 1.0 /  %d)' %
@@ -130,11 +129,21 @@ class FixedSimulationStepStrategy:
         return self._incr
 
     def statistics (self):
-        return {
+        stats = {
             "mean_time" : self._stat_jitter.mean,
             "variance_time": self._stat_jitter.variance,
             "diff_real_time": self.time - time.time()
         }
+        for provider in self._statistics_providers:
+            stats.update(provider())
+        return stats
+
+    def add_statistics(self, provider):
+        """ Add the statistics returned by provider (a callable returning
+        a dict) to the ones returned by :py:meth:`statistics`. It is used
+        by the components driving the time, such as the lockstep mode of
+        the socket datastream manager """
+        self._statistics_providers.append(provider)
 
     def _update_statistics(self):
         if self._last_time == 0.0:
@@ -11,10 +11,12 @@ class SimulationNodeClass (object):
     # Make this an abstract class
     __metaclass__ = ABCMeta
     
-    def __init__(self, name, server_address, server_port):
+    def __init__(self, name, server_address, server_port, **options):
         self.node_name = name
         self.host = server_address
         self.port = server_port
+        # protocol specific options, given to Environment.configure_multinode
+        self.options = options
         self.initialize()
 
     def __del__(self):
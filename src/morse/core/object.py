@@ -30,6 +30,13 @@ class Object(AbstractObject):
         # Variable to indicate the activation status of the component
         self._active = True
 
+        # True if the action is run by the tick scheduler instead of the
+        # Game Logic bricks of obj (see morse.core.scheduler)
+        self.tick_scheduled = False
+
+        # See morse.core.profiler
+        self._profiler = blenderapi.persistantstorage().get('profiler')
+
         self.check_level()
 
         # Define the position of sensors with respect
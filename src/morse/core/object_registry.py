@@ -0,0 +1,184 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+from collections import OrderedDict
+
+from morse.core import blenderapi
+
+
+class ObjectRegistry(object):
+    """ Index of the scene objects, by name, by game property and by
+    ``Type``, stored in the persistant storage
+
+    The index is built once at initialization, and then kept up to date
+    by :py:meth:`update`, called at each simulation step, which detects the
+    objects added to or removed from the scene. Components should query it
+    instead of walking ``blenderapi.scene().objects``:
+
+    .. code-block:: python
+
+        registry = blenderapi.persistantstorage().object_registry
+        for obj in registry.with_property('Robot_Tag'):
+            ...
+
+    The game properties are indexed when the object is added: if a
+    component adds or removes a game property at runtime, it must call
+    :py:meth:`reindex`.
+
+    Listeners registered with :py:meth:`subscribe` are called with the
+    lists of added and removed objects each time the scene changes.
+    """
+    def __init__(self, scene = None):
+        self._scene = scene
+        # object -> (name, property names, Type) at the time it was indexed
+        self._entries = {}
+        self._by_name = {}
+        # property name (or Type value) -> OrderedDict used as ordered set
+        self._by_property = {}
+        self._by_type = {}
+        self._listeners = []
+        self._count = 0
+        self._last = None
+
+        if scene is not None:
+            for obj in scene.objects:
+                self._add(obj)
+            self._count = len(scene.objects)
+            self._last = _last(scene.objects)
+            logger.info("Object registry: %d objects indexed" % self._count)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, obj):
+        return obj in self._entries
+
+    def objects(self):
+        return self._by_name.values()
+
+    def get(self, name, default = None):
+        """ Return the object called name """
+        return self._by_name.get(name, default)
+
+    def with_property(self, name):
+        """ Return the objects having the game property name, in the order
+        of the scene, as a read-only set """
+        return self._by_property.get(name, _EMPTY).keys()
+
+    def of_type(self, type_):
+        """ Return the objects whose ``Type`` property is type_, in the
+        order of the scene, as a read-only set """
+        return self._by_type.get(type_, _EMPTY).keys()
+
+    def tagged(self, tag):
+        """ Return the list of objects whose ``Type`` is tag, or with a
+        game property tag evaluating to True (the objects tracked by the
+        semantic cameras) """
+        res = list(self.of_type(tag))
+        for obj in self.with_property(tag):
+            if obj[tag] and not obj in self._by_type.get(tag, _EMPTY):
+                res.append(obj)
+        return res
+
+    def subscribe(self, callback):
+        """ Call callback(added, removed) each time objects are added to or
+        removed from the scene """
+        self._listeners.append(callback)
+
+    def add(self, obj):
+        """ Index obj, added at runtime to the scene """
+        self._add(obj)
+        self._notify([obj], [])
+
+    def remove(self, obj):
+        """ Forget obj, removed at runtime from the scene """
+        self._remove(obj)
+        self._notify([], [obj])
+
+    def reindex(self, obj):
+        """ Update the index after a change of the game properties of obj """
+        self._remove(obj)
+        self._add(obj)
+
+    def update(self):
+        """ Detect the objects added to or removed from the scene since the
+        last call
+
+        The number of objects and the last object of the scene are checked
+        at each call, the full comparison being only done when one of them
+        changed. As the objects added at runtime are appended to the scene,
+        this also detects the objects both added and removed during the same
+        step. Call :py:meth:`refresh` to force it.
+        """
+        if self._scene is None:
+            return
+        objects = self._scene.objects
+        if len(objects) != self._count or _last(objects) is not self._last:
+            self.refresh()
+
+    def refresh(self):
+        """ Compare the index with the objects of the scene """
+        if self._scene is None:
+            return
+        objects = self._scene.objects
+        current = set(objects)
+        known = set(self._entries.keys())
+
+        added = [obj for obj in objects if obj not in known]
+        removed = [obj for obj in known if obj.invalid or obj not in current]
+        for obj in removed:
+            self._remove(obj)
+        for obj in added:
+            self._add(obj)
+        self._count = len(objects)
+        self._last = _last(objects)
+
+        if added or removed:
+            logger.debug("Object registry: %d objects added, %d removed" %
+                         (len(added), len(removed)))
+            self._notify(added, removed)
+
+    def _add(self, obj):
+        if obj in self._entries:
+            self._remove(obj)
+        properties = obj.getPropertyNames()
+        type_ = obj.get('Type')
+        self._entries[obj] = (obj.name, properties, type_)
+        self._by_name[obj.name] = obj
+        for name in properties:
+            self._by_property.setdefault(name, OrderedDict())[obj] = None
+        if type_ is not None:
+            self._by_type.setdefault(type_, OrderedDict())[obj] = None
+
+    def _remove(self, obj):
+        # obj may have been removed from the scene, so only rely on the
+        # recorded entry, not on its attributes
+        entry = self._entries.pop(obj, None)
+        if not entry:
+            return
+        name, properties, type_ = entry
+        if self._by_name.get(name) is obj:
+            del self._by_name[name]
+        for key in properties:
+            _discard(self._by_property, key, obj)
+        if type_ is not None:
+            _discard(self._by_type, type_, obj)
+
+    def _notify(self, added, removed):
+        for callback in self._listeners:
+            callback(added, removed)
+
+_EMPTY = OrderedDict()
+
+def _last(objects):
+    return objects[-1] if len(objects) else None
+
+def _discard(index, key, obj):
+    objects = index.get(key)
+    if objects is not None:
+        objects.pop(obj, None)
+        if not objects:
+            del index[key]
+
+
+def create_object_registry():
+    """ Create the registry of the objects of the current scene """
+    return ObjectRegistry(blenderapi.scene())
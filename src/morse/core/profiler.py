@@ -0,0 +1,173 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+import json
+import threading
+from collections import deque
+from time import perf_counter as clock
+
+from morse.core import blenderapi
+
+# Default number of samples kept for each (scope, phase) to compute percentiles
+DEFAULT_WINDOW = 1000
+# Default maximum number of events kept for the Chrome trace
+DEFAULT_TRACE_SIZE = 100000
+
+# Scope used for the phases of morse.blender.main.simulation_main
+SIMULATION = 'simulation'
+
+
+class Histogram(object):
+    """ Durations of one (scope, phase), in seconds
+
+    Only the last ``window`` samples are used to compute the percentiles,
+    count, total and max are computed since the last reset.
+    """
+    __slots__ = ('samples', 'count', 'total', 'max')
+
+    def __init__(self, window):
+        self.samples = deque(maxlen = window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration):
+        self.samples.append(duration)
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def statistics(self):
+        """ Return a dictionary with count, mean, max, p50, p95 and p99,
+        the durations being expressed in milliseconds """
+        samples = sorted(self.samples)
+        if not samples:
+            return {'count': 0}
+
+        def percentile(p):
+            # nearest-rank method
+            index = max(0, int(round(p / 100.0 * len(samples))) - 1)
+            return 1000.0 * samples[index]
+
+        return {'count': self.count,
+                'mean': 1000.0 * self.total / self.count,
+                'max': 1000.0 * self.max,
+                'p50': percentile(50),
+                'p95': percentile(95),
+                'p99': percentile(99)}
+
+
+class Profiler(object):
+    """ Per-tick profiler of the simulation loop
+
+    The simulation loop and the components record the duration of their
+    phases with :py:meth:`record`, using :py:func:`clock` (a monotonic
+    clock) to get their timestamps. A :py:class:`Histogram` is kept per
+    (scope, phase), scope being either 'simulation' or the name of a
+    component. When tracing is enabled, each record is also kept as a
+    Chrome trace event, which can be written with :py:meth:`dump`.
+
+    When the profiler is not enabled, the instrumented code must not call
+    :py:meth:`record`, so its only cost is to check :py:attr:`enabled`.
+    """
+    def __init__(self, window = DEFAULT_WINDOW, trace = False,
+                       trace_size = DEFAULT_TRACE_SIZE, trace_file = None):
+        self.enabled = False
+        self.window = window
+        self.trace = trace
+        self.trace_file = trace_file
+        self._histograms = {}
+        self._events = deque(maxlen = trace_size)
+        self._origin = clock()
+        self._last_tick = None
+
+    def enable(self, trace = None):
+        if trace is not None:
+            self.trace = trace
+        self.enabled = True
+        self._last_tick = None
+        logger.info("Profiler enabled (trace: %s)" % self.trace)
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """ Forget all the recorded durations and trace events """
+        self._histograms = {}
+        self._events.clear()
+        self._last_tick = None
+
+    def record(self, scope, phase, start, end):
+        """ Record that phase of scope ran from start to end (two
+        timestamps returned by :py:func:`clock`) """
+        key = (scope, phase)
+        histogram = self._histograms.get(key)
+        if not histogram:
+            histogram = self._histograms[key] = Histogram(self.window)
+        histogram.add(end - start)
+
+        if self.trace:
+            self._events.append((scope, phase, start, end,
+                                 threading.current_thread().ident))
+
+    def tick(self, now):
+        """ Mark the beginning of a new simulation step
+
+        The duration between two calls is recorded as the 'tick' phase of
+        the 'simulation' scope.
+        """
+        if self._last_tick is not None:
+            self.record(SIMULATION, 'tick', self._last_tick, now)
+        self._last_tick = now
+
+    def statistics(self):
+        """ Return the statistics of each phase, grouped by scope:
+
+        ``{scope: {phase: {'count', 'mean', 'max', 'p50', 'p95', 'p99'}}}``
+        """
+        res = {}
+        for (scope, phase), histogram in list(self._histograms.items()):
+            res.setdefault(scope, {})[phase] = histogram.statistics()
+        return res
+
+    def trace_events(self):
+        """ Return the recorded events in the Chrome trace event format """
+        events = []
+        for scope, phase, start, end, tid in list(self._events):
+            events.append({'name': '%s.%s' % (scope, phase),
+                           'cat': scope,
+                           'ph': 'X',
+                           'ts': 1e6 * (start - self._origin),
+                           'dur': 1e6 * (end - start),
+                           'pid': 0,
+                           'tid': tid})
+        return events
+
+    def dump(self, path):
+        """ Write the trace events and the statistics in path, as a JSON
+        file which can be loaded by chrome://tracing """
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events(),
+                       'displayTimeUnit': 'ms',
+                       'otherData': {'statistics': self.statistics()}}, f)
+        logger.info("Profiler trace written in %s" % path)
+        return path
+
+
+def create_profiler():
+    """ Create the profiler from the properties set in the Builder with
+    ``env.enable_profiler()``
+
+    The profiler is always created, so it can be enabled at runtime with
+    the ``simulation.enable_profiler`` service.
+    """
+    ssr = blenderapi.getssr()
+    if not ssr:
+        return Profiler()
+
+    trace_file = ssr.get('profiler_trace', '') or None
+    profiler = Profiler(window = ssr.get('profiler_window', DEFAULT_WINDOW),
+                        trace = bool(trace_file),
+                        trace_file = trace_file)
+    if ssr.get('profiler', False):
+        profiler.enable()
+    return profiler
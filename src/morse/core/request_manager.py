@@ -2,13 +2,57 @@ import logging; logger = logging.getLogger("morse." + __name__)
 #logger.setLevel(logging.DEBUG)
 import os
 import sys
-import uuid
+import inspect
+import itertools
 from functools import partial
 from abc import ABCMeta, abstractmethod
 
 from morse.core.exceptions import *
 from morse.core import status, blenderapi
 
+# Ids of the asynchronous requests, unique for the whole simulation
+_request_ids = itertools.count(1)
+
+def service_arity(callback, is_async = False):
+    """ Return the minimum and maximum number of parameters of a service
+    (the maximum being None for variadic services), or None if the
+    signature of callback can not be inspected.
+
+    The callback of asynchronous services is not counted. For methods
+    decorated by @async_service, the signature of the original method is
+    used.
+    """
+    try:
+        signature = inspect.signature(callback)
+    except (TypeError, ValueError):
+        return None
+    parameters = list(signature.parameters.values())
+    if is_async and not hasattr(callback, '__wrapped__'):
+        # the first parameter is the result setter
+        parameters = parameters[1:]
+    min_args = max_args = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL:
+            max_args = None
+        elif parameter.kind in (parameter.POSITIONAL_ONLY,
+                                parameter.POSITIONAL_OR_KEYWORD):
+            if max_args is not None:
+                max_args += 1
+            if parameter.default is parameter.empty:
+                min_args += 1
+    return min_args, max_args
+
+def _format_arity(arity, nb_params):
+    min_args, max_args = arity
+    if max_args is None:
+        expected = "at least %d" % min_args
+    elif min_args == max_args:
+        expected = "%d" % min_args
+    else:
+        expected = "%d to %d" % (min_args, max_args)
+    return expected, nb_params
+
+
 class RequestManager(object):
     """ Basic Class for all request dispatchers, i.e., classes that
     implement a *request service*.
@@ -53,7 +97,8 @@ class RequestManager(object):
 
         # This map holds the list of all registered services
         # It associates a tuple (component,service) to a tuple
-        # (rpc_callback, is_async)
+        # (rpc_callback, is_async, arity), arity being computed once by
+        # service_arity
         self._services = {}
 
         # This hold the mapping request id <-> result for asynchronous
@@ -159,7 +204,8 @@ class RequestManager(object):
         if hasattr(callback, '__call__'):
             service_name = service_name if service_name else callback.__name__
 
-            self._services[(component_name, service_name)] = (callback, async)
+            self._services[(component_name, service_name)] = \
+                    (callback, async, service_arity(callback, async))
 
             if self.post_registration(component_name, service_name, async):
                 logger.info(str(self) + ": " + \
@@ -208,18 +254,27 @@ class RequestManager(object):
 
         """
 
-        logger.info("Incoming request " + service + " for " + component + "!")
-
-        #Unique ID for our request
-        request_id = uuid.uuid1()
+        logger.debug("Incoming request %s for %s", service, component)
 
         try:
-            method, is_async = self._services[(component, service)]
+            method, is_async, arity = self._services[(component, service)]
         except KeyError:
             raise MorseMethodNotFoundError("The request " + service + " has not been registered in " + str(self))
 
+        if arity:
+            nb_params = len(params) if params else 0
+            if nb_params < arity[0] or \
+               (arity[1] is not None and nb_params > arity[1]):
+                if not params:
+                    raise MorseRPCNbArgsError(str(self) + ": parameters expected for service " + service + "!")
+                raise MorseRPCNbArgsError(str(self) + ": wrong # of parameters for service " + service + \
+                        ". Expected %s, got %d" % _format_arity(arity, nb_params))
+
         if is_async:
 
+            # Id of our request
+            request_id = next(_request_ids)
+
             # Creates a result setter functor: this functor is used as
             # callback for the asynchronous service.
             result_setter = partial(self._completed_requests.__setitem__, request_id)
@@ -233,51 +288,29 @@ class RequestManager(object):
                 # (for instance, for later interruption)
                 self._pending_requests[request_id] = (component, service)
 
-            except AttributeError as e:
-                raise MorseRPCTypeError(str(self) + ": wrong parameter type for service " + service + ". " + str(e))
-            except TypeError as e:
-
-                # Check if the type error comes from a wrong # of args.
-                # We perform this check only after an exception is
-                # thrown to avoid loading the inspect module by default.
-                import inspect, traceback
+            except (AttributeError, TypeError) as e:
+                # The number of parameters has already been checked
+                import traceback
                 logger.debug(traceback.format_exc())
-                if not params:
-                    raise MorseRPCNbArgsError(str(self) + ": parameters expected for service " + service + "! " + str(e))
-                elif len(params) != (len(inspect.getargspec(method)[0]) - 2): # -2 because of self and callback
-                    raise MorseRPCNbArgsError(str(self) + ": wrong # of parameters for service " + service + ". " + str(e))
-                else:
-                    raise MorseRPCTypeError(str(self) + ": wrong parameter type for service " + service + ". " + str(e))
+                raise MorseRPCTypeError(str(self) + ": wrong parameter type for service " + service + ". " + str(e))
 
-            logger.debug("Asynchronous request '" + str(request_id) + "' successfully started.")
+            logger.debug("Asynchronous request '%s' successfully started.", request_id)
             return False, request_id
 
         else: #Synchronous service.
             #Invoke the method
-            logger.info("Synchronous service -> invoking it now.")
             try:
                 values = method(*params) if params else method() #Invoke the method with unpacked parameters
-            except AttributeError as e:
-                raise MorseRPCTypeError(str(self) + ": wrong parameter type for service " + service + ". " + str(e))
-            except TypeError as e:
-                # Check if the type error comes from a wrong # of args.
-                # We perform this check only after an exception is
-                # thrown to avoid loading the inspect module by default.
-                # TODO: Does it make sense?
-                import inspect, traceback
+            except (AttributeError, TypeError) as e:
+                # The number of parameters has already been checked
+                import traceback
                 logger.debug(traceback.format_exc())
-                if not params:
-                    raise MorseRPCNbArgsError(str(self) + ": parameters expected for service " + service + "! " + str(e))
-                if len(params) != (len(inspect.getargspec(method)[0]) - 1): # -1 because of 'self'
-                    raise MorseRPCNbArgsError(str(self) + ": wrong # of parameters for service " + service + ". " + str(e))
-                else:
-                    raise MorseRPCTypeError(str(self) + ": wrong parameter type for service " + service + ". " + str(e))
+                raise MorseRPCTypeError(str(self) + ": wrong parameter type for service " + service + ". " + str(e))
 
             # If we are here, no exception has been raised by the
             # service, which mean the service call is successful. Good.
-            values = (status.SUCCESS, values)
-            logger.info("Done. Result: " + str(values))
-            return True, values
+            logger.debug("Synchronous service %s done. Result: %s", service, values)
+            return True, (status.SUCCESS, values)
 
     def abort_request(self, request_id):
         """ This method will interrupt a running asynchronous service,
@@ -308,7 +341,7 @@ class RequestManager(object):
         if self._completed_requests:
             for request, result in list(self._completed_requests.items()):
                 if result:
-                    logger.debug(str(self) + ": Request " + str(request) + " is now completed.")
+                    logger.debug("%s: Request %s is now completed.", self, request)
                     del self._pending_requests[request]
                     del self._completed_requests[request]
                     self.on_service_completion(request, result)
@@ -320,7 +353,7 @@ class RequestManager(object):
         Subclasses are expected to overload this method with code to notify
         the original request emitter.
 
-        :param uuid request_id: the request id, as return by :py:meth:`on_incoming_request`
+        :param int request_id: the request id, as return by :py:meth:`on_incoming_request`
                     when processing an asynchronous request
         :param result: the service execution result.
         """
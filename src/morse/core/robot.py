@@ -1,9 +1,11 @@
 import logging; logger = logging.getLogger("morse." + __name__)
 from abc import ABCMeta
 import morse.core.object
+from morse.core.profiler import clock
 from morse.core import blenderapi
 from morse.core import mathutils
 from morse.helpers.components import add_property
+from morse.helpers.transformation import forget_world_pose
 
 class Robot(morse.core.object.Object):
     """ Basic Class for all robots
@@ -42,7 +44,18 @@ class Robot(morse.core.object.Object):
         # Update the component's position in the world
         self.position_3d.update(self.bge_object)
 
-        self.default_action()
+        self._run_default_action()
+
+    def _run_default_action(self):
+        """ Call default_action, recording its duration if the profiler
+        is enabled """
+        profiler = self._profiler
+        if profiler and profiler.enabled:
+            time_before_action = clock()
+            self.default_action()
+            profiler.record(self.name(), 'action', time_before_action, clock())
+        else:
+            self.default_action()
 
     def gettime(self):
         """ Return the current time, as seen by the robot, in seconds """
@@ -71,6 +84,7 @@ class Robot(morse.core.object.Object):
                 parent.worldLinearVelocity = [0.0, 0.0, 0.0]
             parent.applyMovement(linear_speed, True)
             parent.applyRotation(angular_speed, True)
+            forget_world_pose(parent)
         elif kind == 'Velocity':
             if self._is_ground_robot:
                 """
@@ -111,5 +125,7 @@ class Robot(morse.core.object.Object):
         if orientation:
             parent.worldOrientation = orientation
 
+        forget_world_pose(parent)
+
         if self.is_dynamic:
             parent.restoreDynamics()
@@ -0,0 +1,190 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+
+from morse.core import blenderapi
+
+# Physics types of the objects which are never moved by the physics engine
+STATIC_PHYSICS_TYPES = ('STATIC', 'NO_COLLISION', 'OCCLUDER', 'NAVMESH')
+
+# Game properties of the objects moved by MORSE (robots, components, and
+# passive objects which can be grasped or teleported)
+MOVABLE_PROPERTIES = ('Robot_Tag', 'External_Robot_Tag', 'Component_Tag',
+                      'Object')
+
+
+def copy_pose(obj_from, obj_to):
+    obj_to.worldPosition = obj_from.worldPosition
+    obj_to.worldOrientation = obj_from.worldOrientation
+
+
+def physics_type(obj):
+    """ Return the physics type of obj, as set in Blender, or None if it is
+    unknown """
+    try:
+        return blenderapi.objectdata(obj.name).game.physics_type
+    except (KeyError, AttributeError):
+        return None
+
+
+def is_static(obj):
+    """ Return True if obj can not move during the simulation
+
+    An object is static if it has no parent, no logic bricks, none of the
+    game properties of the objects moved by MORSE (see
+    ``MOVABLE_PROPERTIES``), and if it is not moved by the physics engine.
+    """
+    if obj.parent is not None:
+        return False
+    if obj.controllers or obj.actuators:
+        return False
+    properties = obj.getPropertyNames()
+    if any(prop in properties for prop in MOVABLE_PROPERTIES):
+        return False
+    return physics_type(obj) in STATIC_PHYSICS_TYPES
+
+
+class SceneSync(object):
+    """ Copy the poses of the objects of the logic scene into an overlay
+    scene, such as the scenes rendered by the cameras
+
+    The static objects (see :py:func:`is_static`) are copied once, when
+    the synchronisation is created, and then ignored, until they are moved
+    (see :py:func:`object_moved`). The other ones are only copied when
+    their world transform changed since the previous copy.
+    :py:meth:`sync` does the work at most once per simulation step, so
+    that all the cameras rendering the same scene share it.
+    """
+    def __init__(self, scene, morse_scene):
+        self.scene = scene
+        # [overlay object, logic object, last copied transform]
+        self._dynamic = []
+        # logic object -> [overlay object, copied transform]
+        self._static = {}
+        self.copied = 0
+        self._last_sync = None
+
+        for _to, _from in self._pairs(scene, morse_scene):
+            try:
+                copy_pose(_from, _to)
+            except Exception as e:
+                logger.warning(str(e))
+                continue
+            if is_static(_from):
+                self._static[_from] = [_to, _from.worldTransform]
+            else:
+                self._dynamic.append([_to, _from, _from.worldTransform])
+
+        logger.info("Scene %s: %d objects to synchronise, %d static objects "
+                    "ignored" % (scene.name, len(self._dynamic), self.nb_static))
+
+    @staticmethod
+    def _pairs(scene, morse_scene):
+        """
+        Compute the relation between objects in the current scene and
+        objects in the main logic scene.
+
+        The logic is a bit complex, as in the case of group, we can have
+        objects with the same name (but different ids). So, in this
+        case, we follow the hierarchy on both scene to find
+        correspondance (assuming no recursive group)
+
+        known_ids is used to track objects alreay referenced and not
+        include it twice (and possibly missing the fact that the same
+        name can reference multiples different objects)
+
+        I'm definitively not sure it is correct at all, it is a really
+        really dark corner of Blender :). But it seems to do the job!
+        """
+        pairs = []
+        known_ids = set()
+        for obj in scene.objects:
+            if obj.name != '__default__cam__' and id(obj) not in known_ids:
+                members = obj.groupMembers
+                if not members:
+                    pairs.append((obj, morse_scene.objects[obj.name]))
+                    known_ids.add(id(obj))
+                else:
+                    main_members = morse_scene.objects[obj.name].groupMembers
+                    for i in range(0, len(main_members)):
+                        pairs.append((members[i], main_members[i]))
+                        known_ids.add(id(members[i]))
+                        childs = members[i].childrenRecursive
+                        main_childs = main_members[i].childrenRecursive
+                        for child in childs:
+                            pairs.append((child, main_childs[child.name]))
+                            known_ids.add(id(child))
+        return pairs
+
+    def __len__(self):
+        return len(self._dynamic)
+
+    @property
+    def nb_static(self):
+        return len(self._static)
+
+    def moved(self, obj):
+        """ Synchronise again obj, if it is a static object which has been
+        moved since it was copied """
+        entry = self._static.get(obj)
+        if entry is None:
+            return
+        _to, transform = entry
+        if obj.worldTransform != transform:
+            del self._static[obj]
+            self._dynamic.append([_to, obj, None])
+            logger.info("%s: %s has been moved, it is now synchronised" %
+                        (self.scene.name, obj.name))
+
+    def sync(self):
+        """ Copy the poses of the objects which moved since the previous
+        call. Do nothing if it was already called during this step. """
+        now = blenderapi.persistantstorage().time.time
+        if now != self._last_sync:
+            self._last_sync = now
+            self.copy()
+
+    def copy(self):
+        """ Copy the poses of the objects which moved since the previous
+        copy, and return their number """
+        copied = 0
+        invalid = None
+        for entry in self._dynamic:
+            _to, _from, last = entry
+            try:
+                transform = _from.worldTransform
+                if transform != last:
+                    copy_pose(_from, _to)
+                    entry[2] = transform
+                    copied += 1
+            except Exception as e:
+                # the object has been removed from one of the scenes
+                logger.warning("%s: %s" % (self.scene.name, e))
+                invalid = invalid or []
+                invalid.append(entry)
+        if invalid:
+            for entry in invalid:
+                self._dynamic.remove(entry)
+        self.copied = copied
+        return copied
+
+
+def object_moved(obj):
+    """ Tell the synchronisations of the camera scenes that obj has been
+    moved, so that they copy it again if it was considered as static """
+    syncs = blenderapi.persistantstorage().get('scene_syncs')
+    if syncs:
+        for scene_sync in syncs.values():
+            scene_sync.moved(obj)
+
+
+def get_scene_sync(scene_name):
+    """ Return the synchronisation of the scene scene_name with the logic
+    scene, shared by all the cameras rendering this scene """
+    persistantstorage = blenderapi.persistantstorage()
+    syncs = persistantstorage.setdefault('scene_syncs', {})
+    scene_sync = syncs.get(scene_name)
+    if scene_sync is None:
+        scene_map = blenderapi.get_scene_map()
+        scene_sync = SceneSync(scene_map[scene_name],
+                               scene_map['S.MORSE_LOGIC'])
+        syncs[scene_name] = scene_sync
+    return scene_sync
@@ -0,0 +1,158 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+
+from morse.core import blenderapi
+from morse.core.actuator import Actuator
+
+# Categories of the scheduled objects, in the order they run at each tick
+ROBOTS, ACTUATORS, SENSORS = range(3)
+
+
+def logic_sensor(obj):
+    """ Return the Always sensor calling the action of obj (see
+    AbstractComponent.morseable() in the Builder) if it is, with its Python
+    controller, the only logic brick of obj, or None otherwise
+
+    The objects with other logic bricks (the radar of the gripper, the
+    touch sensor of the collision sensor, the sound actuator...) read them
+    from their action through blenderapi.controller(): they must be run by
+    their own controller.
+    """
+    sensors = obj.sensors
+    if len(sensors) != 1 or len(obj.controllers) != 1 or obj.actuators:
+        return None
+    if sensors[0] not in blenderapi.getalwayssensors(obj):
+        return None
+    return sensors[0]
+
+
+def skipped_ticks(sensor):
+    if blenderapi.version() >= (2, 74, 5):
+        return sensor.skippedTicks
+    return sensor.frequency
+
+
+class TickScheduler(object):
+    """ Run the actions of the robots and of the components from
+    :py:func:`morse.blender.main.simulation_main`
+
+    By default, each robot and component is run by its own Game Logic
+    brick, its frequency being emulated by skipping ticks. The scheduler
+    replaces these bricks by a precomputed schedule: at each tick, it runs
+    the robots, then the actuators, then the sensors whose turn it is. Only
+    the objects whose only logic brick is their Always sensor are scheduled
+    (see :py:func:`logic_sensor`), the other ones keep their bricks.
+
+    An object of period ``p`` (it runs every ``p`` ticks) and of phase
+    ``f`` runs at the ticks ``t`` such as ``t % p == f``. The phase is set
+    with the ``tick_phase`` game property (see
+    :py:meth:`morse.builder.abstractcomponent.AbstractComponent.frequency`).
+    Otherwise, if ``stagger`` is True, the objects of the same period are
+    spread over the phases, so that for instance 12 cameras at 10 Hz in a
+    60 Hz simulation run two by two instead of all on the same tick.
+    """
+    def __init__(self, stagger = True):
+        self.stagger = stagger
+        self.tick = 0
+        # category -> [(period, [list of objects, for each phase])]
+        self._schedule = [[], [], []]
+        self._next_phase = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, instance, category, period = 1, phase = None):
+        """ Schedule instance every period ticks """
+        period = max(1, int(period))
+        if phase is None:
+            if self.stagger and period > 1:
+                phase = self._next_phase.get(period, 0)
+                self._next_phase[period] = (phase + 1) % period
+            else:
+                phase = 0
+        phase = int(phase) % period
+
+        for p, phases in self._schedule[category]:
+            if p == period:
+                break
+        else:
+            phases = [[] for i in range(period)]
+            self._schedule[category].append((period, phases))
+            self._schedule[category].sort(key = lambda entry: entry[0])
+        phases[phase].append(instance)
+        self._size += 1
+        return period, phase
+
+    def due(self, tick = None):
+        """ Return the list of the objects running at tick (by default,
+        the next tick) """
+        if tick is None:
+            tick = self.tick
+        return [instance for category in self._schedule
+                         for period, phases in category
+                         for instance in phases[tick % period]]
+
+    def run(self):
+        """ Run the objects whose turn it is, and go to the next tick """
+        tick = self.tick
+        for category in self._schedule:
+            for period, phases in category:
+                for instance in phases[tick % period]:
+                    # As with the logic bricks, an error in an action does
+                    # not prevent the other ones (and the end of
+                    # simulation_main) from running
+                    try:
+                        instance.action()
+                    except Exception:
+                        logger.error("Error in the action of %s" %
+                                     instance.name(), exc_info = True)
+        self.tick = tick + 1
+
+
+def _schedule_object(scheduler, instance, category):
+    """ Schedule instance, and return its (period, phase), or None if it
+    is left to its logic bricks """
+    obj = instance.bge_object
+    sensor = logic_sensor(obj)
+    if sensor is None:
+        logger.info("%s has several logic bricks: not scheduled" %
+                    instance.name())
+        return None
+    # The action is now called by the scheduler: the Always sensor only
+    # triggers its controller once, which then ignores it (see
+    # morse.blender.calling)
+    sensor.usePosPulseMode = False
+    instance.tick_scheduled = True
+    return scheduler.add(instance, category, skipped_ticks(sensor) + 1,
+                         obj.get('tick_phase'))
+
+
+def create_tick_scheduler():
+    """ Create the scheduler from the properties set in the Builder with
+    ``env.use_tick_scheduler()``, or return None if it is not enabled.
+
+    It must be called once the robots and the components are created.
+    """
+    ssr = blenderapi.getssr()
+    if not ssr or not ssr.get('tick_scheduler', False):
+        return None
+
+    persistantstorage = blenderapi.persistantstorage()
+    scheduler = TickScheduler(ssr.get('tick_scheduler_stagger', True))
+
+    for robot in persistantstorage.robotDict.values():
+        _schedule_object(scheduler, robot, ROBOTS)
+
+    # Sort the components, so that the phases do not depend on the order
+    # of the dictionary, and objects of the same class are spread evenly
+    components = sorted(persistantstorage.componentDict.values(),
+                        key = lambda c: (type(c).__name__, c.name()))
+    for component in components:
+        category = ACTUATORS if isinstance(component, Actuator) else SENSORS
+        schedule = _schedule_object(scheduler, component, category)
+        if schedule:
+            logger.debug("%s scheduled every %d tick(s), phase %d" %
+                         ((component.name(), ) + schedule))
+
+    logger.info("Tick scheduler: %d objects scheduled" % len(scheduler))
+    return scheduler
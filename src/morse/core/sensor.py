@@ -1,6 +1,7 @@
 import logging; logger = logging.getLogger("morse." + __name__)
 from abc import ABCMeta
-import time # profiler
+import time
+from morse.core.profiler import clock
 import morse.core.object
 from morse.core.services import service
 from morse.helpers.components import add_data
@@ -31,6 +32,11 @@ class Sensor(morse.core.object.Object):
         self.output_functions = []
         self.output_modifiers = []
 
+        # Cache of sensor_to_robot_position_3d, valid as long as the local
+        # transforms between the sensor and the robot do not change
+        self._mount = None
+        self._sensor_to_robot = None
+
         self.profile = None
         if "profile" in self.bge_object:
             self.time = {}
@@ -38,7 +44,7 @@ class Sensor(morse.core.object.Object):
                             "profile_datastreams"]
             for key in self.profile:
                 self.time[key] = 0.0
-            self.time_start = time.time()
+            self.time_start = clock()
 
     def finalize(self):
         self._active = False
@@ -50,11 +56,38 @@ class Sensor(morse.core.object.Object):
         """
         Compute the transformation which will transform a vector from
         the sensor coordinate-frame to the associated robot frame
+
+        The result is cached while the sensor does not move relatively to
+        the robot, and must not be modified.
         """
+        mount = self._mount_transforms()
+        if mount is not None and mount == self._mount:
+            return self._sensor_to_robot
+
         main_to_origin = self.robot_parent.position_3d
         main_to_sensor = main_to_origin.transformation3d_with(self.position_3d)
+        if mount is not None:
+            self._mount = mount
+            self._sensor_to_robot = main_to_sensor
         return main_to_sensor
 
+    def _mount_transforms(self):
+        """
+        Return the local transforms of the sensor and of its parents, up
+        to the robot, or None if the sensor is not a descendant of the
+        robot. They only change when the sensor is moved relatively to the
+        robot (for instance, by a PTU).
+        """
+        robot = self.robot_parent.bge_object
+        obj = self.bge_object
+        mount = []
+        while obj is not robot:
+            if obj is None:
+                return None
+            mount.append(obj.localTransform)
+            obj = obj.parent
+        return mount
+
     def action(self):
         """ Call the action functions that have been added to the list. """
         # Do nothing if this component has been deactivated
@@ -68,32 +101,46 @@ class Sensor(morse.core.object.Object):
         if logger.isEnabledFor(logging.DEBUG):
             self.local_data['simulator_time'] = time.time()
 
+        profiler = self._profiler
+        profiling = self.profile or (profiler and profiler.enabled)
+
         # record the time before performing the default action for profiling
-        if self.profile:
-            time_before_action = time.time()
+        if profiling:
+            time_before_action = clock()
 
         # Call the regular action function of the component
         self.default_action()
 
         # record the time before calling modifiers for profiling
-        if self.profile:
-            time_before_modifiers = time.time()
+        if profiling:
+            time_before_modifiers = clock()
 
         # Data modification functions
         for function in self.output_modifiers:
             function()
 
         # record the time before calling datastreams for profiling
-        if self.profile:
-            time_before_datastreams = time.time()
+        if profiling:
+            time_before_datastreams = clock()
 
         # Lastly output functions
         for function in self.output_functions:
             function(self)
 
         # profiling
+        if profiling:
+            time_now = clock()
+
+        if profiler and profiler.enabled:
+            name = self.name()
+            profiler.record(name, 'action', time_before_action,
+                            time_before_modifiers)
+            profiler.record(name, 'modifiers', time_before_modifiers,
+                            time_before_datastreams)
+            profiler.record(name, 'datastreams', time_before_datastreams,
+                            time_now)
+
         if self.profile:
-            time_now = time.time()
             self.time["profile"] += time_now - time_before_action
             self.time["profile_action"] += time_before_modifiers - time_before_action
             self.time["profile_modifiers"] += time_before_datastreams - time_before_modifiers
@@ -106,7 +153,7 @@ class Sensor(morse.core.object.Object):
             if morse_time > 1: # re-init mean every sec
                 for key in self.profile:
                     self.time[key] = 0.0
-                self.time_start = time.time()
+                self.time_start = clock()
 
     @service
     def get_local_data(self):
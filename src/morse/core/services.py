@@ -201,6 +201,9 @@ def service(fn = None, component = None, name = None, async = False):
                 dfn = decorated_fn
                 dfn.__name__ = fn.__name__
                 dfn.__doc__ = fn.__doc__
+                # Used to check the number of parameters of the service
+                # (see morse.core.request_manager.service_arity)
+                dfn.__wrapped__ = fn
 
                 # Copy all special values the original method may have.
                 # This is useful in case of cascading decorator (cf
@@ -0,0 +1,215 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+import math
+
+from morse.core import blenderapi
+
+# Default size, in meters, of the cells of the grids
+DEFAULT_CELL_SIZE = 5.0
+
+
+class SpatialGrid(object):
+    """ Uniform grid of objects over the (x, y) plane
+
+    Each object is stored in the cell containing its position, and may
+    be given a radius (the radius of its bounding sphere), so that queries
+    can take its extent into account. The altitude is not used to select
+    the cells, only to compute the exact distances.
+
+    Cells are recomputed by :py:meth:`update`, which only moves the objects
+    which changed of cell since the previous update.
+    """
+    def __init__(self, cell_size = DEFAULT_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        # object -> [cell, radius]
+        self._objects = {}
+        self._max_radius = 0.0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        return obj in self._objects
+
+    def _cell(self, pos):
+        return (int(math.floor(pos[0] / self.cell_size)),
+                int(math.floor(pos[1] / self.cell_size)))
+
+    def insert(self, obj, radius = 0.0):
+        if obj in self._objects:
+            self.remove(obj)
+        cell = self._cell(obj.worldPosition)
+        self._cells.setdefault(cell, set()).add(obj)
+        self._objects[obj] = [cell, radius]
+        self._max_radius = max(self._max_radius, radius)
+
+    def remove(self, obj):
+        entry = self._objects.pop(obj, None)
+        if entry:
+            cell = self._cells[entry[0]]
+            cell.discard(obj)
+            if not cell:
+                del self._cells[entry[0]]
+
+    def update(self):
+        """ Move the objects which changed of cell, and forget the objects
+        which have been removed from the scene """
+        cells = self._cells
+        for obj, entry in list(self._objects.items()):
+            if obj.invalid:
+                self.remove(obj)
+                continue
+            cell = self._cell(obj.worldPosition)
+            if cell != entry[0]:
+                old = cells[entry[0]]
+                old.discard(obj)
+                if not old:
+                    del cells[entry[0]]
+                cells.setdefault(cell, set()).add(obj)
+                entry[0] = cell
+
+    def query_box(self, lower, upper):
+        """ Return the objects stored in the cells overlapping the (x, y)
+        box [lower, upper], enlarged by the radius of the biggest object.
+
+        This is a coarse selection: the caller must check the exact
+        position of the returned objects.
+        """
+        margin = self._max_radius
+        min_x, min_y = self._cell((lower[0] - margin, lower[1] - margin))
+        max_x, max_y = self._cell((upper[0] + margin, upper[1] + margin))
+
+        res = []
+        nb_cells = (max_x - min_x + 1) * (max_y - min_y + 1)
+        if nb_cells > len(self._cells):
+            # Large query: cheaper to walk the non-empty cells
+            for (x, y), objects in self._cells.items():
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    res.extend(objects)
+        else:
+            cells = self._cells
+            for x in range(min_x, max_x + 1):
+                for y in range(min_y, max_y + 1):
+                    objects = cells.get((x, y))
+                    if objects:
+                        res.extend(objects)
+        return res
+
+    def query_radius(self, center, radius):
+        """ Return a list of (object, distance) for the objects whose
+        center is at most radius meters away from center """
+        res = []
+        cx, cy, cz = center[0], center[1], center[2]
+        lower = (cx - radius, cy - radius)
+        upper = (cx + radius, cy + radius)
+        for obj in self.query_box(lower, upper):
+            pos = obj.worldPosition
+            distance = math.sqrt((pos[0] - cx) ** 2 + (pos[1] - cy) ** 2 +
+                                 (pos[2] - cz) ** 2)
+            if distance <= radius:
+                res.append((obj, distance))
+        return res
+
+    def query_cone(self, apex, direction, half_angle, length):
+        """ Return the objects whose bounding sphere intersects the cone
+        starting at apex, oriented along the unit vector direction, of
+        the given half angle (in radians) and length.
+
+        It is a conservative approximation of a camera frustum.
+        """
+        res = []
+        ax, ay, az = apex[0], apex[1], apex[2]
+        lower = (ax - length, ay - length)
+        upper = (ax + length, ay + length)
+        for obj in self.query_box(lower, upper):
+            radius = self._objects[obj][1]
+            pos = obj.worldPosition
+            vx, vy, vz = pos[0] - ax, pos[1] - ay, pos[2] - az
+            distance = math.sqrt(vx * vx + vy * vy + vz * vz)
+            if distance <= radius:
+                res.append(obj)
+                continue
+            if distance - radius > length:
+                continue
+            cos_angle = (vx * direction[0] + vy * direction[1] +
+                         vz * direction[2]) / distance
+            angle = math.acos(max(-1.0, min(1.0, cos_angle)))
+            if angle - math.asin(radius / distance) <= half_angle:
+                res.append(obj)
+        return res
+
+
+class SpatialIndex(object):
+    """ Scene-wide spatial index, stored in the persistant storage
+
+    It holds one :py:class:`SpatialGrid` per key, each grid being filled
+    once, when first requested, with the objects of the
+    :py:class:`morse.core.object_registry.ObjectRegistry` selected by a
+    predicate. The objects added to or removed from the scene at runtime
+    are added to or removed from the grids through the registry.
+
+    All the grids are refreshed at most once per simulation step, when
+    they are queried, so that several components querying the same grid
+    during a step only pay once for the moved objects.
+    """
+    def __init__(self, registry, cell_size = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._registry = registry
+        # key -> (grid, select, radius)
+        self._grids = {}
+        self._stamp = None
+        registry.subscribe(self._on_scene_change)
+
+    def grid(self, key, select, radius = None, objects = None):
+        """ Return the grid associated to key, creating it if needed with
+        the objects for which select(obj) is true
+
+        :param radius: an optional function returning the radius of the
+                       bounding sphere of an object
+        :param objects: the objects to consider when creating the grid
+                        (default: all the objects of the registry)
+        """
+        entry = self._grids.get(key)
+        if entry is None:
+            grid = SpatialGrid(self.cell_size)
+            if objects is None:
+                objects = self._registry.objects()
+            for obj in objects:
+                if select(obj):
+                    grid.insert(obj, radius(obj) if radius else 0.0)
+            logger.info("Spatial index: %d objects for %s" % (len(grid), key))
+            entry = self._grids[key] = (grid, select, radius)
+        return self._refresh(entry[0])
+
+    def _refresh(self, grid):
+        stamp = blenderapi.persistantstorage().time.time
+        if stamp != self._stamp:
+            self._stamp = stamp
+            for g, _, _ in self._grids.values():
+                g.update()
+        return grid
+
+    def _on_scene_change(self, added, removed):
+        for grid, select, radius in self._grids.values():
+            for obj in removed:
+                grid.remove(obj)
+            for obj in added:
+                if select(obj):
+                    grid.insert(obj, radius(obj) if radius else 0.0)
+
+
+def bounding_radius(bound_box):
+    """ Return the radius of the sphere, centered on the origin of the
+    object, containing the bounding box bound_box """
+    return max(math.sqrt(c[0] ** 2 + c[1] ** 2 + c[2] ** 2) for c in bound_box)
+
+
+def create_spatial_index(registry):
+    """ Create the spatial index of the objects of registry, the cell size
+    being configurable in the Builder with
+    ``env.properties(spatial_index_cell_size = 10.0)`` """
+    ssr = blenderapi.getssr()
+    cell_size = DEFAULT_CELL_SIZE
+    if ssr:
+        cell_size = ssr.get('spatial_index_cell_size', DEFAULT_CELL_SIZE)
+    return SpatialIndex(registry, cell_size)
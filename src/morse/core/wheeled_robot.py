@@ -39,7 +39,7 @@ class PhysicsWheelRobot(morse.core.robot.Robot):
         # Update the component's position in the world
         self.position_3d.update_Y_forward(self.bge_object)
 
-        self.default_action()
+        self._run_default_action()
 
 
     def get_wheels(self):
@@ -0,0 +1,68 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+from array import array
+
+from morse.core import blenderapi
+
+# Fields describing the state of each robot, in this order: the pose (see
+# Transformation3d) then the linear and angular velocities, in the world
+# frame
+STATE_FIELDS = ('x', 'y', 'z', 'yaw', 'pitch', 'roll',
+                'vx', 'vy', 'vz', 'wx', 'wy', 'wz')
+
+
+def robots():
+    """ Return the list of (name, robot instance) of all the robots of
+    the simulation, local and external, sorted by name """
+    storage = blenderapi.persistantstorage()
+    res = []
+    for name in ('robotDict', 'externalRobotDict'):
+        for robot in storage.get(name, {}).values():
+            res.append((robot.name(), robot))
+    res.sort(key = lambda r: r[0])
+    return res
+
+
+class WorldState(object):
+    """ Pack the state (see STATE_FIELDS) of all the robots in a single
+    contiguous array of float64, one row per robot
+
+    The list of robots is computed once: robots do not appear during the
+    simulation.
+    """
+    def __init__(self):
+        self._robots = robots()
+        self.names = [name for name, _ in self._robots]
+        # The external robots are moved by the other simulation nodes, and
+        # do not update their position_3d (Robot.action is not called)
+        external = blenderapi.persistantstorage().get('externalRobotDict', {})
+        self._external = [robot for _, robot in self._robots
+                          if robot in external.values()]
+
+    def pack(self):
+        """ Return a new array('d') of len(names) * len(STATE_FIELDS)
+        values """
+        values = []
+        for robot in self._external:
+            robot.position_3d.update(robot.bge_object)
+        for _, robot in self._robots:
+            pos = robot.position_3d
+            obj = robot.bge_object
+            values.extend((pos.x, pos.y, pos.z, pos.yaw, pos.pitch, pos.roll))
+            values.extend(obj.getLinearVelocity())
+            values.extend(obj.getAngularVelocity())
+        return array('d', values)
+
+    def to_dict(self, state = None):
+        """ Return the state in a compact JSON-friendly form:
+
+        ``{'timestamp': t, 'fields': STATE_FIELDS, 'robots': names,
+        'states': [[x, y, z, yaw, pitch, roll, vx, ...], ...]}``
+        """
+        if state is None:
+            state = self.pack()
+        nb_fields = len(STATE_FIELDS)
+        return {'timestamp': blenderapi.persistantstorage().time.time,
+                'fields': STATE_FIELDS,
+                'robots': self.names,
+                'states': [state[i:i + nb_fields].tolist()
+                           for i in range(0, len(state), nb_fields)]}
@@ -1,7 +1,78 @@
 from morse.core import blenderapi
 from morse.core import mathutils
+from morse.core.scene_sync import object_moved
 from math import sqrt
 
+# World matrices read during the current frame: frame time, and
+# object -> matrix
+_world_frame = None
+_world_matrices = {}
+
+_correction_matrix = None
+
+def _read_world_matrix(obj):
+    matrix = obj.worldOrientation.to_4x4()
+
+    pos = obj.worldPosition
+    for i in range(0, 3):
+        matrix[i][3] = pos[i]
+    matrix[3][3] = 1
+    return matrix
+
+def world_matrix(obj):
+    """
+    Return the 4x4 matrix of the transformation between obj (a blender
+    object) and the blender world origin
+
+    The matrix is read once per frame and object, and shared by all the
+    callers: it must not be modified. If the Game Engine does not give the
+    frame time (Blender < 2.77), it is read at each call.
+    """
+    global _world_frame
+    frame = blenderapi.frame_time()
+    if frame == -1:
+        return _read_world_matrix(obj)
+
+    if frame != _world_frame:
+        _world_frame = frame
+        _world_matrices.clear()
+
+    matrix = _world_matrices.get(obj)
+    if matrix is None:
+        matrix = _read_world_matrix(obj)
+        _world_matrices[obj] = matrix
+    return matrix
+
+def forget_world_pose(obj):
+    """
+    Forget the world matrices of obj and of its children read during the
+    current frame. It must be called when obj is moved during the frame
+    (teleported, or moved with applyMovement / applyRotation), so that
+    the next readers see its new pose.
+
+    The cameras are also told that obj moved, in case they considered it
+    as static (see :py:func:`morse.core.scene_sync.object_moved`).
+    """
+    object_moved(obj)
+    if not _world_matrices:
+        return
+    _world_matrices.pop(obj, None)
+    for child in obj.childrenRecursive:
+        _world_matrices.pop(child, None)
+
+def set_world_pose(obj, position = None, orientation = None):
+    """
+    Move obj (a blender object) to position and / or orientation (a 3x3
+    matrix, or anything accepted by worldOrientation), in the world frame,
+    and forget its world matrix read during the current frame (see
+    :py:func:`forget_world_pose`)
+    """
+    if position is not None:
+        obj.worldPosition = position
+    if orientation is not None:
+        obj.worldOrientation = orientation
+    forget_world_pose(obj)
+
 class Transformation3d:
     """
     Transformation3d represents a generic 3D transformation. It is used
@@ -13,6 +84,12 @@ class Transformation3d:
     transformation.  the euler representation is then calculated on base
     of matrix (euler ZYX convention)
 
+    The euler representation and the inverse of the matrix are only
+    computed when they are used, and kept until the matrix changes. The
+    matrix may be shared with other transformations (see
+    :py:func:`world_matrix`): never modify it in place, but assign a new
+    matrix or use the ``rotation`` and ``translation`` setters.
+
     Note : Blender store its matrix in column major mode ...
     """
 
@@ -29,15 +106,61 @@ class Transformation3d:
                                         [0, 0, 1, 0],
                                         [0, 0, 0, 1]))
 
-        self.euler = mathutils.Euler([0, 0, 0])
         if obj is not None:
             self.update(obj)
 
-        # For use only by robots moving along the Y axis
-        self.correction_matrix = mathutils.Matrix(([0.0, 1.0, 0.0],
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Return the transformation3d of the 4x4 matrix, without copying it
+        """
+        res = cls.__new__(cls)
+        res.matrix = matrix
+        return res
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    @matrix.setter
+    def matrix(self, value):
+        self._matrix = value
+        self._euler = None
+        self._inverse = None
+
+    @property
+    def euler(self):
+        """
+        Returns the rotation as euler angles (ZYX convention)
+        """
+        if self._euler is None:
+            self._euler = self._matrix.to_euler()
+        return self._euler
+
+    @euler.setter
+    def euler(self, value):
+        self._euler = value
+
+    @property
+    def inverse(self):
+        """
+        Returns the inverse of the matrix. It must not be modified.
+        """
+        if self._inverse is None:
+            self._inverse = self._matrix.inverted()
+        return self._inverse
+
+    @property
+    def correction_matrix(self):
+        """
+        For use only by robots moving along the Y axis
+        """
+        global _correction_matrix
+        if _correction_matrix is None:
+            _correction_matrix = mathutils.Matrix(([0.0, 1.0, 0.0],
                                                    [-1.0, 0.0, 0.0],
                                                    [0.0, 0.0, 1.0]))
-
+        return _correction_matrix
 
     @property
     def x(self):
@@ -90,10 +213,11 @@ class Transformation3d:
 
     @rotation.setter
     def rotation(self, value):
+        matrix = self.matrix.copy()
         rmat = value.to_matrix()
         for i in range(0, 3):
-            self.matrix[i][0:3] = rmat[i][0:3]
-        self.euler = self.matrix.to_euler()
+            matrix[i][0:3] = rmat[i][0:3]
+        self.matrix = matrix
 
     @property
     def rotation_matrix(self):
@@ -108,7 +232,9 @@ class Transformation3d:
 
     @translation.setter
     def translation(self, value):
-        self.matrix.translation = value
+        matrix = self.matrix.copy()
+        matrix.translation = value
+        self.matrix = matrix
 
 
     def transformation3d_with(self, t3d):
@@ -119,12 +245,7 @@ class Transformation3d:
 
         self is not modified by the call of this function
         """
-        res = Transformation3d(None)
-        o2m = self.matrix.copy()
-        o2m.invert()
-        res.matrix = o2m * t3d.matrix
-        res.euler = res.matrix.to_euler()
-        return res
+        return Transformation3d.from_matrix(self.inverse * t3d.matrix)
 
     def distance(self, t3d):
         """ 
@@ -154,14 +275,7 @@ class Transformation3d:
         Update the transformation3D to reflect the transformation
         between obj (a blender object) and the blender world origin
         """
-        self.matrix = obj.worldOrientation.to_4x4()
-
-        pos = obj.worldPosition
-        for i in range(0, 3):
-            self.matrix[i][3] = pos[i]
-        self.matrix[3][3] = 1
-
-        self.euler = self.matrix.to_euler()
+        self.matrix = world_matrix(obj)
 
     def update_Y_forward(self, obj):
         """
@@ -174,14 +288,14 @@ class Transformation3d:
         direction of the Y axis, contrary to most of the MORSE components
         that move along the X axis.
         """
-        self.matrix = (obj.worldOrientation * self.correction_matrix).to_4x4()
+        matrix = (obj.worldOrientation * self.correction_matrix).to_4x4()
 
         pos = obj.worldPosition
         for i in range(0, 3):
-            self.matrix[i][3] = pos[i]
-        self.matrix[3][3] = 1
+            matrix[i][3] = pos[i]
+        matrix[3][3] = 1
 
-        self.euler = self.matrix.to_euler()
+        self.matrix = matrix
 
 
     def __str__(self):
@@ -1,3 +1,4 @@
+import threading
 from abc import ABCMeta, abstractmethod
 
 class AbstractDatastream(object):
@@ -13,6 +14,8 @@ class AbstractDatastream(object):
     def __init__(self, component_instance, kwargs):
         self.component_instance = component_instance
         self.kwargs = kwargs
+        # per-thread snapshot of local_data, see default_snapshot
+        self._snapshot = threading.local()
         self.initialize()
 
     @property
@@ -21,6 +24,9 @@ class AbstractDatastream(object):
 
     @property
     def data(self):
+        snapshot = getattr(self._snapshot, 'data', None)
+        if snapshot is not None:
+            return snapshot
         return self.component_instance.local_data
 
     def __str__(self):
@@ -44,6 +50,19 @@ class AbstractDatastream(object):
         #            passed from Sensor / Actuator default_action
         pass
 
+    def default_snapshot(self, data):
+        """ call :meth:`default` with :param data: (a snapshot of
+        `local_data`) in place of the current `local_data`
+
+        Used to run output datastreams outside the main loop, see
+        :py:class:`morse.core.datastream.DatastreamWorkerPool`
+        """
+        self._snapshot.data = data
+        try:
+            self.default()
+        finally:
+            self._snapshot.data = None
+
     def finalize(self):
         """ finalize the specific datastream
 
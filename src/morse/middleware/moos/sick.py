@@ -24,7 +24,8 @@ class LIDARNotifier(AbstractMOOS):
 
         # build string of the form: '[1x180]{4.9, 29.2, ..., 2.98}'
         # replace [] in python string conversion to {} expected by MOOS parsing code
-        laserscan = str(self.data['range_list']).replace('[', '{').replace(']', '}')
+        ranges = [float(r) for r in self.data['range_list']]
+        laserscan = str(ranges).replace('[', '{').replace(']', '}')
         # add array size to beginning of string
         #laserscan = '[1x' + '{0:.0}'.format(num_readings) + ']'+laserscan
         laserscan = '[1x' + '%.0f' % num_readings + ']'+laserscan
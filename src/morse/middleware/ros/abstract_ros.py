@@ -13,6 +13,7 @@ from std_msgs.msg import String, Header
 from geometry_msgs.msg import TransformStamped
 
 from morse.middleware.ros.tfMessage import tfMessage
+from morse.middleware.ros.tf_aggregator import TFAggregator, DYNAMIC, STATIC
 from morse.middleware import AbstractDatastream
 
 from morse.core.blenderapi import persistantstorage
@@ -113,17 +114,26 @@ class ROSPublisher(AbstractROS):
 
 
 class ROSPublisherTF(ROSPublisher):
-    """ Base class for all ROS Publishers with TF support """
-    topic_tf = None
+    """ Base class for all ROS Publishers with TF support
+
+    The transforms are not published directly, but collected by the
+    :py:class:`morse.middleware.ros.tf_aggregator.TFAggregator` of the
+    simulation, which publishes all the transforms of a simulation step in
+    a single message. The transform between the robot and the component is
+    published on ``/tf_static``, unless ``static_tf=False`` is given to
+    the stream (or it changes over time).
+    """
 
     def initialize(self):
         ROSPublisher.initialize(self)
-        if not ROSPublisherTF.topic_tf:
-            ROSPublisherTF.topic_tf = rospy.Publisher("/tf", tfMessage)
-
-    def finalize(self):
-        ROSPublisher.finalize(self)
-        ROSPublisherTF.topic_tf.unregister()
+        self.static_tf = self.kwargs.get('static_tf', True)
+        morse_ps = persistantstorage()
+        if 'tf_aggregator' not in morse_ps:
+            morse_ps.tf_aggregator = TFAggregator(
+                    rospy.Publisher("/tf", tfMessage),
+                    rospy.Publisher("/tf_static", tfMessage, latch=True),
+                    tfMessage)
+        self.tf_aggregator = morse_ps.tf_aggregator
 
     def get_robot_transform(self):
         """ Get the transformation relative to the robot origin
@@ -155,23 +165,22 @@ class ROSPublisherTF(ROSPublisher):
             parent = self.kwargs.get('parent_frame_id', 'base_link')
         #rospy.loginfo("t:%s,r:%s"%(str(translation), str(rotation)))
         # send the transformation
-        self.sendTransform(translation, rotation, time, child, parent)
+        self.sendTransform(translation, rotation, time, child, parent,
+                           STATIC if self.static_tf else DYNAMIC)
 
-    # TF publish method
-    def publish_tf(self, message):
-        """ Publish the TF data on the rostopic
-        """
-        ROSPublisherTF.topic_tf.publish(message)
-
-    def sendTransform(self, translation, rotation, time, child, parent):
+    def sendTransform(self, translation, rotation, time, child, parent,
+                      kind=DYNAMIC):
         """
         :param translation: the translation of the transformtion as geometry_msgs/Vector3
         :param rotation: the rotation of the transformation as a geometry_msgs/Quaternion
         :param time: the time of the transformation, as a rospy.Time()
         :param child: child frame in tf, string
         :param parent: parent frame in tf, string
+        :param kind: STATIC if the transformation does not change over time
 
-        Broadcast the transformation from tf frame child to parent on ROS topic ``"/tf"``.
+        Broadcast the transformation from tf frame child to parent on ROS
+        topic ``"/tf"`` (or ``"/tf_static"``), with the other transformations
+        of the simulation step.
         """
 
         t = TransformStamped()
@@ -181,9 +190,7 @@ class ROSPublisherTF(ROSPublisher):
         t.transform.translation = translation
         t.transform.rotation = rotation
 
-        tfm = tfMessage([t])
-
-        self.publish_tf(tfm)
+        self.tf_aggregator.add(t, kind)
 
 
 class ROSSubscriber(AbstractROS):
@@ -1,6 +1,9 @@
 import logging; logger = logging.getLogger("morse." + __name__)
-from sensor_msgs.msg import PointCloud2, PointField
+from sensor_msgs.msg import PointCloud2
 from morse.middleware.ros import ROSPublisherTF
+from morse.middleware.ros.laserscanner import XYZ_DTYPE, point_fields
+
+XYZ_FIELDS = point_fields(XYZ_DTYPE)
 
 class DepthCameraPublisher(ROSPublisherTF):
     """ Publish the depth field from the Camera perspective as XYZ point-cloud.
@@ -29,16 +32,16 @@ class DepthCameraPublisher(ROSPublisherTF):
         pc2.height = 1
         pc2.width = self.data['nb_points']
         # Describes the channels and their layout in the binary data blob.
-        pc2.fields = [PointField('x', 0, PointField.FLOAT32, 1),
-                      PointField('y', 4, PointField.FLOAT32, 1),
-                      PointField('z', 8, PointField.FLOAT32, 1)]
+        pc2.fields = XYZ_FIELDS
         pc2.is_dense = True         # True if there are no invalid points
         pc2.is_bigendian = False    # Is this data bigendian?
         pc2.point_step = 12         # Length of a point in bytes
         pc2.row_step = len(self.data['points']) # Length of a row in bytes
 
         # Actual point data, size is (row_step*height)
-        # memoryview from PyMemoryView_FromMemory() implements the buffer interface
+        # memoryview from PyMemoryView_FromMemory() implements the buffer
+        # interface, and is already packed as XYZ float32: the only copy
+        # left is the one required by genpy, which serializes bytes only
         pc2.data = bytes(self.data['points'])
 
         self.publish_with_robot_transform(pc2)
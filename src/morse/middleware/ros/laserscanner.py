@@ -2,6 +2,7 @@ import logging; logger = logging.getLogger("morse." + __name__)
 import math
 import struct
 import itertools
+import numpy
 from sensor_msgs.msg import LaserScan, PointCloud2, PointField
 from morse.middleware.ros import ROSPublisher, ROSPublisherTF
 
@@ -30,34 +31,113 @@ class LaserScanPublisher(ROSPublisher):
         # see morse.builder.sensor.LaserSensorWithArc.create_laser_arc
         # where we create the ray from -window / 2.0 to +window / 2.0
         laserscan.ranges = self.data['range_list']
+        if 'remission_list' in self.data:
+            laserscan.intensities = self.data['remission_list']
 
         self.publish(laserscan)
 
 class PointCloud2Publisher(ROSPublisherTF):
-    """ Publish the ``point_list`` of the laser scanner. """
+    """ Publish the ``point_list`` of the laser scanner, with the
+    ``remission_list`` as ``intensity`` field if available (**rssi**
+    level). For multi-layer scanners (``SickLDMRS``), the index of the
+    layer is given in the ``ring`` field, and the cloud is organized, with
+    one row per layer.
+    """
     ros_class = PointCloud2
 
+    def initialize(self):
+        ROSPublisherTF.initialize(self)
+        self._intensity = 'remission_list' in self.data
+        self._layers = self.component_instance.bge_object.get('layers', 1)
+        self._dtype = cloud_dtype(self._intensity, self._layers > 1)
+        self._fields = point_fields(self._dtype)
+        self._ring = None
+
+    def _ring_index(self, size):
+        # rays are ordered layer by layer, see
+        # morse.builder.sensor.LaserSensorWithArc.create_laser_arc
+        if self._ring is None or len(self._ring) != size:
+            self._ring = (numpy.arange(size) * self._layers // size).astype('<u2')
+        return self._ring
+
     def default(self, ci='unused'):
         points = self.data['point_list']
         size = len(points)
 
         pc2 = PointCloud2()
         pc2.header = self.get_ros_header()
-        pc2.height = 1
-        pc2.width = size
+        if self._layers > 1 and size % self._layers == 0:
+            pc2.height = self._layers
+            pc2.width = size // self._layers
+        else:
+            pc2.height = 1
+            pc2.width = size
         pc2.is_dense = False
         pc2.is_bigendian = False
-        pc2.fields = [PointField('x', 0, PointField.FLOAT32, 1),
-                      PointField('y', 4, PointField.FLOAT32, 1),
-                      PointField('z', 8, PointField.FLOAT32, 1)]
-        pc2.point_step = 12
-        pc2.row_step = size * 12
+        pc2.fields = self._fields
+        pc2.point_step = self._dtype.itemsize
+        pc2.row_step = pc2.width * pc2.point_step
 
-        pc2.data = pack_xyz_float32(points)
+        intensity = None
+        if self._intensity:
+            intensity = self.data['remission_list']
+        ring = None
+        if self._layers > 1:
+            ring = self._ring_index(size)
+        pc2.data = pack_cloud(self._dtype, points, intensity, ring)
 
         self.publish(pc2)
         self.send_transform_robot()
 
+
+# ROS datatype of the numpy types used in the point clouds
+_DATATYPES = {'<f4': PointField.FLOAT32, '<u2': PointField.UINT16}
+
+def cloud_dtype(intensity=False, ring=False):
+    """ Return the numpy (structured) type of a point: x, y, z as float32,
+    then optionally the intensity (float32) and the ring (uint16) """
+    fields = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+    if intensity:
+        fields.append(('intensity', '<f4'))
+    if ring:
+        fields.append(('ring', '<u2'))
+    return numpy.dtype(fields, align=True)
+
+XYZ_DTYPE = cloud_dtype()
+
+def point_fields(dtype):
+    """ Return the list of PointField describing dtype """
+    return [PointField(name, dtype.fields[name][1],
+                       _DATATYPES[dtype.fields[name][0].str], 1)
+            for name in dtype.names]
+
+def pack_cloud(dtype, points, intensity=None, ring=None):
+    """ Return the binary data of a PointCloud2 of type dtype
+
+    :param points: the points, as a (N, 3) float32 array (batch scan mode,
+                   used without copy) or a list of [x, y, z]
+    :param intensity: N intensities, if dtype has an intensity field
+    :param ring: N ring indexes, if dtype has a ring field
+    """
+    if not isinstance(points, numpy.ndarray):
+        # per-ray scan mode: struct is faster than numpy to read lists
+        flatten = itertools.chain.from_iterable(points)
+        if dtype.itemsize == 12:
+            return struct.pack('<%if' % (len(points) * 3), *flatten)
+        points = numpy.fromiter(flatten, '<f4', len(points) * 3)
+    points = numpy.asarray(points, dtype='<f4').reshape(-1, 3)
+    if dtype.itemsize == 12:
+        return points.tobytes()
+    cloud = numpy.empty(len(points), dtype)
+    # (N, 3) view on the x, y, z fields of the cloud
+    xyz = numpy.ndarray((len(points), 3), '<f4', cloud, 0,
+                        (dtype.itemsize, 4))
+    xyz[:] = points
+    if intensity is not None:
+        cloud['intensity'] = intensity
+    if ring is not None:
+        cloud['ring'] = ring
+    return cloud.tobytes()
+
 def pack_xyz_float32(points):
-    flatten = itertools.chain.from_iterable(points)
-    return struct.pack('%if'%len(points)*3, *flatten)
+    return pack_cloud(XYZ_DTYPE, points)
@@ -0,0 +1,96 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+import threading
+from collections import OrderedDict
+
+# Flags used to tag the transforms given to TFAggregator.add
+DYNAMIC = 0
+STATIC = 1
+
+
+def _key(transform):
+    """ Return the values of a TransformStamped, used to detect changes """
+    t = transform.transform.translation
+    r = transform.transform.rotation
+    return (transform.header.frame_id, t.x, t.y, t.z, r.x, r.y, r.z, r.w)
+
+
+class TFAggregator(object):
+    """ Collect the transforms sent during a simulation step, and publish
+    them in a single tfMessage
+
+    The aggregator is shared by all the
+    :py:class:`morse.middleware.ros.abstract_ros.ROSPublisherTF` of the
+    simulation, and flushed once per step by the ROS datastream manager.
+    Within a step, only the last transform sent for each child frame is
+    kept.
+
+    Transforms added as ``STATIC`` (the sensor to robot transforms) are not
+    published on ``/tf``: they are gathered in one latched message,
+    published on ``/tf_static`` only when a new static transform appears.
+    If a static transform changes (for instance, a sensor mounted on a
+    PTU), it is considered dynamic from then on.
+
+    :param publisher: the publisher of ``/tf``: any object with a
+                      ``publish(message)`` method
+    :param static_publisher: the (latched) publisher of ``/tf_static``
+    :param message_class: the class of the published messages, called with
+                          the list of transforms (tfMessage)
+    """
+    def __init__(self, publisher, static_publisher, message_class):
+        self._publisher = publisher
+        self._static_publisher = static_publisher
+        self._message_class = message_class
+        self._lock = threading.Lock()
+        # child frame -> TransformStamped, for the current step
+        self._pending = OrderedDict()
+        # child frame -> TransformStamped, published on /tf_static
+        self._static = OrderedDict()
+        self._static_dirty = False
+        # child frames whose "static" transform changed
+        self._demoted = set()
+        self.published = 0
+        self.published_static = 0
+
+    def add(self, transform, kind = DYNAMIC):
+        """ Add a geometry_msgs/TransformStamped to the current step """
+        child = transform.child_frame_id
+        with self._lock:
+            if kind == STATIC and child not in self._demoted:
+                known = self._static.get(child)
+                if known is None:
+                    self._static[child] = transform
+                    self._static_dirty = True
+                    return
+                if _key(known) == _key(transform):
+                    return
+                logger.info("TF: transform %s -> %s is not static, "
+                            "publishing it on /tf" %
+                            (transform.header.frame_id, child))
+                self._demoted.add(child)
+                del self._static[child]
+                self._static_dirty = True
+            self._pending[child] = transform
+
+    def flush(self):
+        """ Publish the transforms collected since the last call """
+        with self._lock:
+            transforms = list(self._pending.values())
+            self._pending.clear()
+            static = None
+            if self._static_dirty:
+                static = list(self._static.values())
+                self._static_dirty = False
+
+        if static is not None:
+            self._static_publisher.publish(self._message_class(static))
+            self.published_static += 1
+        if transforms:
+            self._publisher.publish(self._message_class(transforms))
+            self.published += 1
+
+    def finalize(self):
+        self.flush()
+        for publisher in (self._publisher, self._static_publisher):
+            unregister = getattr(publisher, 'unregister', None)
+            if unregister:
+                unregister()
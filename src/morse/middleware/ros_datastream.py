@@ -4,9 +4,11 @@ simulated actuators.
 
 As you may have noticed, the
 :py:class:`morse.middleware.ros_datastream.ROSDatastreamManager` class is
-actually empty: contrary to sockets, for instance, that always use direct JSON
-serialization of MORSE Python objects, there is no generic way to encode/decode
-ROS messages.
+almost empty (it only publishes, once per simulation step, the TF transforms
+collected by :py:class:`morse.middleware.ros.tf_aggregator.TFAggregator`):
+contrary to sockets, for instance, that always use direct JSON serialization
+of MORSE Python objects, there is no generic way to encode/decode ROS
+messages.
 
 Thus, `morse/middleware/ros` contains one specific
 serialization/deserialization class for each sensor/actuator. These classes
@@ -21,7 +23,21 @@ Note also that management of ROS services and ROS actions takes place in
 """
 import logging; logger = logging.getLogger("morse." + __name__)
 from morse.core.datastream import DatastreamManager
+from morse.core.blenderapi import persistantstorage
 
 class ROSDatastreamManager(DatastreamManager):
     """ Handle communication between Blender and ROS."""
 
+    def action(self):
+        # Publish the transforms sent during the previous step
+        tf_aggregator = persistantstorage().get('tf_aggregator')
+        if tf_aggregator:
+            tf_aggregator.flush()
+
+    def finalize(self):
+        morse_ps = persistantstorage()
+        if 'tf_aggregator' in morse_ps:
+            morse_ps.tf_aggregator.finalize()
+            del morse_ps.tf_aggregator
+        DatastreamManager.finalize(self)
+
@@ -1,13 +1,24 @@
 import logging; logger = logging.getLogger("morse." + __name__)
+import os
+import time
 import socket
 import select
+import selectors
+import threading
 import json
 import errno
+import struct
+import marshal
+from collections import deque
 from morse.core.datastream import DatastreamManager
 from morse.helpers.transformation import Transformation3d
 from morse.middleware import AbstractDatastream
-from morse.core import services
+from morse.core import services, blenderapi
+from morse.helpers.loading import get_class
 from morse.core.exceptions import MorseRPCInvokationError, MorseMiddlewareError
+from morse.core.world_state import WorldState, STATE_FIELDS
+from morse.core.morse_time import FixedSimulationStepStrategy
+from morse.helpers.statistics import Stats
 
 try:
     import mathutils
@@ -15,6 +26,158 @@ except ImportError:
     # running outside Blender
     mathutils = None
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Header of the binary frames sent by SocketBinaryPublisher: timestamp,
+# width, height, encoding and length (in bytes) of the raw buffer which
+# follows. Keep in sync with pymorse.stream.FRAME_HEADER
+BINARY_HEADER = struct.Struct('<dIIII')
+
+# Encodings of the binary frames. Keep in sync with pymorse.stream
+ENCODING_RAW = 0
+ENCODING_RGBA8 = 1
+ENCODING_MONO8 = 2
+ENCODING_XYZ32F = 3
+ENCODING_STATE64F = 4
+
+# Name of the stream publishing the state of all the robots
+WORLD_STATE_STREAM = 'world_state'
+
+# First port used by the datastreams, which can be changed with the
+# MORSE_STREAM_PORT environment variable
+BASE_PORT = int(os.environ.get('MORSE_STREAM_PORT', 60000))
+
+def detach_buffers(buffers):
+    """ Return a copy of the list of buffers, where the views on mutable
+    data are replaced by bytes """
+    return [bytes(buf) if isinstance(buf, memoryview) and not buf.readonly
+            else buf for buf in buffers]
+
+class ClientQueue(object):
+    """ Bounded output queue of a socket client
+
+    Messages (bytes, or lists of buffers for binary frames) are encoded
+    once and shared by reference between all the clients. Each client
+    keeps at most ``size`` pending messages: when the queue is full, the
+    oldest messages are dropped. With the 'latest' drop policy, only the
+    newest message is kept. A message partially sent is continued at
+    the next flush, and is never dropped (it would break the framing).
+    """
+
+    def __init__(self, sock, size = 1, drop_policy = 'latest'):
+        self.sock = sock
+        try:
+            self.address = "%s:%d" % sock.getpeername()[:2]
+        except (socket.error, TypeError):
+            self.address = str(sock)
+        self._latest_only = (drop_policy == 'latest')
+        self._queue = deque([], max(1, size))
+        # remaining buffers of the message being sent
+        self._current = []
+
+        self.sent = 0
+        self.dropped = 0
+        self.max_lag = 0
+
+    @property
+    def lag(self):
+        """ Number of messages not completely sent yet """
+        return len(self._queue) + (1 if self._current else 0)
+
+    def push(self, message):
+        if isinstance(message, (bytes, bytearray, memoryview)):
+            message = [message]
+        buffers = [buf for buf in message if len(buf)]
+        if not buffers:
+            return
+
+        if self._latest_only:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+        elif len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(buffers)
+        self.max_lag = max(self.max_lag, self.lag)
+
+    def drop(self):
+        """ Record a message which has not even been queued """
+        self.dropped += 1
+
+    def flush(self):
+        """ Send as much as possible without blocking
+
+        Raise socket.error if the client is gone.
+        """
+        while self._current or self._queue:
+            if not self._current:
+                self._current = self._queue.popleft()
+            try:
+                sent = self.sock.sendmsg(self._current)
+            except (BlockingIOError, InterruptedError):
+                return
+
+            remaining = []
+            for buf in self._current:
+                if sent >= len(buf):
+                    sent -= len(buf)
+                else:
+                    remaining.append(memoryview(buf)[sent:])
+                    sent = 0
+            self._current = remaining
+            if remaining:
+                # the socket buffer is full, continue at next tick
+                return
+            self.sent += 1
+
+    def detach(self):
+        """ Copy the pending buffers which are views on mutable data
+
+        Binary frames are views on sensor buffers, which will be
+        overwritten at next tick.
+        """
+        self._current = detach_buffers(self._current)
+        for i in range(len(self._queue)):
+            self._queue[i] = detach_buffers(self._queue[i])
+
+    def statistics(self):
+        return {'client': self.address,
+                'sent': self.sent,
+                'dropped': self.dropped,
+                'lag': self.lag,
+                'max_lag': self.max_lag}
+
+# Keys of local_data not considered to detect a change
+SIGNATURE_IGNORED_KEYS = frozenset(['timestamp', 'simulator_time'])
+
+def signature(value):
+    """ Return a cheap snapshot of value, which can be compared (==) with
+    a later snapshot to detect a change, without encoding value in JSON
+
+    Values made of builtin types are marshalled (an order of magnitude
+    faster than JSON). Otherwise, containers are walked, NumPy arrays are
+    reduced to their raw bytes, and objects with a 'copy' method (mathutils
+    types, ...) are copied.
+    """
+    try:
+        # version 2 does not use references, so equal values give equal
+        # bytes
+        return marshal.dumps(value, 2)
+    except ValueError:
+        pass
+    if isinstance(value, dict):
+        return [(k, signature(v)) for k, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [signature(v) for v in value]
+    if numpy and isinstance(value, numpy.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    copy = getattr(value, 'copy', None)
+    if copy:
+        return copy()
+    return value
+
 class MorseEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, mathutils.Vector):
@@ -29,8 +192,170 @@ class MorseEncoder(json.JSONEncoder):
         if isinstance(obj, Transformation3d):
             return {'x': obj.x, 'y': obj.y, 'z': obj.z,
                     'yaw': obj.yaw, 'pitch': obj.pitch, 'roll': obj.roll }
+        if numpy and isinstance(obj, numpy.ndarray):
+            return obj.tolist()
         return json.JSONEncoder.default(self, obj)
 
+class SocketMultiplexer(object):
+    """ Serve all the datastreams of a SocketDatastreamManager on a single
+    port
+
+    Clients connect to one listening socket and send line-based commands:
+
+    - ``subscribe <stream name>``: receive the messages of this stream.
+    - ``unsubscribe <stream name>``: stop receiving them.
+    - ``publish <stream name> <message>``: write on an input stream.
+
+    Each message sent to a client is prefixed with the name of its stream:
+    ``<stream name> <message>``. All the messages for a client are written
+    in one batch by :meth:`process`, called once per frame by the manager.
+    """
+
+    def __init__(self, port, queue_size = 64):
+        self.port = port
+        self._queue_size = queue_size
+        self._selector = selectors.DefaultSelector()
+
+        # stream name -> set of subscribed client sockets
+        self._subscriptions = {}
+
+        # stream name -> last message received from a client
+        self._inputs = {}
+
+        # stream name -> last message of the latched streams
+        self._latched = {}
+
+        # client socket -> (input buffer, ClientQueue)
+        self._clients = {}
+
+        # publishers may run in datastream worker threads
+        self._lock = threading.Lock()
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(('', port))
+        self._server.listen(5)
+        self._server.setblocking(False)
+        self._selector.register(self._server, selectors.EVENT_READ)
+
+        logger.info("Socket multiplexed datastream server now listening on "
+                    "port %d" % port)
+
+    def has_subscribers(self, name):
+        return bool(self._subscriptions.get(name))
+
+    def publish(self, name, message, latch = False):
+        """ Queue message for all the clients subscribed to stream name
+
+        If latch is True, message is also kept to be sent to the clients
+        subscribing later to this stream.
+        """
+        if not message:
+            return
+        framed = name.encode() + b' ' + message
+        with self._lock:
+            if latch:
+                self._latched[name] = framed
+            for sock in self._subscriptions.get(name, ()):
+                self._clients[sock][1].push(framed)
+
+    def statistics(self, name):
+        """ Return the statistics of the clients subscribed to name """
+        with self._lock:
+            return [self._clients[sock][1].statistics()
+                    for sock in self._subscriptions.get(name, ())]
+
+    def read(self, name):
+        """ Return the last message received for stream name, or None """
+        return self._inputs.pop(name, None)
+
+    def process(self):
+        """ Accept new clients, handle their commands, and send the
+        pending messages. Never blocks. """
+        with self._lock:
+            for key, mask in self._selector.select(0):
+                sock = key.fileobj
+                if sock is self._server:
+                    self._accept()
+                elif mask & selectors.EVENT_READ:
+                    self._read(sock)
+
+            for sock, (_, queue) in list(self._clients.items()):
+                try:
+                    queue.flush()
+                except socket.error:
+                    self._close(sock)
+
+    def _accept(self):
+        try:
+            sock, addr = self._server.accept()
+        except socket.error:
+            return
+        sock.setblocking(False)
+        self._clients[sock] = (bytearray(),
+                               ClientQueue(sock, self._queue_size, 'oldest'))
+        self._selector.register(sock, selectors.EVENT_READ)
+        logger.debug("New client %s on multiplexed datastream" % str(addr))
+
+    def _read(self, sock):
+        try:
+            data = sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except socket.error:
+            data = None
+        if not data:
+            self._close(sock)
+            return
+
+        in_buffer = self._clients[sock][0]
+        in_buffer.extend(data)
+        while True:
+            end = in_buffer.find(b'\n')
+            if end < 0:
+                break
+            line = bytes(in_buffer[:end])
+            del in_buffer[:end + 1]
+            self._handle_command(sock, line)
+
+    def _handle_command(self, sock, line):
+        tokens = line.split(None, 2)
+        if len(tokens) < 2:
+            logger.warning("Malformed command on multiplexed datastream: "
+                           "<%s>" % line)
+            return
+        command, name = tokens[0], tokens[1].decode()
+        if command == b'subscribe':
+            self._subscriptions.setdefault(name, set()).add(sock)
+            if name in self._latched:
+                self._clients[sock][1].push(self._latched[name])
+        elif command == b'unsubscribe':
+            self._subscriptions.get(name, set()).discard(sock)
+        elif command == b'publish' and len(tokens) == 3:
+            # keep only the last message if we got several in row
+            self._inputs[name] = tokens[2].decode()
+        else:
+            logger.warning("Unknown command on multiplexed datastream: "
+                           "<%s>" % line)
+
+    def _close(self, sock):
+        self._selector.unregister(sock)
+        del self._clients[sock]
+        for subscribers in self._subscriptions.values():
+            subscribers.discard(sock)
+        try:
+            sock.close()
+        except socket.error:
+            pass
+
+    def close(self):
+        with self._lock:
+            for sock in list(self._clients.keys()):
+                self._close(sock)
+        self._selector.unregister(self._server)
+        self._selector.close()
+        self._server.close()
+
 class SocketServ(AbstractDatastream):
 
     def initialize(self):
@@ -38,6 +363,14 @@ class SocketServ(AbstractDatastream):
         self._client_sockets = []
         self._message_size = 4096
 
+        # In multiplexed mode, the manager owns the only server socket
+        self._mux = self.kwargs.get('multiplexer', None)
+        if self._mux:
+            self._server = None
+            logger.info("Component %s served on multiplexed port %d" %
+                        (self.component_name, self._mux.port))
+            return
+
         self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._server.bind(('', self.kwargs['port']))
@@ -75,10 +408,85 @@ class SocketServ(AbstractDatastream):
             pass
 
 class SocketPublisher(SocketServ):
+    """ Publish the local_data of a component
+
+    Each client has a bounded output queue (see :py:class:`ClientQueue`),
+    configured with the ``queue_size`` and ``drop_policy`` ('latest' or
+    'oldest') stream parameters. A slow client never blocks the
+    simulation: its frames are dropped instead.
+
+    Two optional stream parameters reduce the number of published frames:
+
+    - ``max_rate``: the maximum publication rate, in Hz of simulated time,
+      independently of the frequency of the component
+    - ``skip_unchanged``: if True, a frame is only published if local_data
+      changed (the ``timestamp`` being ignored). The change is detected on
+      a cheap :py:func:`signature` of local_data, so unchanged frames are
+      not encoded at all.
+    """
 
     _type_name = "straight JSON serialization"
+    _binary = False
+
+    def initialize(self):
+        SocketServ.initialize(self)
+        self._queue_size = self.kwargs.get('queue_size', 1)
+        self._drop_policy = self.kwargs.get('drop_policy', 'latest')
+        # socket -> ClientQueue
+        self._client_queues = {}
+
+        max_rate = self.kwargs.get('max_rate', None)
+        self._min_period = 1.0 / max_rate if max_rate else None
+        self._last_publication = None
+        self._skip_unchanged = self.kwargs.get('skip_unchanged', False)
+        self._signature = None
+        self._last_message = None
+
+    def must_publish(self):
+        """ Check the max_rate and skip_unchanged conditions """
+        if self._min_period:
+            now = self.data.get('timestamp', None)
+            if now is None:
+                now = blenderapi.persistantstorage().time.time
+            # allow some jitter on the simulated time
+            if self._last_publication is not None and \
+               now - self._last_publication < 0.99 * self._min_period:
+                return False
+            self._last_publication = now
+
+        if self._skip_unchanged:
+            data = self.data
+            sig = [(k, signature(v)) for k, v in data.items()
+                   if k not in SIGNATURE_IGNORED_KEYS]
+            if sig == self._signature:
+                return False
+            self._signature = sig
+
+        return True
 
     def default(self, ci='unused'):
+        publish = True
+        if self._min_period or self._skip_unchanged:
+            publish = self.must_publish()
+
+        # With skip_unchanged, the last message is kept (encoding only
+        # happens on changes) and sent to the new clients
+        message = None
+        if publish and self._skip_unchanged:
+            message = self.encode()
+            if isinstance(message, list):
+                self._last_message = detach_buffers(message)
+            else:
+                self._last_message = message
+
+        if self._mux:
+            if publish and (self._skip_unchanged or
+                            self._mux.has_subscribers(self.component_name)):
+                self._mux.publish(self.component_name,
+                                  message or self.encode(),
+                                  latch = self._skip_unchanged)
+            return
+
         sockets = self._client_sockets + [self._server]
 
         try:
@@ -88,27 +496,153 @@ class SocketPublisher(SocketServ):
         except socket.error:
             pass
 
+        # The new client was not selected for writing: it receives the
+        # current (or last) message at next tick, whatever the drop policy
+        new_client = None
         if self._server in inputready:
             sock, _ = self._server.accept()
+            sock.setblocking(False)
             self._client_sockets.append(sock)
+            queue = ClientQueue(sock, self._queue_size, self._drop_policy)
+            self._client_queues[sock] = queue
+            new_client = sock
+            if not publish and self._last_message:
+                queue.push(self._last_message)
 
-        if outputready:
-            message = self.encode()
+        if not self._client_sockets:
+            return
+
+        if not publish:
+            # Only continue the pending writes
             for o in outputready:
+                queue = self._client_queues.get(o)
+                if queue and queue.lag:
+                    try:
+                        queue.flush()
+                    except socket.error:
+                        self.close_socket(o)
+                        continue
+                    queue.detach()
+            return
+
+        # With the 'latest' policy, a frame is only useful for the clients
+        # which can write now
+        latest_only = (self._drop_policy == 'latest')
+        if latest_only and not outputready and new_client is None:
+            for queue in self._client_queues.values():
+                queue.drop()
+            return
+
+        # Encode once, share the message between all the clients
+        if message is None:
+            message = self.encode()
+        for o in self._client_sockets[:]:
+            queue = self._client_queues[o]
+            if latest_only and o not in outputready and o is not new_client:
+                queue.drop()
+                continue
+            queue.push(message)
+            if o in outputready:
                 try:
-                    o.send(message)
+                    queue.flush()
                 except socket.error:
                     self.close_socket(o)
+                    continue
+            queue.detach()
+
+    def close_socket(self, sock):
+        self._client_queues.pop(sock, None)
+        SocketServ.close_socket(self, sock)
+
+    def statistics(self):
+        """ Return the output statistics of each client """
+        if self._mux:
+            return self._mux.statistics(self.component_name)
+        return [queue.statistics() for queue in self._client_queues.values()]
+
+    def encode(self):
+        js = json.dumps(self.data, cls=MorseEncoder)
+        return (js + '\n').encode()
+
+class SocketBinaryPublisher(SocketPublisher):
+    """ Publish binary frames: a fixed header (see BINARY_HEADER)
+    followed by a raw buffer.
+
+    The buffer is neither encoded nor copied: it is sent with the header
+    through scatter-gather I/O (it is only copied if a client lags). Subclasses must implement :meth:`frame`.
+    """
+
+    _type_name = "binary frame (fixed header + raw buffer)"
+    _binary = True
+
+    def frame(self):
+        """ Return a tuple (width, height, encoding, buffer) or None if
+        there is nothing to publish
+        """
+        return None
+
+    def encode(self):
+        frame = self.frame()
+        if not frame:
+            return []
+
+        width, height, encoding, buf = frame
+        view = memoryview(buf)
+        if view.format != 'B' or view.ndim != 1:
+            view = view.cast('B')
+        header = BINARY_HEADER.pack(self.data['timestamp'], width, height,
+                                    encoding, len(view))
+        return [header, view]
+
+class WorldStateMixin(object):
+    """ Publish the state of all the robots (see
+    :py:class:`morse.core.world_state.WorldState`) instead of the
+    local_data of a component """
+    def __init__(self, kwargs):
+        self._world_state = WorldState()
+        AbstractDatastream.__init__(self, None, kwargs)
+
+    @property
+    def component_name(self):
+        return WORLD_STATE_STREAM
+
+    @property
+    def data(self):
+        return {'timestamp': blenderapi.persistantstorage().time.time}
+
+class WorldStatePublisher(WorldStateMixin, SocketPublisher):
+    """ Publish the state of all the robots as one compact JSON message
+    per step (see :py:meth:`morse.core.world_state.WorldState.to_dict`)
+    """
+    _type_name = "compact JSON world state"
 
     def encode(self):
-        js = json.dumps(self.component_instance.local_data, cls=MorseEncoder)
+        js = json.dumps(self._world_state.to_dict(), separators = (',', ':'))
         return (js + '\n').encode()
 
+class WorldStateBinaryPublisher(WorldStateMixin, SocketBinaryPublisher):
+    """ Publish the state of all the robots as one binary frame per step:
+    a matrix of float64 (ENCODING_STATE64F), with one row of
+    len(STATE_FIELDS) values per robot, robots being sorted by name """
+    _type_name = "binary world state (float64 matrix)"
+
+    def frame(self):
+        state = self._world_state.pack()
+        return (len(STATE_FIELDS), len(self._world_state.names),
+                ENCODING_STATE64F, state)
+
 class SocketReader(SocketServ):
 
     _type_name = "straight JSON deserialization"
 
     def default(self, ci='unused'):
+        if self._mux:
+            msg = self._mux.read(self.component_name)
+            if msg is None:
+                return False
+            self.component_instance.local_data = self.decode(msg)
+            return True
+
         sockets = self._client_sockets + [self._server]
         try:
             inputready, outputready, exceptready = select.select(sockets, [], [], 0)
@@ -158,6 +692,153 @@ class SocketReader(SocketServ):
         return json.loads(msg)
 
 
+class LockstepBarrier(object):
+    """ Synchronise the simulation with several clients, in lockstep
+
+    Clients connect to the synchronisation port and send one line (its
+    content is ignored) to acknowledge each step. Once all the registered
+    clients acknowledged, the simulation runs exactly ``ticks`` ticks,
+    without waiting, then sends to each client the line ``<step number>
+    <simulation time>`` and waits again. A client may send several
+    acknowledgements in advance.
+
+    The barrier is free (the simulation is not blocked) until a first
+    client connects. It then waits until ``nb_clients`` clients are
+    connected. When a client disconnects, the others keep on stepping the
+    simulation; once all of them left, the barrier is free again.
+    """
+    def __init__(self, port, nb_clients = 1, ticks = 1):
+        self.nb_clients = max(1, int(nb_clients))
+        self.ticks = max(1, int(ticks))
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(('', port))
+        self._server.listen(self.nb_clients)
+        # socket -> [pending acknowledgements, incomplete line]
+        self._clients = {}
+        self._started = False
+        self._remaining = 0
+        self.steps = 0
+        self._step_start = None
+        # time spent waiting for the clients, and time spent running the
+        # ticks of a step
+        self._stat_latency = Stats()
+        self._stat_step = Stats()
+        self._max_latency = 0.0
+
+    @property
+    def clients(self):
+        return len(self._clients)
+
+    def _accept(self):
+        client, _ = self._server.accept()
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._clients[client] = [0, b'']
+        logger.info("Lockstep client connected (%d/%d)" %
+                    (len(self._clients), self.nb_clients))
+
+    def _remove(self, client):
+        del self._clients[client]
+        client.close()
+        logger.info("Lockstep client disconnected (%d left)" % len(self._clients))
+        if not self._clients:
+            self._started = False
+
+    def _read(self, client):
+        try:
+            data = client.recv(4096)
+        except socket.error:
+            data = b''
+        if not data:
+            self._remove(client)
+            return
+        state = self._clients[client]
+        data = state[1] + data
+        state[0] += data.count(b'\n')
+        state[1] = data[data.rfind(b'\n') + 1:]
+
+    def _poll(self, timeout):
+        sockets = [self._server] + list(self._clients)
+        try:
+            inputready, _, _ = select.select(sockets, [], [], timeout)
+        except (select.error, socket.error):
+            return
+        for sock in inputready:
+            if sock is self._server:
+                self._accept()
+            else:
+                self._read(sock)
+
+    def _ready(self):
+        if not self._started:
+            if len(self._clients) < self.nb_clients:
+                return False
+            self._started = True
+        return all(state[0] for state in self._clients.values())
+
+    def _notify(self, sim_time):
+        msg = ("%d %f\n" % (self.steps, sim_time)).encode()
+        for client in list(self._clients):
+            try:
+                client.sendall(msg)
+            except socket.error:
+                self._remove(client)
+
+    def wait(self, sim_time):
+        """ Called before each tick: return once the tick may be run """
+        if self._remaining:
+            self._remaining -= 1
+            return
+
+        now = time.time()
+        if self._step_start is not None:
+            # the ticks of the previous step are done
+            self._stat_step.update(now - self._step_start)
+            self._step_start = None
+            self._notify(sim_time)
+
+        self._poll(0)
+        if not self._clients:
+            return
+
+        while self._clients and not self._ready():
+            logger.debug("Waiting lockstep acknowledgements")
+            self._poll(None)
+        if not self._clients:
+            return
+
+        for state in self._clients.values():
+            state[0] -= 1
+        self.steps += 1
+        self._step_start = time.time()
+        latency = self._step_start - now
+        self._stat_latency.update(latency)
+        self._max_latency = max(self._max_latency, latency)
+        self._remaining = self.ticks - 1
+
+    def statistics(self):
+        """ Return the statistics of the steps: latency is the time spent
+        waiting for the acknowledgements of the clients, duration the real
+        time needed to run the ticks of a step """
+        latency = self._stat_latency
+        step = self._stat_step
+        return {
+            "lockstep_clients": len(self._clients),
+            "lockstep_steps": self.steps,
+            "lockstep_ticks": self.ticks,
+            "mean_step_latency": latency.mean,
+            "variance_step_latency": latency.variance if latency.n > 1 else 0.0,
+            "max_step_latency": self._max_latency,
+            "mean_step_duration": step.mean,
+            "variance_step_duration": step.variance if step.n > 1 else 0.0
+        }
+
+    def close(self):
+        for client in list(self._clients):
+            client.close()
+        self._clients.clear()
+        self._server.close()
+
 class SocketDatastreamManager(DatastreamManager):
     """ External communication using sockets. """
 
@@ -168,11 +849,14 @@ class SocketDatastreamManager(DatastreamManager):
 
         self.time_sync = kwargs.get('time_sync', False)
         self.sync_port = kwargs.get('sync_port', -1)
+        self._lockstep = None
 
         if self.time_sync:
             if self.sync_port == -1:
                 logger.error("time_sync is required, but sync_port is not configured")
                 raise MorseMiddlewareError("sync_port is not configured")
+            elif kwargs.get('lockstep', False):
+                self._init_lockstep(kwargs)
             else:
                 self._init_trigger()
 
@@ -182,8 +866,34 @@ class SocketDatastreamManager(DatastreamManager):
         # component name (string)  -> Port (int)
         self._component_nameservice = {}
 
+        # component name (string) -> datastream instance
+        self._stream_dict = {}
+
+        # component names of streams using binary frames
+        self._binary_streams = set()
+
+        # component names of streams served by the multiplexer
+        self._multiplexed_streams = set()
+
         # Base port
-        self._base_port = 60000
+        self._base_port = BASE_PORT
+
+        # In multiplexed mode, all the (line-based) streams are served
+        # on a single port
+        self._mux = None
+        if kwargs.get('multiplex', False):
+            port = kwargs.get('multiplex_port', self._base_port)
+            self._mux = SocketMultiplexer(port,
+                                          kwargs.get('multiplex_queue_size', 64))
+            self._base_port = port + 1
+
+        # Optional stream publishing the state of all the robots
+        self._world_state = None
+        self._world_state_kwargs = None
+        if kwargs.get('world_state', False):
+            self._world_state_kwargs = {
+                'format': kwargs.get('world_state_format', 'binary'),
+                'port': kwargs.get('world_state_port', None)}
 
         # Register two special services in the socket service manager:
 
@@ -193,11 +903,40 @@ class SocketDatastreamManager(DatastreamManager):
         services.do_service_registration(self.list_streams, 'simulation')
         services.do_service_registration(self.get_stream_port, 'simulation')
         services.do_service_registration(self.get_all_stream_ports, 'simulation')
+        services.do_service_registration(self.get_stream_format, 'simulation')
+        services.do_service_registration(self.get_stream_statistics, 'simulation')
 
     def __del__(self):
-        if self.time_sync:
+        if self._lockstep:
+            self._lockstep.close()
+        elif self.time_sync:
             self._end_trigger()
 
+    def finalize(self):
+        DatastreamManager.finalize(self)
+        # As the other datastreams, the world state publisher is finalized
+        # when deleted
+        self._stream_dict.pop(WORLD_STATE_STREAM, None)
+        self._world_state = None
+        if self._mux:
+            self._mux.close()
+            self._mux = None
+
+    def _init_lockstep(self, kwargs):
+        clock = blenderapi.persistantstorage().time
+        if not isinstance(clock, FixedSimulationStepStrategy):
+            logger.error("The lockstep mode requires the FixedSimulationStep "
+                         "time strategy")
+            raise MorseMiddlewareError("lockstep requires the "
+                                       "FixedSimulationStep time strategy")
+        self._lockstep = LockstepBarrier(self.sync_port,
+                                         kwargs.get('sync_clients', 1),
+                                         kwargs.get('lockstep_ticks', 1))
+        clock.add_statistics(self._lockstep.statistics)
+        logger.info("Creating lockstep synchronisation on port %d (%d "
+                    "client(s), %d tick(s) by step)" % (self.sync_port,
+                    self._lockstep.nb_clients, self._lockstep.ticks))
+
     def _init_trigger(self):
         self._sync_client = None
         self._sync_server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -229,7 +968,8 @@ class SocketDatastreamManager(DatastreamManager):
                 self._sync_client, _ = self._sync_server.accept()
 
     def _end_trigger(self):
-        self._sync_client.close()
+        if self._sync_client:
+            self._sync_client.close()
         self._sync_server.shutdown(socket.SHUT_RDWR)
 
     def list_streams(self):
@@ -256,6 +996,44 @@ class SocketDatastreamManager(DatastreamManager):
         """
         return self._component_nameservice
 
+    def get_stream_format(self, name):
+        """ Get the format of the stream for stream name: 'binary' for
+        streams made of binary frames, 'multiplexed' for streams served
+        on the multiplexed port, 'json' otherwise.
+        """
+        if name not in self._component_nameservice:
+            raise MorseRPCInvokationError("Stream unavailable for component %s" % name)
+
+        if name in self._binary_streams:
+            return 'binary'
+        if name in self._multiplexed_streams:
+            return 'multiplexed'
+        return 'json'
+
+    def get_stream_statistics(self, name):
+        """ Get the output statistics of the stream name: for each client,
+        the number of messages sent and dropped, and the current and
+        maximum number of pending messages.
+        """
+        try:
+            stream = self._stream_dict[name]
+        except KeyError:
+            raise MorseRPCInvokationError("Stream unavailable for component %s" % name)
+
+        if not hasattr(stream, 'statistics'):
+            raise MorseRPCInvokationError("Stream %s is not an output stream" % name)
+
+        return stream.statistics()
+
+    def _can_multiplex(self, mw_data):
+        """ Return True if the stream described by mw_data is served on the
+        multiplexed port: the multiplexed mode is enabled, the stream has
+        no explicit port, and it is not made of binary frames """
+        if not self._mux or 'port' in mw_data[3]:
+            return False
+        klass = get_class(mw_data[1])
+        return not getattr(klass, '_binary', False)
+
     def register_component(self, component_name, component_instance, mw_data):
         """ Open the port used to communicate by the specified component.
         """
@@ -264,6 +1042,15 @@ class SocketDatastreamManager(DatastreamManager):
 
         kwargs = mw_data[3]
 
+        if self._can_multiplex(mw_data):
+            kwargs['multiplexer'] = self._mux
+            serv = DatastreamManager.register_component(self, component_name,
+                                                        component_instance, mw_data)
+            self._stream_dict[component_name] = serv
+            self._component_nameservice[component_name] = self._mux.port
+            self._multiplexed_streams.add(component_name)
+            return
+
         if not 'port' in kwargs:
             must_inc_base_port = True
             kwargs['port'] = self._base_port
@@ -283,10 +1070,61 @@ class SocketDatastreamManager(DatastreamManager):
                     raise
 
         self._server_dict[kwargs['port']] = serv
+        self._stream_dict[component_name] = serv
         self._component_nameservice[component_name] = kwargs['port']
+        if getattr(serv, '_binary', False):
+            self._binary_streams.add(component_name)
         if must_inc_base_port:
             self._base_port += 1
 
+    def _init_world_state(self):
+        """ Create the world state publisher
+
+        It is done on the first step, once all the robots exist.
+        """
+        config = self._world_state_kwargs
+        self._world_state_kwargs = None
+
+        kwargs = {}
+        if config['format'] == 'binary':
+            cls = WorldStateBinaryPublisher
+        else:
+            cls = WorldStatePublisher
+            if self._mux and not config['port']:
+                kwargs['multiplexer'] = self._mux
+
+        if 'multiplexer' in kwargs:
+            self._world_state = cls(kwargs)
+        else:
+            kwargs['port'] = config['port'] or self._base_port
+            while not self._world_state:
+                try:
+                    self._world_state = cls(kwargs)
+                except socket.error as error_info:
+                    if error_info.errno != errno.EADDRINUSE or config['port']:
+                        raise
+                    kwargs['port'] += 1
+            if not config['port']:
+                self._base_port = kwargs['port'] + 1
+
+        name = WORLD_STATE_STREAM
+        self._stream_dict[name] = self._world_state
+        if 'multiplexer' in kwargs:
+            self._component_nameservice[name] = self._mux.port
+            self._multiplexed_streams.add(name)
+        else:
+            self._component_nameservice[name] = kwargs['port']
+            if cls._binary:
+                self._binary_streams.add(name)
+
     def action(self):
-        if self.time_sync:
+        if self._lockstep:
+            self._lockstep.wait(blenderapi.persistantstorage().time.time)
+        elif self.time_sync:
             self._wait_trigger()
+        if self._world_state_kwargs:
+            self._init_world_state()
+        if self._world_state:
+            self._world_state.default()
+        if self._mux:
+            self._mux.process()
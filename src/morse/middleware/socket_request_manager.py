@@ -1,4 +1,5 @@
 import logging; logger = logging.getLogger("morse." + __name__)
+import os
 import socket
 import select
 import json
@@ -8,8 +9,31 @@ from morse.core.request_manager import RequestManager, MorseRPCInvokationError
 from morse.core import status
 
 SERVER_HOST = '' #all available interfaces
-SERVER_PORT = 4000
+# The port can be changed with the MORSE_SERVICE_PORT environment variable
+SERVER_PORT = int(os.environ.get('MORSE_SERVICE_PORT', 4000))
 MAX_TRIES = 10 # Number of alternative ports to try if the default is already busy
+READ_SIZE = 65536 # Size of the reads on the client sockets
+
+
+class Batch(object):
+    """ Results of the requests of a batch, some of them being possibly
+    asynchronous """
+    def __init__(self, client, id, size):
+        self.socket = client
+        self.id = id
+        self._results = [None] * size
+        self._pending = size
+
+    def set_result(self, index, result):
+        self._results[index] = list(result)
+        self._pending -= 1
+
+    def done(self):
+        return self._pending == 0
+
+    def result(self):
+        return (status.SUCCESS, self._results)
+
 
 class SocketRequestManager(RequestManager):
     """Implements services to control the MORSE simulator over
@@ -28,6 +52,17 @@ class SocketRequestManager(RequestManager):
 
     ``status`` is one of the constants defined in :py:mod:`morse.core.status`.
 
+    Several requests can be sent in one round-trip with:
+
+    >>> id batch [[component_name, service, [params]], ...]
+
+    The server answers once all the requests are completed:
+
+    >>> id SUCCESS [[status, result_or_error_msg], ...]
+
+    Requests are separated by newlines, and may be pipelined: all the
+    complete requests received are processed at each simulation step,
+    whatever their size. The responses for a client are sent in one write.
     """
 
     def __str__(self):
@@ -36,15 +71,24 @@ class SocketRequestManager(RequestManager):
     def initialization(self):
         global SERVER_PORT
         self._client_sockets = []
-        
+
         # For asynchronous request, this holds the mapping between a
         # request_id and the socket which requested it.
         self._pending_sockets = {}
 
+        # For asynchronous requests of a batch, this holds the mapping
+        # between a request_id and (batch, index in the batch)
+        self._pending_batches = {}
+
         # Stores for each socket client the pending results to write
         # back.
         self._results_to_output = {}
 
+        # Stores for each socket client the bytes received but not yet
+        # processed (incomplete request), and the bytes not yet sent
+        self._read_buffers = {}
+        self._write_buffers = {}
+
         self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
@@ -87,6 +131,13 @@ class SocketRequestManager(RequestManager):
 
     def on_service_completion(self, request_id, results):
 
+        if request_id in self._pending_batches:
+            batch, index = self._pending_batches.pop(request_id)
+            batch.set_result(index, results)
+            if batch.done():
+                self._queue_result(batch.socket, batch.id, batch.result())
+            return
+
         s = None
 
         try:
@@ -96,126 +147,197 @@ class SocketRequestManager(RequestManager):
             logger.info(str(self) + ": ERROR: I can not find the socket which requested " + str(request_id))
             return
 
+        self._queue_result(s, id, results)
+
+    def post_registration(self, component, service, is_async):
+        return True
+
+    def _queue_result(self, s, id, results):
+        if s not in self._client_sockets:
+            # the client left before the completion of the request
+            return
         if s in self._results_to_output:
             self._results_to_output[s].append((id, results))
         else:
             self._results_to_output[s] = [(id, results)]
 
-    def post_registration(self, component, service, is_async):
-        return True
+    def _close_client(self, s):
+        s.close()
+        self._client_sockets.remove(s)
+        self._read_buffers.pop(s, None)
+        self._write_buffers.pop(s, None)
+        self._results_to_output.pop(s, None)
+
+    def _read(self, s):
+        """ Read all the available bytes of s
+
+        Return the list of complete requests received, or None if the
+        client disconnected.
+        """
+        buf = self._read_buffers[s]
+        while True:
+            try:
+                raw = s.recv(READ_SIZE)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionResetError as e:
+                import os
+                if os.name == 'nt' and e.errno == 10054:
+                    # An existing connection was forcibly closed by the remote host
+                    raw = None
+                else:
+                    raise
+            if not raw:
+                # an empty read means that the remote host has
+                # disconnected itself
+                return None
+            buf.extend(raw)
+            if len(raw) < READ_SIZE:
+                break
+
+        end = buf.rfind(b'\n')
+        if end < 0:
+            return []
+        requests = buf[:end].decode().split('\n')
+        del buf[:end + 1]
+        return requests
 
     def main(self):
-        
+
         sockets = self._client_sockets + [self._server]
+        writers = [s for s in self._client_sockets
+                   if s in self._results_to_output or s in self._write_buffers]
 
         try:
-            inputready, outputready, exceptready = select.select(sockets, sockets, [], 0) #timeout = 0 : Never block, just poll
-        except select.error:
-            pass
-        except socket.error:
-            pass
+            inputready, outputready, exceptready = select.select(sockets, writers, [], 0) #timeout = 0 : Never block, just poll
+        except (select.error, socket.error):
+            return
 
         for i in inputready:
             if i == self._server:
                 sock, addr = self._server.accept()
+                sock.setblocking(False)
 
                 logger.info("Accepted new service connection from " + str(addr))
                 self._client_sockets.append(sock)
+                self._read_buffers[sock] = bytearray()
 
             else:
-                try:
-                    raw = i.recv(4096)
-                except ConnectionResetError as e:
-                    import os
-                    if os.name == 'nt' and e.errno == 10054:
-                        # An existing connection was forcibly closed by the remote host
-                        raw = None
-                    else:
-                        raise
-                if not raw:
-                    # an empty read means that the remote host has
-                    # disconnected itself
+                requests = self._read(i)
+                if requests is None:
                     logger.info("Socket closed by client! Closing it on my side.")
-                    i.close()
-                    self._client_sockets.remove(i)
+                    self._close_client(i)
                     continue
-                raw = raw.decode()
-                assert(raw[-1] == '\n')
-                for req in raw[:-1].split('\n'):
+
+                for req in requests:
                     req = req.strip()
+                    if req:
+                        self._handle_request(i, req)
+
+        for o in outputready:
+            results = self._results_to_output.pop(o, None)
+            if results:
+                response = ''.join(self._format_response(id, result)
+                                   for id, result in results)
+                self._write_buffers.setdefault(o, bytearray()).extend(response.encode())
+            buf = self._write_buffers.get(o)
+            if not buf:
+                continue
+            try:
+                sent = o.send(buf)
+                del buf[:sent]
+                if not buf:
+                    del self._write_buffers[o]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except socket.error:
+                logger.warning("It seems that a socket client left while I was sending stuff to it. Closing the socket.")
+                self._close_client(o)
+
+    def _format_response(self, id, result):
+        return_value = None
+        try:
+            if result[1]:
+                return_value = json.dumps(result[1], cls=MorseEncoder)
+        except TypeError as te:
+            logger.error("Error while serializing a service return value to JSON!\n" +\
+                    "Details:" + str(te))
+        response = "%s %s%s\n" % (id, result[0], (" " + return_value) if return_value else "")
+        logger.debug("Sending back %s", response)
+        return response
+
+    def _handle_request(self, i, req):
+        component = service = "undefined"
 
-                    component = service = "undefined"
-
-                    try:
-                        try:
-                            id, req = req.split(None, 1)
-                        except ValueError: # Request contains < 2 tokens.
-                            id = req
-                            raise MorseRPCInvokationError("Malformed request! ")
-
-                        id = id.strip()
-
-                        logger.info("Got '" + req + "' (id = " + id + ") from " + str(i))
-
-                        if len(req.split()) == 1 and req in ["cancel"]:
-                            # Aborting a running request!
-                            for internal_id, user_id in self._pending_sockets.items():
-                                if user_id[1] == id:
-                                    self.abort_request(internal_id)
-
-                        else:
-                            component, service, params = self._parse_request(req)
-
-                            # on_incoming_request returns either
-                            #(True, result) if it's a synchronous
-                            # request that has been immediately executed, or
-                            # (False, request_id) if it's an asynchronous request whose
-                            # termination will be notified via
-                            # on_service_completion.
-                            is_sync, value = self.on_incoming_request(component, service, params)
-
-                            if is_sync:
-                                if i in self._results_to_output:
-                                    self._results_to_output[i].append((id, value))
-                                else:
-                                    self._results_to_output[i] = [(id, value)]
-                            else:
-                                # Stores the mapping request/socket to notify
-                                # the right socket when the service completes.
-                                # (cf :py:meth:on_service_completion)
-                                # Here, 'value' is the internal request id while
-                                # 'id' is the id used by the socket client.
-                                self._pending_sockets[value] = (i, id)
-
-
-                    except MorseRPCInvokationError as e:
-                        if i in self._results_to_output:
-                            self._results_to_output[i].append((id, (status.FAILED, e.value)))
-                        else:
-                            self._results_to_output[i] = [(id, (status.FAILED, e.value))]
-
-        if self._results_to_output:
-            for o in outputready:
-                if o in self._results_to_output:
-                    for r in self._results_to_output[o]:
-                        return_value = None
-                        try:
-                            if r[1][1]:
-                                return_value = json.dumps(r[1][1], cls=MorseEncoder)
-                        except TypeError as te:
-                            logger.error("Error while serializing a service return value to JSON!\n" +\
-                                    "Details:" + str(te))
-                        response = "%s %s%s" % (r[0], r[1][0], (" " + return_value) if return_value else "")
-                        try:
-                            o.send((response + "\n").encode())
-                            logger.info("Sent back " + response + " to " + str(o))
-                        except socket.error:
-                            logger.warning("It seems that a socket client left while I was sending stuff to it. Closing the socket.")
-                            o.close()
-                            self._client_sockets.remove(o)
-
-                    del self._results_to_output[o]
+        try:
+            try:
+                id, req = req.split(None, 1)
+            except ValueError: # Request contains < 2 tokens.
+                id = req
+                raise MorseRPCInvokationError("Malformed request! ")
+
+            id = id.strip()
+
+            logger.debug("Got '%s' (id = %s) from %s", req, id, i)
 
+            if len(req.split()) == 1 and req in ["cancel"]:
+                # Aborting a running request!
+                for internal_id, user_id in list(self._pending_sockets.items()):
+                    if user_id[1] == id:
+                        self.abort_request(internal_id)
+                for internal_id, (batch, _) in list(self._pending_batches.items()):
+                    if batch.id == id and batch.socket == i:
+                        self.abort_request(internal_id)
+
+            elif req.split(None, 1)[0] == "batch":
+                self._handle_batch(i, id, req)
+
+            else:
+                component, service, params = self._parse_request(req)
+
+                # on_incoming_request returns either
+                #(True, result) if it's a synchronous
+                # request that has been immediately executed, or
+                # (False, request_id) if it's an asynchronous request whose
+                # termination will be notified via
+                # on_service_completion.
+                is_sync, value = self.on_incoming_request(component, service, params)
+
+                if is_sync:
+                    self._queue_result(i, id, value)
+                else:
+                    # Stores the mapping request/socket to notify
+                    # the right socket when the service completes.
+                    # (cf :py:meth:on_service_completion)
+                    # Here, 'value' is the internal request id while
+                    # 'id' is the id used by the socket client.
+                    self._pending_sockets[value] = (i, id)
+
+
+        except MorseRPCInvokationError as e:
+            self._queue_result(i, id, (status.FAILED, e.value))
+
+    def _handle_batch(self, i, id, req):
+        """ Invoke all the requests of a batch, the results being sent
+        back together when the last one completes """
+        calls = self._parse_batch(req)
+        batch = Batch(i, id, len(calls))
+        for index, call in enumerate(calls):
+            try:
+                if not isinstance(call, list) or not 2 <= len(call) <= 3:
+                    raise MorseRPCInvokationError("Malformed batch request: "
+                            "[component, service, [params]] expected, got %s" % call)
+                params = call[2] if len(call) == 3 else None
+                is_sync, value = self.on_incoming_request(call[0], call[1], params)
+                if is_sync:
+                    batch.set_result(index, value)
+                else:
+                    self._pending_batches[value] = (batch, index)
+            except MorseRPCInvokationError as e:
+                batch.set_result(index, (status.FAILED, e.value))
+
+        if batch.done():
+            self._queue_result(i, id, batch.result())
 
     def _parse_request(self, req):
         """
@@ -243,3 +365,17 @@ class SocketRequestManager(RequestManager):
             else:
                 p = None
         return component, service, p
+
+    def _parse_batch(self, req):
+        """
+        Parse the list of requests of a batch request.
+        """
+        try:
+            calls = json.loads(req.split(None, 1)[1])
+        except (IndexError, ValueError) as e:
+            raise MorseRPCInvokationError("Invalid batch request: a JSON list "
+                    "of [component, service, [params]] is expected. %s" % str(e))
+        if not isinstance(calls, list):
+            raise MorseRPCInvokationError("Invalid batch request: a JSON list "
+                    "of [component, service, [params]] is expected")
+        return calls
@@ -2,7 +2,8 @@ import sys
 import json
 import base64
 import logging; logger = logging.getLogger("morse." + __name__)
-from morse.middleware.socket_datastream import SocketPublisher
+from morse.middleware.socket_datastream import SocketPublisher, \
+        SocketBinaryPublisher, ENCODING_XYZ32F
 
 class DepthCameraPublisher(SocketPublisher):
     """
@@ -32,3 +33,20 @@ class DepthCameraPublisher(SocketPublisher):
         }
 
         return (json.dumps(res) + '\n').encode()
+
+class DepthCameraBinaryPublisher(SocketBinaryPublisher):
+    """
+    Publish the points of the DepthCamera (a packed array of float32 x, y,
+    z) in a binary frame
+    """
+
+    _type_name = 'binary frame containing the float32 XYZ points of the DepthCamera'
+
+    def frame(self):
+        if not self.component_instance.capturing:
+            return None # press [Space] key to enable capturing
+
+        return (self.component_instance.image_width,
+                self.component_instance.image_height,
+                ENCODING_XYZ32F,
+                self.data['points'])
@@ -2,7 +2,8 @@ import sys
 import json
 import base64
 import logging; logger = logging.getLogger("morse." + __name__)
-from morse.middleware.socket_datastream import SocketPublisher
+from morse.middleware.socket_datastream import SocketPublisher, \
+        SocketBinaryPublisher, ENCODING_RGBA8
 
 class VideoCameraPublisher(SocketPublisher):
     """ Publish a base64 encoded RGBA image """
@@ -49,3 +50,21 @@ class Video8uPublisher(VideoCameraPublisher):
                     0.0722 * memv[index + 2] )
                 for index in range(0, len(memv), 4) ]
         return bytearray( i8u )
+
+class VideoCameraBinaryPublisher(SocketBinaryPublisher):
+    """ Publish the raw RGBA image in a binary frame
+
+    The intrinsic matrix is not part of the frame, it is available
+    through the ``get_local_data`` service of the camera.
+    """
+
+    _type_name = 'binary frame containing the raw RGBA image'
+
+    def frame(self):
+        if not self.component_instance.capturing:
+            return None # press [Space] key to enable capturing
+
+        return (self.component_instance.image_width,
+                self.component_instance.image_height,
+                ENCODING_RGBA8,
+                self.data['image'])
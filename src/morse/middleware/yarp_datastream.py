@@ -3,6 +3,7 @@ import sys
 import re
 import yarp
 import mathutils
+import numpy
 from morse.helpers.transformation import Transformation3d
 from morse.middleware.abstract_datastream import AbstractDatastream
 from morse.core.datastream import *
@@ -77,6 +78,8 @@ class YarpPublisher(YarpPort):
             self.encode_message(bottle,
                     [data.x , data.y, data.z,
                      data.yaw, data.pitch, data.roll], component_name)
+        elif isinstance(data, numpy.ndarray):
+            self.encode_message(bottle, data.tolist(), component_name)
         else:
             logger.error("Unknown data type in component '%s'" % component_name)
 
@@ -1,14 +1,20 @@
 import logging; logger = logging.getLogger("morse." + __name__)
-import random
+import numpy
 
 from morse.helpers.components import add_property
 from morse.modifiers.abstract_modifier import AbstractModifier
+from morse.modifiers.noise import NoiseModel, random_generator
 
 class IMUNoiseModifier(AbstractModifier):
     """
     This modifier allows to simulate Gaussian noise for accelerometer and
     gyroscope sensors of an IMU.
-    No bias is modeled so far.
+
+    A constant bias and a random walk (drift) can be added to the Gaussian
+    noise, with the ``gyro_bias``, ``gyro_walk_std``, ``accel_bias`` and
+    ``accel_walk_std`` parameters. The noise is drawn from a random
+    generator specific to the component, which can be seeded (see
+    :py:func:`morse.modifiers.noise.random_generator`).
     """
 
     _name = "IMUNoise"
@@ -17,6 +23,14 @@ class IMUNoiseModifier(AbstractModifier):
                  doc = "Standard deviation for noise applied to angular velocities as dictionary with x,y,z as floats")
     add_property('_accel_std_dev', {'x': 0.5, 'y': 0.5, 'z': 0.5}, "accel_std", type = "dict", 
                  doc="Standard deviation for noise applied to linear accelerations as dictionary with x,y,z as floats")
+    add_property('_gyro_bias', 0.0, "gyro_bias", type = "float",
+                 doc = "Constant bias of the angular velocities")
+    add_property('_gyro_walk_std', 0.0, "gyro_walk_std", type = "float",
+                 doc = "Standard deviation of the random walk of the angular velocities, at each call")
+    add_property('_accel_bias', 0.0, "accel_bias", type = "float",
+                 doc = "Constant bias of the linear accelerations")
+    add_property('_accel_walk_std', 0.0, "accel_walk_std", type = "float",
+                 doc = "Standard deviation of the random walk of the linear accelerations, at each call")
     
     def initialize(self):
         gyro_std = self.parameter("gyro_std", default=0.5)
@@ -33,13 +47,25 @@ class IMUNoiseModifier(AbstractModifier):
                     self._gyro_std_dev.get('x', 0), self._gyro_std_dev.get('y', 0), self._gyro_std_dev.get('z'),
                     self._accel_std_dev.get('x', 0), self._accel_std_dev.get('y', 0), self._accel_std_dev.get('z', 0))
 
-    def modify(self):
+        # axes without standard deviation are not noised
         axes = ['x', 'y', 'z']
-        for i in range(0, 3):
-            if axes[i] in self._gyro_std_dev:
-                self.data['angular_velocity'][i] = \
-                    random.gauss(self.data['angular_velocity'][i], self._gyro_std_dev[axes[i]])
-            if axes[i] in self._accel_std_dev:
-                self.data['linear_acceleration'][i] = \
-                    random.gauss(self.data['linear_acceleration'][i], self._accel_std_dev[axes[i]])
+        self._gyro_mask = numpy.array([axis in self._gyro_std_dev for axis in axes])
+        self._accel_mask = numpy.array([axis in self._accel_std_dev for axis in axes])
+        rng = random_generator(self)
+        self._gyro = NoiseModel(rng,
+                        [float(self._gyro_std_dev.get(axis, 0.0)) for axis in axes],
+                        float(self.parameter("gyro_bias", default=0.0)),
+                        walk_std=float(self.parameter("gyro_walk_std", default=0.0)))
+        self._accel = NoiseModel(rng,
+                        [float(self._accel_std_dev.get(axis, 0.0)) for axis in axes],
+                        float(self.parameter("accel_bias", default=0.0)),
+                        walk_std=float(self.parameter("accel_walk_std", default=0.0)))
 
+    def modify(self):
+        gyro_noise = (self._gyro.sample(3) * self._gyro_mask).tolist()
+        accel_noise = (self._accel.sample(3) * self._accel_mask).tolist()
+        angular_velocity = self.data['angular_velocity']
+        linear_acceleration = self.data['linear_acceleration']
+        for i in range(0, 3):
+            angular_velocity[i] += gyro_noise[i]
+            linear_acceleration[i] += accel_noise[i]
@@ -0,0 +1,177 @@
+import logging; logger = logging.getLogger("morse." + __name__)
+import zlib
+import numpy
+
+from morse.helpers.components import add_property
+from morse.modifiers.abstract_modifier import AbstractModifier
+
+def random_generator(modifier):
+    """ Return the random generator of modifier
+
+    The generator is seeded from the ``seed`` parameter of the modifier or,
+    if it is not set, from the ``noise_seed`` property of the scene (see
+    :py:meth:`morse.builder.environment.Environment.set_noise_seed`),
+    combined with the names of the component and of the modifier class.
+    Each modifier then draws from its own stream, which does not depend on
+    the other components nor on their order. Without any seed, the
+    generator is seeded from the entropy of the system, and the noise is
+    different at each run.
+    """
+    seed = modifier.parameter("seed", prop="noise_seed")
+    if seed is None:
+        return numpy.random.default_rng()
+    name = modifier.component_name.encode('utf-8')
+    cls = modifier.__class__.__name__.encode('utf-8')
+    logger.info("%s: noise seeded with %d" % (modifier, int(seed)))
+    return numpy.random.default_rng([int(seed), zlib.crc32(name),
+                                     zlib.crc32(cls)])
+
+
+class NoiseModel(object):
+    """ Noise of a signal: white Gaussian noise, constant bias and random walk
+
+    At each call to :py:meth:`sample`, the noise is the sum of:
+
+    - a Gaussian noise of standard deviation ``std``
+    - a bias, equal to ``bias`` plus a Gaussian noise of standard deviation
+      ``bias_std`` drawn once
+    - a random walk, whose increment at each call is a Gaussian noise of
+      standard deviation ``walk_std``
+
+    The parameters are floats, or arrays broadcastable to the shape of the
+    signal (for instance, one value per axis of a vector).
+    """
+    def __init__(self, rng, std = 0.0, bias = 0.0, bias_std = 0.0,
+                 walk_std = 0.0):
+        self.rng = rng
+        self.std = numpy.asarray(std, dtype = numpy.float64)
+        self.bias = numpy.asarray(bias, dtype = numpy.float64)
+        self.bias_std = numpy.asarray(bias_std, dtype = numpy.float64)
+        self.walk_std = numpy.asarray(walk_std, dtype = numpy.float64)
+        self._bias = None
+        self._walk = None
+
+    def reset(self):
+        """ Reset the random walk """
+        self._walk = None
+
+    def sample(self, shape):
+        """ Return an array of noise of the given shape """
+        rng = self.rng
+        if self.std.any():
+            noise = rng.normal(0.0, self.std, shape)
+        else:
+            noise = numpy.zeros(shape)
+
+        if self.bias.any() or self.bias_std.any():
+            if self._bias is None or self._bias.shape != noise.shape:
+                self._bias = numpy.broadcast_to(self.bias, shape).copy()
+                if self.bias_std.any():
+                    self._bias += rng.normal(0.0, self.bias_std, shape)
+            noise += self._bias
+
+        if self.walk_std.any():
+            if self._walk is None or self._walk.shape != noise.shape:
+                self._walk = numpy.zeros(shape)
+            self._walk += rng.normal(0.0, self.walk_std, shape)
+            noise += self._walk
+        return noise
+
+
+def add_noise(value, model):
+    """ Add the noise of model to value, and return the result
+
+    value can be a float, a NumPy array or a sequence of floats (or of
+    sequences of floats, such as the ``point_list`` of a laser scanner),
+    which are modified in place, or a memoryview of float32 (such as the
+    ``points`` of a depth camera), which is replaced.
+    """
+    if isinstance(value, numpy.ndarray):
+        noise = model.sample(value.shape)
+        if value.flags.writeable:
+            value += noise.astype(value.dtype, copy = False)
+            return value
+        return value + noise.astype(value.dtype, copy = False)
+    if isinstance(value, memoryview):
+        array = numpy.frombuffer(value, dtype = numpy.float32)
+        array = array + model.sample(array.shape).astype(numpy.float32)
+        return memoryview(array).cast('B')
+    if isinstance(value, (int, float)):
+        return float(value + model.sample(()))
+    array = numpy.asarray(value, dtype = numpy.float64)
+    value[:] = (array + model.sample(array.shape)).tolist()
+    return value
+
+
+class ArrayNoiseModifier(AbstractModifier):
+    """
+    This modifier adds noise to whole arrays of data, such as the
+    ``range_list`` of the laser scanners or the ``points`` of the depth
+    cameras. Each element of the arrays receives a white Gaussian noise,
+    a constant bias and a random walk (see
+    :py:class:`morse.modifiers.noise.NoiseModel`), drawn in bulk with NumPy.
+
+    The noise is drawn from a random generator specific to the component.
+    If a seed is given, either to the modifier with the ``seed`` parameter,
+    or to the whole simulation with
+    :py:meth:`morse.builder.environment.Environment.set_noise_seed`, the
+    noise is the same from one run to the other:
+
+    .. code-block:: python
+
+        hokuyo.alter('Noise', std = 0.01, seed = 42)
+
+    Note that the data are modified independently of each other: noising
+    ``range_list`` does not change ``point_list``, unless it is part of
+    ``fields`` too.
+    """
+
+    _name = "ArrayNoise"
+
+    add_property('_fields', ['range_list', 'points'], "fields", type = "list",
+                 doc = "Names of the data to noise. The data which do not exist in the component are ignored")
+    add_property('_std', 0.01, "std", type = "float",
+                 doc = "Standard deviation of the Gaussian noise")
+    add_property('_bias', 0.0, "bias", type = "float",
+                 doc = "Constant bias added to the data")
+    add_property('_bias_std', 0.0, "bias_std", type = "float",
+                 doc = "Standard deviation of the random part of the bias, drawn once")
+    add_property('_walk_std', 0.0, "walk_std", type = "float",
+                 doc = "Standard deviation of the increment of the random walk, at each call")
+
+    def initialize(self):
+        fields = self.parameter("fields")
+        if fields is None:
+            self._fields = [f for f in ['range_list', 'points'] if f in self.data]
+        else:
+            if isinstance(fields, str):
+                fields = [fields]
+            self._fields = [f for f in fields if f in self.data]
+            for field in fields:
+                if field not in self.data:
+                    self.key_error(field)
+
+        rng = random_generator(self)
+        std = float(self.parameter("std", default = 0.01))
+        bias = float(self.parameter("bias", default = 0.0))
+        bias_std = float(self.parameter("bias_std", default = 0.0))
+        walk_std = float(self.parameter("walk_std", default = 0.0))
+        self._models = dict((field, NoiseModel(rng, std, bias, bias_std, walk_std))
+                            for field in self._fields)
+        # the values replaced by a noised copy (read-only buffers), so that
+        # they are not noised again if the component did not update them
+        self._noised = {}
+        logger.info("Array noise on %s: std %.4f, bias %.4f, bias std %.4f, "
+                    "walk std %.4f" % (', '.join(self._fields), std, bias,
+                                       bias_std, walk_std))
+
+    def modify(self):
+        data = self.data
+        for field in self._fields:
+            value = data[field]
+            if isinstance(value, str) or value is self._noised.get(field):
+                continue
+            noised = add_noise(value, self._models[field])
+            if noised is not value:
+                self._noised[field] = noised
+                data[field] = noised
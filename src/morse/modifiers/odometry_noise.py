@@ -1,8 +1,8 @@
 import logging; logger = logging.getLogger("morse." + __name__)
 from morse.core.services import do_service_registration
 from morse.modifiers.abstract_modifier import AbstractModifier
+from morse.modifiers.noise import random_generator
 from math import cos, sin
-from random import gauss
 
 class OdometryNoiseModifier(AbstractModifier):
     """
@@ -12,6 +12,9 @@ class OdometryNoiseModifier(AbstractModifier):
       returned by the odometer (parameter **factor**)
     - the gyroscope natural drift (parameter **gyro_drift** (rad by tick))
 
+    The errors are drawn from a random generator specific to the component,
+    which can be seeded (see :py:func:`morse.modifiers.noise.random_generator`).
+
     Modified data
     -------------
 
@@ -44,6 +47,7 @@ class OdometryNoiseModifier(AbstractModifier):
         self._drift_x = 0.0
         self._drift_y = 0.0
         self._drift_yaw = 0.0
+        self._rng = random_generator(self)
         do_service_registration(self.reset_noise, self.component_instance.name())
 
     def modify(self):
@@ -56,10 +60,10 @@ class OdometryNoiseModifier(AbstractModifier):
         #         = factor * ( dx * cos(drift_yaw) + dy * sin(drift_yaw))
         # Same thing to compute dy
         if self.component_instance.level == "raw":
-            self.data['dS'] *= gauss(self._factor, self._factor_sigma)
+            self.data['dS'] *= float(self._rng.normal(self._factor, self._factor_sigma))
         else:
-            factor = gauss(self._factor, self._factor_sigma)
-            drift = gauss(self._gyro_drift, self._gyro_drift_sigma)
+            factor, drift = self._rng.normal((self._factor, self._gyro_drift),
+                                             (self._factor_sigma, self._gyro_drift_sigma)).tolist()
             self._drift_yaw += drift
             real_dx = self.component_instance._dx
             real_dy = self.component_instance._dy
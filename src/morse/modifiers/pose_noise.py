@@ -1,10 +1,10 @@
 import logging; logger = logging.getLogger("morse." + __name__)
-import random
 from math import radians, degrees, cos
 from morse.core.mathutils import Vector, Quaternion
 
 from morse.helpers.components import add_property
 from morse.modifiers.abstract_modifier import AbstractModifier
+from morse.modifiers.noise import random_generator
 
 class NoiseModifier(AbstractModifier):
     """ 
@@ -16,6 +16,9 @@ class NoiseModifier(AbstractModifier):
     This modifier attempts to alter data ``x``, ``y`` and ``z`` for position, 
     and either ``orientation`` or ``yaw``, ``pitch`` and ``roll`` for orientation. 
 
+    The noise is drawn from a random generator specific to the component,
+    which can be seeded (see :py:func:`morse.modifiers.noise.random_generator`).
+
     The PoseNoise modifier provides as modifiers:
     
     * :py:class:`morse.modifiers.pose_noise.PositionNoiseModifier`
@@ -46,6 +49,7 @@ class NoiseModifier(AbstractModifier):
         else:
             self._rot_std_dev = {'roll': float(rot_std), 'pitch': float(rot_std), 'yaw': float(rot_std)}
         self._2D = bool(self.parameter("_2D", default=False))
+        self._rng = random_generator(self)
         if self._2D:
             logger.info("Noise modifier standard deviations: x:%.4f, y:%.4f, yaw:%.3f deg",
                         self._pos_std_dev.get('x', 0),
@@ -68,9 +72,11 @@ class PositionNoiseModifier(NoiseModifier):
         data_vars = ['x', 'y']
         if not self._2D:
             data_vars.append('z')
-        for variable in data_vars:
-            if variable in self.data and variable in self._pos_std_dev:
-                self.data[variable] = random.gauss(self.data[variable], self._pos_std_dev[variable])
+        data_vars = [v for v in data_vars
+                     if v in self.data and v in self._pos_std_dev]
+        noise = self._rng.normal(0.0, [self._pos_std_dev[v] for v in data_vars])
+        for variable, n in zip(data_vars, noise.tolist()):
+            self.data[variable] += n
 
 class OrientationNoiseModifier(NoiseModifier):
     """ Add a gaussian noise to an orientation 
@@ -82,10 +88,9 @@ class OrientationNoiseModifier(NoiseModifier):
             data_vars.append('pitch')
         data_vars.append('yaw')
         # generate a gaussian noise rotation vector
+        rot_std = [self._rot_std_dev.get(var, 0.0) for var in data_vars]
         rot_vec = Vector((0.0, 0.0, 0.0))
-        for i in range(len(data_vars)):
-            if data_vars[i] in self._rot_std_dev:
-                rot_vec[i] = random.gauss(rot_vec[i], self._rot_std_dev[data_vars[i]])
+        rot_vec[:len(rot_std)] = self._rng.normal(0.0, rot_std).tolist()
         # convert rotation vector to a quaternion representing the random rotation
         angle = rot_vec.length
         if angle > 0:
@@ -98,9 +103,11 @@ class OrientationNoiseModifier(NoiseModifier):
             self.data['orientation'] = (noise_quat * self.data['orientation']).normalized()
         except KeyError:
             # for eulers this is a bit crude, maybe should use the noise_quat here as well...
-            for var in data_vars:
-                if var in self.data and var in self._rot_std_dev:
-                    self.data[var] = random.gauss(self.data[var], self._rot_std_dev[var])
+            data_vars = [v for v in data_vars
+                         if v in self.data and v in self._rot_std_dev]
+            noise = self._rng.normal(0.0, [self._rot_std_dev[v] for v in data_vars])
+            for var, n in zip(data_vars, noise.tolist()):
+                self.data[var] += n
 
 class PoseNoiseModifier(PositionNoiseModifier, OrientationNoiseModifier):
     """ Add a gaussian noise to both position and orientation 
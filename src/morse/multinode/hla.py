@@ -4,6 +4,7 @@ import os
 from morse.core import blenderapi, mathutils
 from morse.core.exceptions import MorseMultinodeError
 from morse.core.multinode import SimulationNodeClass
+from morse.helpers.transformation import set_world_pose
 from morse.middleware.hla_datastream import MorseBaseAmbassador, HLABaseNode
 
 try:
@@ -67,11 +68,11 @@ class MorseAmbassador(MorseBaseAmbassador):
             if self.in_position in attributes:
                 pos, offset = MorseVector.unpack(attributes[self.in_position])
                 # Update the positions of the robots
-                obj.worldPosition = pos
+                set_world_pose(obj, pos)
             if self.in_orientation in attributes:
                 ori, offset = MorseVector.unpack(attributes[self.in_orientation])
                 # Update the orientations of the robots
-                obj.worldOrientation = mathutils.Euler(ori).to_matrix()
+                set_world_pose(obj, orientation = mathutils.Euler(ori).to_matrix())
         except KeyError as detail:
             logger.debug("Robot %s not found in this simulation scenario," + \
                 "but present in another node. Ignoring it!", obj_name)
@@ -0,0 +1,286 @@
+""" Binary protocol of the socket multi-node simulation
+
+This module is shared by the nodes (:py:class:`morse.multinode.socket.BinarySocketNode`)
+and by the ``multinode_server``. It does not depend on Blender.
+
+The messages are frames made of a fixed header (see ``HEADER``: a magic
+byte, the type of the frame and the size of its payload) followed by the
+payload:
+
+- ``HELLO``: the name of the node (UTF-8)
+- ``NAMES``: the names of the robots referenced by the next ``UPDATE``
+  frames, as a list of (id, name). The ids are chosen by the sender of the
+  frame: the server translates them for each receiver.
+- ``SUBSCRIBE``: the names of the robots a node wants to receive. If the
+  first byte of the payload is not null, the node subscribes to all the
+  robots, and the list is ignored.
+- ``UPDATE``: a timestamp and a list of fixed-layout pose records
+  (see ``RECORD``: id, x, y, z, roll, pitch, yaw)
+- ``INTEREST``: the areas of interest of a node: (x, y) boxes
+  (see ``BOX``), and ranges around the robots of the node (see ``RANGE``:
+  the id of the robot, as sent in ``NAMES``, and a radius). The server
+  only forwards to the node the robots inside one of these areas. A node
+  which does not send this frame receives all the robots it subscribed to.
+
+The first byte of a frame is never ``[``, which allows the server to
+serve JSON (legacy protocol) and binary nodes on the same port.
+"""
+
+import math
+import struct
+
+MAGIC = 0xB5
+
+HELLO = 1
+NAMES = 2
+SUBSCRIBE = 3
+UPDATE = 4
+INTEREST = 5
+
+# magic, type, size of the payload
+HEADER = struct.Struct('<BBI')
+# timestamp, number of records
+UPDATE_HEADER = struct.Struct('<dI')
+# robot id, position, orientation (euler angles)
+RECORD = struct.Struct('<I6f')
+NAME_HEADER = struct.Struct('<IH')
+# number of boxes, number of ranges
+INTEREST_HEADER = struct.Struct('<HH')
+# x min, y min, x max, y max
+BOX = struct.Struct('<4f')
+# robot id, radius
+RANGE = struct.Struct('<If')
+
+MAX_PAYLOAD = 1 << 26
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def frame(kind, payload = b''):
+    """ Return the frame of type kind, holding payload """
+    return HEADER.pack(MAGIC, kind, len(payload)) + payload
+
+
+def encode_hello(node_name):
+    return frame(HELLO, node_name.encode('utf-8'))
+
+
+def encode_names(names):
+    """ Return a NAMES frame, names being a list of (id, name) """
+    parts = []
+    for robot_id, name in names:
+        raw = name.encode('utf-8')
+        parts.append(NAME_HEADER.pack(robot_id, len(raw)))
+        parts.append(raw)
+    return frame(NAMES, b''.join(parts))
+
+
+def decode_names(payload):
+    """ Return the list of (id, name) of a NAMES payload """
+    names = []
+    offset = 0
+    size = len(payload)
+    while offset < size:
+        robot_id, length = NAME_HEADER.unpack_from(payload, offset)
+        offset += NAME_HEADER.size
+        names.append((robot_id, bytes(payload[offset:offset + length]).decode('utf-8')))
+        offset += length
+    return names
+
+
+def encode_subscribe(names = None):
+    """ Return a SUBSCRIBE frame for the robots names, or for all the
+    robots if names is None """
+    if names is None:
+        return frame(SUBSCRIBE, b'\x01')
+    parts = [b'\x00']
+    for name in names:
+        raw = name.encode('utf-8')
+        parts.append(struct.pack('<H', len(raw)))
+        parts.append(raw)
+    return frame(SUBSCRIBE, b''.join(parts))
+
+
+def decode_subscribe(payload):
+    """ Return the set of names of a SUBSCRIBE payload, or None for all
+    the robots """
+    if not payload or payload[0]:
+        return None
+    names = set()
+    offset = 1
+    size = len(payload)
+    while offset < size:
+        length, = struct.unpack_from('<H', payload, offset)
+        offset += 2
+        names.add(bytes(payload[offset:offset + length]).decode('utf-8'))
+        offset += length
+    return names
+
+
+def encode_update(timestamp, records):
+    """ Return an UPDATE frame
+
+    :param timestamp: the time of the poses, in seconds
+    :param records: a list of (id, x, y, z, roll, pitch, yaw)
+    """
+    pack = RECORD.pack
+    payload = UPDATE_HEADER.pack(timestamp, len(records)) + \
+              b''.join([pack(*record) for record in records])
+    return frame(UPDATE, payload)
+
+
+def decode_update(payload):
+    """ Return the timestamp and the list of records of an UPDATE payload """
+    timestamp, count = UPDATE_HEADER.unpack_from(payload)
+    body = memoryview(payload)[UPDATE_HEADER.size:]
+    if len(body) != count * RECORD.size:
+        raise ProtocolError("UPDATE frame of %d records has %d bytes" %
+                            (count, len(body)))
+    return timestamp, list(RECORD.iter_unpack(body))
+
+
+def encode_interest(boxes, ranges):
+    """ Return an INTEREST frame
+
+    :param boxes: a list of (x min, y min, x max, y max)
+    :param ranges: a list of (robot id, radius)
+    """
+    payload = [INTEREST_HEADER.pack(len(boxes), len(ranges))]
+    payload.extend(BOX.pack(*box) for box in boxes)
+    payload.extend(RANGE.pack(*r) for r in ranges)
+    return frame(INTEREST, b''.join(payload))
+
+
+def decode_interest(payload):
+    """ Return the lists of boxes and of ranges of an INTEREST payload """
+    nb_boxes, nb_ranges = INTEREST_HEADER.unpack_from(payload)
+    offset = INTEREST_HEADER.size
+    end = offset + nb_boxes * BOX.size
+    boxes = list(BOX.iter_unpack(payload[offset:end]))
+    ranges = list(RANGE.iter_unpack(payload[end:end + nb_ranges * RANGE.size]))
+    if len(ranges) != nb_ranges:
+        raise ProtocolError("truncated INTEREST frame")
+    return boxes, ranges
+
+
+class FrameReader(object):
+    """ Split the bytes received on a stream into frames """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """ Add data to the buffer, and return the list of complete frames,
+        as (type, payload) """
+        self._buffer += data
+        frames = []
+        buf = self._buffer
+        offset = 0
+        while len(buf) - offset >= HEADER.size:
+            magic, kind, size = HEADER.unpack_from(buf, offset)
+            if magic != MAGIC or size > MAX_PAYLOAD:
+                raise ProtocolError("invalid frame header")
+            end = offset + HEADER.size + size
+            if len(buf) < end:
+                break
+            frames.append((kind, bytes(buf[offset + HEADER.size:end])))
+            offset = end
+        if offset:
+            del buf[:offset]
+        return frames
+
+
+def _angle_diff(a, b):
+    d = (a - b) % (2 * math.pi)
+    return min(d, 2 * math.pi - d)
+
+
+def moved(pose, reference, position_threshold, orientation_threshold):
+    """ Return True if pose differs from reference by more than the
+    thresholds (in meters, and in radians on each euler angle)
+
+    Poses are (x, y, z, roll, pitch, yaw). A reference of None means that
+    the robot was never sent.
+    """
+    if reference is None:
+        return True
+    dx = pose[0] - reference[0]
+    dy = pose[1] - reference[1]
+    dz = pose[2] - reference[2]
+    if dx * dx + dy * dy + dz * dz > position_threshold * position_threshold:
+        return True
+    for i in (3, 4, 5):
+        if _angle_diff(pose[i], reference[i]) > orientation_threshold:
+            return True
+    return False
+
+
+class InterestGrid(object):
+    """ Uniform grid of the robots over the (x, y) plane, by name
+
+    It is used by the server to find the robots inside the areas of
+    interest of the nodes, without testing every robot. It is the
+    counterpart, for remote robots known by their name, of
+    :py:class:`morse.core.spatial_index.SpatialGrid`.
+    """
+    def __init__(self, cell_size = 50.0):
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        # name -> (cell, x, y)
+        self._robots = {}
+
+    def __len__(self):
+        return len(self._robots)
+
+    def _cell(self, x, y):
+        return (int(math.floor(x / self.cell_size)),
+                int(math.floor(y / self.cell_size)))
+
+    def move(self, name, x, y):
+        """ Set the position of the robot name """
+        cell = self._cell(x, y)
+        entry = self._robots.get(name)
+        if entry is not None and entry[0] != cell:
+            old = self._cells[entry[0]]
+            old.discard(name)
+            if not old:
+                del self._cells[entry[0]]
+        if entry is None or entry[0] != cell:
+            self._cells.setdefault(cell, set()).add(name)
+        self._robots[name] = (cell, x, y)
+
+    def position(self, name):
+        entry = self._robots.get(name)
+        return entry and entry[1:]
+
+    def query_box(self, x_min, y_min, x_max, y_max):
+        """ Return the set of robots inside the box """
+        res = set()
+        min_x, min_y = self._cell(x_min, y_min)
+        max_x, max_y = self._cell(x_max, y_max)
+        robots = self._robots
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self._cells):
+            cells = [names for (x, y), names in self._cells.items()
+                     if min_x <= x <= max_x and min_y <= y <= max_y]
+        else:
+            cells = [self._cells.get((x, y)) for x in range(min_x, max_x + 1)
+                                             for y in range(min_y, max_y + 1)]
+        for names in cells:
+            if not names:
+                continue
+            for name in names:
+                _, x, y = robots[name]
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    res.add(name)
+        return res
+
+    def query_radius(self, cx, cy, radius):
+        """ Return the set of robots at most radius meters away from
+        (cx, cy) """
+        robots = self._robots
+        r2 = radius * radius
+        return set(name for name in self.query_box(cx - radius, cy - radius,
+                                                   cx + radius, cy + radius)
+                   if (robots[name][1] - cx) ** 2 +
+                      (robots[name][2] - cy) ** 2 <= r2)
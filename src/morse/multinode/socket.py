@@ -1,8 +1,14 @@
 import logging; logger = logging.getLogger("morse." + __name__)
+import time
+import struct
+import select
+import socket
 import mathutils
 
 from morse.core import blenderapi
+from morse.helpers.transformation import set_world_pose
 from morse.core.multinode import SimulationNodeClass
+from morse.multinode import protocol
 
 from pymorse.stream import StreamJSON, PollThread
 
@@ -19,6 +25,7 @@ class SocketNode(SimulationNodeClass):
         """
         self.node_stream = None
         self.poll_thread = None
+        self._external_robots = {}
         logger.debug("Connecting to %s:%d" % (self.host, self.port) )
         try:
             self.node_stream = StreamJSON(self.host, self.port)
@@ -64,17 +71,33 @@ class SocketNode(SimulationNodeClass):
         except Exception as e:
             logger.warning("error while processing incoming data: " + str(e))
 
+    def _external_robot(self, obj_name, scene):
+        """ Return the external robot obj_name, or None if it is not in
+        the scene or is handled by this node.
+
+        The result of the lookup is cached: it is only done again if the
+        object has been removed from the scene.
+        """
+        obj = self._external_robots.get(obj_name, False)
+        if obj is None or (obj is not False and not obj.invalid):
+            return obj
+        try:
+            obj = scene.objects[obj_name]
+        except Exception as e:
+            logger.debug("%s not found in this simulation scenario, but present in another node. Ignoring it!" % obj_name)
+            obj = None
+        if obj is not None and obj in blenderapi.persistantstorage().robotDict:
+            obj = None
+        self._external_robots[obj_name] = obj
+        return obj
+
     def update_scene(self, in_data, scene):
         # Update the positions of the external robots
         for obj_name, robot_data in in_data.items():
-            try:
-                obj = scene.objects[obj_name]
-            except Exception as e:
-                logger.debug("%s not found in this simulation scenario, but present in another node. Ignoring it!" % obj_name)
-                continue
-            if obj not in blenderapi.persistantstorage().robotDict:
-                obj.worldPosition = robot_data[0]
-                obj.worldOrientation = mathutils.Euler(robot_data[1]).to_matrix()
+            obj = self._external_robot(obj_name, scene)
+            if obj is not None:
+                set_world_pose(obj, robot_data[0],
+                               mathutils.Euler(robot_data[1]).to_matrix())
 
     def finalize(self):
         """ Close the communication socket. """
@@ -84,3 +107,206 @@ class SocketNode(SimulationNodeClass):
         if self.poll_thread:
             self.poll_thread.syncstop(1)
             self.poll_thread = None
+
+
+class BinarySocketNode(SocketNode):
+    """
+    Implements multinode simulation using the binary protocol of
+    :py:mod:`morse.multinode.protocol`.
+
+    At each step, only the local robots which moved by more than
+    ``position_threshold`` (meters) or ``orientation_threshold`` (radians)
+    since they were last sent are published, as fixed-layout binary
+    records. The node subscribes to the external robots of its scene: the
+    server only forwards their poses.
+
+    The exchange does not block: the node applies the poses received so
+    far. It only waits for the server when its last message is older than
+    ``max_staleness`` seconds, and then for at most ``max_staleness``
+    seconds.
+
+    The node may also restrict the robots it receives to areas of
+    interest: ``interest_regions``, a list of (x min, y min, x max, y max)
+    boxes, and ``interest_range``, the radius of the area around each of
+    its robots (a number, or a dict robot name -> radius). The server then
+    only forwards the robots inside one of these areas.
+    """
+
+    def initialize(self):
+        self.position_threshold = float(self.options.get('position_threshold', 0.001))
+        self.orientation_threshold = float(self.options.get('orientation_threshold', 0.001))
+        self.max_staleness = float(self.options.get('max_staleness', 0.1))
+
+        self._sock = None
+        self._reader = protocol.FrameReader()
+        self._out = bytearray()
+        # local robot -> id, and id -> last pose sent
+        self._ids = {}
+        self._sent = {}
+        # id -> name, as sent by the server
+        self._names = {}
+        # name -> pose received since the last step
+        self._received = {}
+        self._subscribed = False
+        self._interest_sent = False
+        self._last_reply = time.time()
+        self._external_robots = {}
+
+        logger.debug("Connecting to %s:%d" % (self.host, self.port) )
+        try:
+            self._sock = socket.create_connection((self.host, self.port), 1.0)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock.sendall(protocol.encode_hello(self.node_name))
+            self._sock.setblocking(False)
+            logger.info("Connected to %s:%s (binary protocol)" % (self.host, self.port) )
+        except socket.error as err:
+            logger.info("Multi-node simulation not available!")
+            logger.warning("Unable to connect to %s:%s"%(self.host, self.port) )
+            logger.warning(str(err))
+            self._close()
+
+    def _close(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def _send(self):
+        """ Send as much of the output buffer as possible, without blocking
+
+        If the server does not keep up, the rest is sent at the next steps.
+        """
+        try:
+            sent = self._sock.send(self._out)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except socket.error as err:
+            logger.warning("Multi-node connection lost: %s" % err)
+            self._close()
+            return False
+        del self._out[:sent]
+        return True
+
+    def _subscribe(self):
+        """ Subscribe to the robots handled by the other nodes """
+        registry = blenderapi.persistantstorage().object_registry
+        names = [obj.name for obj in registry.with_property('External_Robot_Tag')]
+        logger.info("Subscribing to %d external robots" % len(names))
+        self._subscribed = True
+        return protocol.encode_subscribe(names)
+
+    def _interest(self):
+        """ Return the INTEREST frame of the node, or b'' if it did not
+        configure areas of interest """
+        self._interest_sent = True
+        regions = self.options.get('interest_regions', [])
+        interest_range = self.options.get('interest_range')
+        ranges = []
+        if interest_range is not None:
+            for obj, robot_id in self._ids.items():
+                if isinstance(interest_range, dict):
+                    radius = interest_range.get(obj.name)
+                else:
+                    radius = interest_range
+                if radius is not None:
+                    ranges.append((robot_id, float(radius)))
+        if not regions and not ranges:
+            return b''
+        logger.info("Areas of interest: %d regions, %d ranges" %
+                    (len(regions), len(ranges)))
+        return protocol.encode_interest([tuple(map(float, r)) for r in regions],
+                                        ranges)
+
+    def _local_records(self):
+        """ Return the NAMES frame of the new local robots, and the records
+        of the local robots which moved """
+        new_names = []
+        records = []
+        for obj in blenderapi.persistantstorage().robotDict.keys():
+            robot_id = self._ids.get(obj)
+            if robot_id is None:
+                robot_id = self._ids[obj] = len(self._ids)
+                new_names.append((robot_id, obj.name))
+            position = obj.worldPosition
+            euler = obj.worldOrientation.to_euler()
+            pose = (position[0], position[1], position[2],
+                    euler.x, euler.y, euler.z)
+            if protocol.moved(pose, self._sent.get(robot_id),
+                              self.position_threshold,
+                              self.orientation_threshold):
+                self._sent[robot_id] = pose
+                records.append((robot_id, ) + pose)
+        names = protocol.encode_names(new_names) if new_names else b''
+        return names, records
+
+    def _read(self, timeout = 0.0):
+        """ Read the frames available, waiting at most timeout seconds for
+        the first one """
+        if timeout > 0.0:
+            readable, _, _ = select.select([self._sock], [], [], timeout)
+            if not readable:
+                return
+        while self._sock:
+            try:
+                data = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            except socket.error as err:
+                logger.warning("Multi-node connection lost: %s" % err)
+                self._close()
+                return
+            if not data:
+                logger.warning("Multi-node server closed the connection")
+                self._close()
+                return
+            self._last_reply = time.time()
+            for kind, payload in self._reader.feed(data):
+                self._on_frame(kind, payload)
+
+    def _on_frame(self, kind, payload):
+        if kind == protocol.NAMES:
+            self._names.update(protocol.decode_names(payload))
+        elif kind == protocol.UPDATE:
+            _, records = protocol.decode_update(payload)
+            for record in records:
+                name = self._names.get(record[0])
+                if name is not None:
+                    self._received[name] = [record[1:4], record[4:7]]
+        else:
+            logger.debug("Ignoring multi-node frame of type %d" % kind)
+
+    def synchronize(self):
+        if not self._sock:
+            return
+
+        out = self._subscribe() if not self._subscribed else b''
+        names, records = self._local_records()
+        out += names
+        if not self._interest_sent:
+            out += self._interest()
+        out += protocol.encode_update(
+                    blenderapi.persistantstorage().time.time, records)
+        self._out += out
+        if not self._send():
+            return
+
+        try:
+            self._read()
+            if self._sock and time.time() - self._last_reply > self.max_staleness:
+                logger.debug("multi-node data is stale, waiting for the server")
+                self._read(self.max_staleness)
+        except (protocol.ProtocolError, struct.error) as e:
+            logger.warning("invalid data from the multi-node server: " + str(e))
+            self._close()
+            return
+
+        if not self._received:
+            return
+        in_data, self._received = self._received, {}
+        try:
+            self.update_scene(in_data, blenderapi.scene())
+        except Exception as e:
+            logger.warning("error while processing incoming data: " + str(e))
+
+    def finalize(self):
+        """ Close the communication socket. """
+        self._close()
@@ -2,6 +2,7 @@ import logging; logger = logging.getLogger("morse." + __name__)
 from morse.core.robot import Robot
 from morse.core.services import service
 from morse.core import blenderapi
+from morse.helpers.transformation import set_world_pose
 
 class GraspingRobot(Robot):
     """ Class definition for a "virtual" robot.
@@ -79,7 +80,7 @@ class GraspingRobot(Robot):
                     # Remove Physic simulation
                     selected_object.suspendDynamics()
                     #Put object in the hand
-                    selected_object.worldPosition = hand_empty.worldPosition
+                    set_world_pose(selected_object, hand_empty.worldPosition)
                     # Parent the selected object to the hand target
                     selected_object.setParent (hand_empty)
                     logger.debug( "OBJECT %s PARENTED TO %s" %
@@ -2,6 +2,7 @@ import logging; logger = logging.getLogger("morse." + __name__)
 from morse.robots.grasping_robot import GraspingRobot
 from morse.core.services import service
 from morse.core import blenderapi
+from morse.helpers.transformation import forget_world_pose
 
 class PR2(GraspingRobot):
     """ 
@@ -91,6 +92,7 @@ class PR2(GraspingRobot):
         """
         if self.TORSO_LOWER < height < self.TORSO_UPPER:
             self.torso.localPosition = [-0.05, 0, self.TORSO_BASE_HEIGHT + height]
+            forget_world_pose(self.torso)
             return "New torso z position: " + str(self.torso.localPosition[2])
         else:
             return "Not a valid height, value has to be between 0.0 and 0.31!"
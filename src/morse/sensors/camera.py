@@ -2,10 +2,7 @@ import logging; logger = logging.getLogger("morse." + __name__)
 from morse.core import blenderapi
 import morse.core.sensor
 from morse.helpers.components import add_property
-
-def copy_pose(obj_from, obj_to):
-    obj_to.worldPosition = obj_from.worldPosition
-    obj_to.worldOrientation = obj_from.worldOrientation
+from morse.core.scene_sync import copy_pose, get_scene_sync
 
 class Camera(morse.core.sensor.Sensor):
     """
@@ -109,11 +106,9 @@ class Camera(morse.core.sensor.Sensor):
             blenderapi.cameras()[self.name()].refresh(True)
 
     def _update_scene(self):
-        for _to, _from in self._scene_syncable_objects:
-            try:
-                copy_pose(_from, _to)
-            except Exception as e:
-                logger.warning(str(e))
+        # Shared by the cameras rendering the same scene, and done once per
+        # simulation step
+        self._scene_sync.sync()
 
     def _setup_video_texture(self):
         """ Prepare this camera to use the bge.texture module.
@@ -150,46 +145,10 @@ class Camera(morse.core.sensor.Sensor):
         scene_map = blenderapi.get_scene_map()
         logger.info("Scene %s from %s"% (self.scene_name, repr(scene_map.keys()) ) )
         self._scene = scene_map[self.scene_name]
-        self._morse_scene = scene_map['S.MORSE_LOGIC']
-
-        """
-        Compute the relation between objects in the current scene and
-        objects in the main logic scene.
-
-        The logic is a bit complex, as in the case of group, we can have
-        objects with the same name (but different ids). So, in this
-        case, we follow the hierarchy on both scene to find
-        correspondance (assuming no recursive group)
-
-        known_ids is used to track objects alreay referenced and not
-        include it twice (and possibly missing the fact that the same
-        name can reference multiples different objects)
-
-        I'm definitively not sure it is correct at all, it is a really
-        really dark corner of Blender :). But it seems to do the job!
-        """
-        self._scene_syncable_objects = []
-        known_ids = set()
-        for obj in self._scene.objects:
-            if obj.name != '__default__cam__' and id(obj) not in known_ids:
-                members = obj.groupMembers
-                if not members:
-                    self._scene_syncable_objects.append(
-                            (obj, self._morse_scene.objects[obj.name]))
-                    known_ids.add(id(obj))
-                else:
-                    main_members = self._morse_scene.objects[obj.name].groupMembers
-                    for i in range(0, len(main_members)):
-                        self._scene_syncable_objects.append(
-                                (members[i], main_members[i]))
-                        known_ids.add(id(members[i]))
-                        childs = members[i].childrenRecursive
-                        main_childs = main_members[i].childrenRecursive
-                        for child in childs:
-                            self._scene_syncable_objects.append(
-                                    (child, main_childs[child.name]))
-                            known_ids.add(id(child))
 
+        # The objects of the scene follow the ones of the main logic scene
+        # (see morse.core.scene_sync)
+        self._scene_sync = get_scene_sync(self.scene_name)
 
         # Link the objects using bge.texture
         if not blenderapi.hascameras():
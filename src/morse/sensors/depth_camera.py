@@ -5,6 +5,7 @@ import morse.core.blenderapi
 from morse.sensors.camera import Camera
 from morse.sensors.video_camera import VideoCamera
 from morse.helpers.components import add_data, add_property
+from morse.helpers.transformation import forget_world_pose
 
 class AbstractDepthCamera(VideoCamera):
 
@@ -146,3 +147,4 @@ class DepthCameraRotationZ(DepthCamera):
     def applyRotationZ(self, rotation):
         # The second parameter specifies a "local" movement
         self.bge_object.applyRotation([0, rotation, 0], True)
+        forget_world_pose(self.bge_object)
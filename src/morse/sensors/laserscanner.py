@@ -1,7 +1,9 @@
 import logging; logger = logging.getLogger("morse." + __name__)
+import numpy
 from morse.core import blenderapi
 from morse.core.sensor import Sensor
 from morse.helpers.components import add_data, add_property, add_level
+from morse.helpers.transformation import forget_world_pose
 from morse.builder import bpymorse
 """
 Important note:
@@ -148,6 +150,23 @@ class LaserScanner(Sensor):
     .. code-block:: python
 
         sick.frequency(1.0)
+
+    Batch scan mode
+    ---------------
+
+    For sensors with a large number of rays (Hokuyo, Velodyne-like
+    scanners), the ``batch_scan`` property enables a faster code path.
+    The ray directions are read once from the arc mesh into a NumPy
+    table, transformed in a single matrix product at each scan, and the
+    points and distances are computed in bulk from the hit positions.
+    In this mode, ``point_list`` and ``range_list`` (and
+    ``remission_list`` for the **rssi** level) are stored as contiguous
+    ``float32`` NumPy arrays instead of lists of lists.
+
+    .. code-block:: python
+
+        hokuyo = Hokuyo()
+        hokuyo.properties(batch_scan = True)
     """
 
     _name = "Laser Scanner Sensors"
@@ -194,6 +213,10 @@ class LaserScanner(Sensor):
     add_property('layer_offset', 0.125, 'layer_offset', "float",
                  "The horizontal distance between the scan points in \
                   consecutive scanning layers. Must be given in degrees.")
+    add_property('batch_scan', False, 'batch_scan', "boolean",
+                 "If true, precompute the ray table and process the scan \
+                  in bulk with NumPy. point_list and range_list are then \
+                  stored as float32 arrays.")
 
     def __init__(self, obj, parent=None):
         """
@@ -255,8 +278,80 @@ class LaserScanner(Sensor):
                 self._layers = self.bge_object['layers']
             self._vertex_per_layer = len(self._ray_list) // self._layers
 
+        if self.batch_scan:
+            self._init_batch_scan()
+
         logger.info('Component initialized, runs at %.2f Hz', self.frequency)
 
+    def _init_batch_scan(self):
+        """
+        Precompute the table of ray directions, and replace the data
+        lists by contiguous float32 arrays
+        """
+        nb_rays = len(self._ray_list)
+        self._ray_table = numpy.array([ray[:] for ray in self._ray_list],
+                                      dtype=numpy.float64).reshape(nb_rays, 3)
+        self._hit_points = numpy.zeros((nb_rays, 3), dtype=numpy.float64)
+        self._hit_mask = numpy.zeros(nb_rays, dtype=bool)
+
+        self.local_data['point_list'] = numpy.zeros((nb_rays, 3),
+                                                    dtype=numpy.float32)
+        self.local_data['range_list'] = numpy.zeros(nb_rays,
+                                                    dtype=numpy.float32)
+
+    def _batch_targets(self):
+        """
+        Transform the whole ray table to the current sensor pose
+
+        Returns the rotation and the translation of the sensor (as NumPy
+        arrays) and the list of world targets of the rays.
+        """
+        matrix = numpy.array(self.position_3d.matrix, dtype=numpy.float64)
+        rotation = matrix[:3, :3]
+        translation = matrix[:3, 3]
+        targets = self._ray_table.dot(rotation.T) + translation
+        return rotation, translation, targets.tolist()
+
+    def _batch_store(self, rotation, translation):
+        """
+        Compute points (in the sensor frame) and distances from the hit
+        points stored in self._hit_points
+        """
+        mask = self._hit_mask
+        # rigid transformation, so inverse is R^T * (p - t)
+        local = (self._hit_points - translation).dot(rotation)
+        local[~mask] = 0.0
+
+        ranges = numpy.sqrt(numpy.einsum('ij,ij->i', local, local))
+        ranges[~mask] = self.laser_range
+
+        self.local_data['point_list'][:] = local
+        self.local_data['range_list'][:] = ranges
+
+    def batch_action(self):
+        """
+        Do ray tracing using the precomputed ray table
+
+        Only the call to rayCast remains per ray, the geometric
+        computations are done in bulk.
+        """
+        rotation, translation, targets = self._batch_targets()
+        ray_cast = self.bge_object.rayCast
+        laser_range = self.laser_range
+        hit_points = self._hit_points
+        hit_mask = self._hit_mask
+
+        for index, target in enumerate(targets):
+            obj, point, _ = ray_cast(target, None, laser_range)
+            if obj:
+                hit_points[index] = point
+                hit_mask[index] = True
+            else:
+                hit_mask[index] = False
+
+        self._batch_store(rotation, translation)
+        self.change_arc()
+
 
     def default_action(self):
         """
@@ -271,8 +366,12 @@ class LaserScanner(Sensor):
         #                 self.bge_object.position[1],
         #                 self.bge_object.position[2]))
 
+        if self.batch_scan:
+            self.batch_action()
+            return
+
         # Get the inverse of the transformation matrix
-        inverse = self.position_3d.matrix.inverted()
+        inverse = self.position_3d.inverse
 
         index = 0
         for ray in self._ray_list:
@@ -321,6 +420,8 @@ class LaserScanner(Sensor):
                     for v_index in range(1, mesh.getVertexArrayLength(m_index)):
                         vertex = mesh.getVertex(m_index, v_index)
                         point = self.local_data['point_list'][v_index-1]
+                        if self.batch_scan:
+                            point = point.tolist()
                         if point == [0.0, 0.0, 0.0]:
                             # If there was no intersection, move the vertex
                             # to the laser range
@@ -336,6 +437,7 @@ class LaserScannerRotationZ(LaserScanner):
     def applyRotationZ(self, rz=.01745):
         # The second parameter specifies a "local" movement
         self.bge_object.applyRotation([0, 0, rz], True)
+        forget_world_pose(self.bge_object)
 
 class RSSILaserScanner(LaserScanner):
 
@@ -351,7 +453,11 @@ class RSSILaserScanner(LaserScanner):
 
             # Insert zeros in the remission list
             self.local_data['remission_list'].append(0.0) 
-       
+
+        if self.batch_scan:
+            self.local_data['remission_list'] = numpy.zeros(
+                    len(self._ray_list), dtype=numpy.float32)
+
     def getRSSIValue(self, target):
 
         """
@@ -381,8 +487,34 @@ class RSSILaserScanner(LaserScanner):
                     where the name is parsed."%mat_name)
             return -1              
 
+    def batch_action(self):
+        rotation, translation, targets = self._batch_targets()
+        ray_cast = self.bge_object.rayCast
+        laser_range = self.laser_range
+        hit_points = self._hit_points
+        hit_mask = self._hit_mask
+        remission = self.local_data['remission_list']
+
+        for index, target in enumerate(targets):
+            _, point, _, target_poly = ray_cast(target, None, laser_range,
+                                                "", 1, 1, 1)
+            if target_poly:
+                hit_points[index] = point
+                hit_mask[index] = True
+                remission[index] = self.getRSSIValue(target_poly) or 0.0
+            else:
+                hit_mask[index] = False
+                remission[index] = 0
+
+        self._batch_store(rotation, translation)
+        LaserScanner.change_arc(self)
+
     def default_action(self):
-        inverse = self.position_3d.matrix.inverted()
+        if self.batch_scan:
+            self.batch_action()
+            return
+
+        inverse = self.position_3d.inverse
 
         index = 0
         for ray in self._ray_list:
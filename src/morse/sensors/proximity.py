@@ -10,6 +10,12 @@ class Proximity(morse.core.sensor.Sensor):
     This sensor can be used to determine which other objects are within a
     certain radius of the sensor. It performs its test based only on distance.
     The type of tracked objects can be specified using the **Track** property.
+
+    The tracked objects are looked for in the scene-wide spatial index
+    (:py:class:`morse.core.spatial_index.SpatialIndex`), so that only the
+    objects close to the robot are considered at each step. The size of
+    its cells can be tuned with
+    :python:`env.properties(spatial_index_cell_size = 10.0)`.
     """
 
     _name = "Proximity Sensor"
@@ -38,6 +44,9 @@ class Proximity(morse.core.sensor.Sensor):
         # Call the constructor of the parent class
         morse.core.sensor.Sensor.__init__(self, obj, parent)
 
+        self._registry = blenderapi.persistantstorage().object_registry
+        self._spatial_index = blenderapi.persistantstorage().spatial_index
+
         logger.info('Component initialized, runs at %.2f Hz', self.frequency)
 
     @service
@@ -68,24 +77,14 @@ class Proximity(morse.core.sensor.Sensor):
         self.local_data['near_robots'] = self.local_data['near_objects']
 
         parent = self.robot_parent.bge_object
-
-        # Get the tracked sources
-        for obj in blenderapi.scene().objects:
-            try:
-                obj[self._tag]
-                # Skip distance to self
-                if parent != obj:
-                    distance = self._measure_distance_to_object (parent, obj)
-                    if distance <= self._range:
-                        self.local_data['near_objects'][obj.name] = distance
-            except KeyError:
-                pass
-
-    def _measure_distance_to_object(self, own_robot, target_object):
-        """ Compute the distance between two objects
-
-        Parameters are two blender objects
-        """
-        distance, globalVector, localVector = own_robot.getVectTo(target_object)
-        logger.debug("Distance from robot {0} to object {1} = {2}".format(own_robot, target_object, distance))
-        return distance
+        tag = self._tag
+
+        # Get the tracked sources close enough to the robot
+        grid = self._spatial_index.grid(('property', tag),
+                                        lambda obj: tag in obj,
+                                        objects = self._registry.with_property(tag))
+        for obj, distance in grid.query_radius(parent.worldPosition,
+                                               self._range):
+            # Skip distance to self
+            if parent != obj:
+                self.local_data['near_objects'][obj.name] = distance
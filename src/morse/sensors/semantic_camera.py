@@ -1,5 +1,7 @@
 import logging; logger = logging.getLogger("morse." + __name__)
+import math
 from morse.core import blenderapi
+from morse.core.spatial_index import bounding_radius
 
 import morse.sensors.camera
 
@@ -48,8 +50,11 @@ class SemanticCamera(morse.sensors.camera.Camera):
     Details of implementation
     -------------------------
 
-    A test is made to identify which of these objects are inside of
-    the view frustum of the camera. Finally, a single visibility test is
+    The tracked objects lying in a cone containing the view frustum of the
+    camera are retrieved from the scene-wide spatial index
+    (:py:class:`morse.core.spatial_index.SpatialIndex`). A test is then
+    made to identify which of these objects are inside of the view frustum
+    of the camera. Finally, a single visibility test is
     performed by casting a ray from the center of the camera to the
     center of the object. If anything other than the test object is
     found first by the ray, the object is considered to be occluded by
@@ -146,12 +151,17 @@ class SemanticCamera(morse.sensors.camera.Camera):
         # (->meshes with a class property set up) as keys
         #  and the bounding boxes of these objects as value.
         self.trackedObjects = {}
-        for o in blenderapi.scene().objects:
-            tagged = ('Type' in o and o['Type'] == self.tag) or (self.tag in o and bool(o[self.tag]))
-                               
-            if tagged:
-                self.trackedObjects[o] = blenderapi.objectdata(o.name).bound_box
-                logger.warning('    - %s' % o.name)
+        registry = blenderapi.persistantstorage().object_registry
+        for o in registry.tagged(self.tag):
+            self.trackedObjects[o] = blenderapi.objectdata(o.name).bound_box
+            logger.warning('    - %s' % o.name)
+
+        # Grid of the tracked objects, shared by the semantic cameras
+        # tracking the same tag
+        self._grid = blenderapi.persistantstorage().spatial_index.grid(
+                        ('semantic', self.tag), self._is_tracked,
+                        lambda o: bounding_radius(self._bound_box(o)),
+                        objects = self.trackedObjects.keys())
 
         if self.noocclusion:
             logger.info("Semantic camera running in 'no occlusion' mode (fast mode).")
@@ -171,7 +181,8 @@ class SemanticCamera(morse.sensors.camera.Camera):
 
         # Create dictionaries
         self.local_data['visible_objects'] = []
-        for obj, bb in self.trackedObjects.items():
+        for obj in self._candidates():
+            bb = self._bound_box(obj)
             if self._check_visible(obj, bb):
                 # Create dictionary to contain object name, type,
                 # description, position and orientation
@@ -193,6 +204,41 @@ class SemanticCamera(morse.sensors.camera.Camera):
         logger.debug("Visible objects: %s" % self.local_data['visible_objects'])
 
 
+    def _bound_box(self, obj):
+        """ Return the bounding box of the tracked object obj, which may
+        have been added to the scene after the initialization """
+        bb = self.trackedObjects.get(obj)
+        if bb is None:
+            bb = blenderapi.objectdata(obj.name).bound_box
+            self.trackedObjects[obj] = bb
+        return bb
+
+    def _is_tracked(self, obj):
+        return ('Type' in obj and obj['Type'] == self.tag) or \
+               (self.tag in obj and bool(obj[self.tag]))
+
+    def _candidates(self):
+        """ Return the tracked objects which may be in the frustum of the
+        camera, using the spatial index to only consider the objects in a
+        cone containing the frustum """
+        cam = self.blender_cam
+        if not cam.perspective:
+            return list(self.trackedObjects.keys())
+
+        # Half angle of the cone containing the frustum, computed from the
+        # projection matrix: its diagonal holds the inverse of the tangent
+        # of the horizontal and vertical half fields of view
+        projection = cam.projection_matrix
+        tan_x = 1.0 / projection[0][0]
+        tan_y = 1.0 / projection[1][1]
+        half_angle = math.atan(math.sqrt(tan_x ** 2 + tan_y ** 2))
+
+        # Blender cameras look along their -Z axis. The corners of the far
+        # plane are cam.far / cos(half_angle) away from the camera.
+        return self._grid.query_cone(cam.worldPosition,
+                                     cam.getAxisVect((0.0, 0.0, -1.0)),
+                                     half_angle, cam.far / math.cos(half_angle))
+
     def _check_visible(self, obj, bb):
         """ Check if an object lies inside of the camera frustum. 
         
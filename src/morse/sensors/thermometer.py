@@ -54,22 +54,18 @@ class Thermometer(morse.core.sensor.Sensor):
         
         temp = float(self._zero)
 
-        scene = blenderapi.scene()
+        registry = blenderapi.persistantstorage().object_registry
         # Look for the fire sources marked so
-        for obj in scene.objects:
-            try:
-                f = obj[self._tag]
-                if type(f) == int or type(f) == float:
-                    fire_intensity = float(f)
-                else:
-                    fire_intensity = self._fire
-                    
-                distance, gvect, lvect = self.bge_object.getVectTo(obj)
-                if distance < self._range:
-                    t = fire_intensity * math.exp(- self._alpha * distance)
-                    temp += t
-                    
-            except KeyError as detail:
-                logger.debug("Exception: " + str(detail))
+        for obj in registry.with_property(self._tag):
+            f = obj[self._tag]
+            if type(f) == int or type(f) == float:
+                fire_intensity = float(f)
+            else:
+                fire_intensity = self._fire
+
+            distance, gvect, lvect = self.bge_object.getVectTo(obj)
+            if distance < self._range:
+                t = fire_intensity * math.exp(- self._alpha * distance)
+                temp += t
 
         self.local_data['temperature'] = float(temp)
@@ -3,6 +3,8 @@ from morse.core.services import service
 from morse.core import status, blenderapi, mathutils
 from morse.blender.main import reset_objects as main_reset, close_all as main_close, quit as main_terminate
 from morse.core.abstractobject import AbstractObject
+from morse.core.world_state import WorldState
+from morse.helpers.transformation import set_world_pose, forget_world_pose
 from morse.core.exceptions import *
 import json
 
@@ -177,6 +179,21 @@ class Supervision(AbstractObject):
         return details
 
 
+    @service
+    def get_all_poses(self):
+        """ Return the state of all the robots of the simulation, in one
+        call:
+
+        ``{'timestamp': t, 'fields': ['x', 'y', 'z', 'yaw', 'pitch',
+        'roll', 'vx', 'vy', 'vz', 'wx', 'wy', 'wz'], 'robots': [names],
+        'states': [[x, y, z, yaw, pitch, roll, vx, ...], ...]}``
+
+        Robots are sorted by name, velocities are expressed in the world
+        frame. The same data can be streamed at each step by the socket
+        datastream manager, see its ``world_state`` option.
+        """
+        return WorldState().to_dict()
+
     @service
     def set_log_level(self, component, level):
         """
@@ -272,7 +289,7 @@ class Supervision(AbstractObject):
         :type  position: list(float)
         """
         blender_object = get_obj_by_name('CameraFP')
-        blender_object.worldPosition = position
+        set_world_pose(blender_object, position)
         return position
 
     @service
@@ -303,6 +320,7 @@ class Supervision(AbstractObject):
         try:
             blender_object = get_obj_by_name('CameraFP')
             blender_object.worldTransform = mathutils.Matrix(transform)
+            forget_world_pose(blender_object)
             return transform
         except SystemError: # if the matrix is not 4x4 numpy raises a SystemError
             raise MorseRPCInvokationError( "The Matrix must be 4x4 [[float]]" )
@@ -328,5 +346,50 @@ class Supervision(AbstractObject):
         blender_object = get_obj_by_name('CameraFP')
         return [list(vec) for vec in blender_object.projection_matrix]
 
+    @service
+    def enable_profiler(self, trace = False):
+        """ Start recording the duration of each phase of the simulation
+        loop, and of the action, modifiers and datastreams of each
+        component (see :py:mod:`morse.core.profiler`)
+
+        :param trace: if True, also record each event, for
+                      :py:meth:`dump_profile`
+        """
+        blenderapi.persistantstorage().profiler.enable(trace)
+
+    @service
+    def disable_profiler(self):
+        """ Stop recording durations, keeping the already recorded ones """
+        blenderapi.persistantstorage().profiler.disable()
+
+    @service
+    def reset_profiler(self):
+        """ Forget all the durations and events recorded by the profiler """
+        blenderapi.persistantstorage().profiler.reset()
+
+    @service
+    def get_profile(self):
+        """ Return the statistics recorded by the profiler, grouped by
+        scope ('simulation' or the name of a component) and by phase.
+
+        Each phase is described by a dictionary with the number of samples
+        ('count') and the 'mean', 'max', 'p50', 'p95' and 'p99' durations,
+        in milliseconds.
+        """
+        return blenderapi.persistantstorage().profiler.statistics()
+
+    @service
+    def dump_profile(self, path):
+        """ Write the events recorded by the profiler in the Chrome trace
+        format (loadable in chrome://tracing), along with the statistics
+
+        :param path: the JSON file to write, on the simulator side
+        :return: the path of the written file
+        """
+        try:
+            return blenderapi.persistantstorage().profiler.dump(path)
+        except IOError as e:
+            raise MorseRPCInvokationError(str(e))
+
     def action(self):
         pass
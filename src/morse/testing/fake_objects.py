@@ -0,0 +1,103 @@
+""" Stand-in objects for the unit tests which run without the simulator
+
+They expose the subset of the Blender Game Engine API used by the tested
+code (KX_GameObject, KX_Scene, CListValue), and the attributes of the
+MORSE components read by the datastreams.
+"""
+
+class FakeObject(object):
+    """ Stand-in for a KX_GameObject
+
+    The game properties are given as a dictionary. The world pose is made
+    of worldPosition and worldOrientation, stored as given (tuples, or
+    mathutils objects when the test needs them).
+    """
+    groupMembers = None
+
+    def __init__(self, name = 'object', properties = None,
+                 position = (0.0, 0.0, 0.0), orientation = (0.0, 0.0, 0.0),
+                 parent = None, physics_type = 'STATIC'):
+        self.name = name
+        self.invalid = False
+        self._properties = dict(properties or {})
+        self.worldPosition = position
+        self.worldOrientation = orientation
+        self.worldLinearVelocity = [0.0, 0.0, 0.0]
+        self.worldAngularVelocity = [0.0, 0.0, 0.0]
+        self.physics_type = physics_type
+        self.sensors = []
+        self.controllers = []
+        self.actuators = []
+        self.childrenRecursive = []
+        self.parent = parent
+        while parent:
+            parent.childrenRecursive.append(self)
+            parent = parent.parent
+
+    @property
+    def worldTransform(self):
+        return (self.worldPosition, self.worldOrientation)
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def __setitem__(self, key, value):
+        self._properties[key] = value
+
+    def get(self, key, default = None):
+        return self._properties.get(key, default)
+
+    def getPropertyNames(self):
+        return list(self._properties.keys())
+
+    def getLinearVelocity(self):
+        return self.worldLinearVelocity
+
+    def getAngularVelocity(self):
+        return self.worldAngularVelocity
+
+    def endObject(self):
+        self.invalid = True
+
+
+class ObjectList(list):
+    """ Sequence of objects, also indexed by name, as CListValue """
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for obj in self:
+                if obj.name == key:
+                    return obj
+            raise KeyError(key)
+        return list.__getitem__(self, key)
+
+
+class FakeScene(object):
+    """ Stand-in for a KX_Scene: the objects added at runtime are appended
+    to the scene """
+    def __init__(self, name = 'Scene', objects = ()):
+        self.name = name
+        self.objects = ObjectList(objects)
+
+    def add(self, obj):
+        self.objects.append(obj)
+
+    def remove(self, obj):
+        self.objects.remove(obj)
+        obj.endObject()
+
+
+class FakeComponent(object):
+    """ Stand-in for a MORSE component, holding its local_data and the
+    functions registered by its datastreams """
+    def __init__(self, name, data = None):
+        self.bge_object = FakeObject(name)
+        self.local_data = data if data is not None else {}
+        self.input_functions = []
+        self.output_functions = []
+        self.del_functions = []
+
+    def name(self):
+        return self.bge_object.name
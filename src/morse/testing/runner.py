@@ -0,0 +1,144 @@
+""" Parallel runner of the MORSE tests
+
+Each test file is run (as with ``python3 test_file.py``) by one of N
+workers, in parallel. Each worker has its own range of ports for the
+socket service interface (``MORSE_SERVICE_PORT``) and for the socket
+datastreams (``MORSE_STREAM_PORT``), and its own working directory for the
+log files of the simulator, so that several simulators can run at the same
+time.
+
+.. code-block:: bash
+
+    $ python3 -m morse.testing.runner -j 4 testing/base/*_testing.py
+
+With ``--reuse``, the tests of a file sharing the same builder script use
+the same simulator (see :py:class:`morse.testing.testing.MorseTestCase`).
+
+Tests using fixed ports (for instance, an explicit ``port`` for a stream,
+or a ``sync_port``) can not run in parallel with each other.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import subprocess
+from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
+
+SERVICE_PORT = 4000
+# the socket request manager tries the next 10 ports if one is busy
+SERVICE_PORT_STRIDE = 20
+STREAM_PORT = 60000
+STREAM_PORT_STRIDE = 200
+MAX_WORKERS = (65535 - STREAM_PORT) // STREAM_PORT_STRIDE
+
+
+def worker_environment(index, reuse = False):
+    """ Return the environment of the worker index """
+    env = dict(os.environ)
+    env['MORSE_SERVICE_PORT'] = str(SERVICE_PORT + index * SERVICE_PORT_STRIDE)
+    env['MORSE_STREAM_PORT'] = str(STREAM_PORT + index * STREAM_PORT_STRIDE)
+    if reuse:
+        env['MORSE_TEST_REUSE'] = '1'
+    return env
+
+
+class TestResult(object):
+    def __init__(self, path, returncode, duration, output):
+        self.path = path
+        self.returncode = returncode
+        self.duration = duration
+        self.output = output
+
+    @property
+    def success(self):
+        return self.returncode == 0
+
+
+class ParallelRunner(object):
+    """ Run test files in parallel, with isolated ports
+
+    :param jobs: the number of workers
+    :param log_dir: the directory where the outputs of the tests are
+                    stored (one sub-directory per worker)
+    :param reuse: reuse the simulator between the tests of a file
+    :param timeout: the maximum duration of a test file, in seconds
+    """
+    def __init__(self, jobs = 1, log_dir = 'morse-tests', reuse = False,
+                       timeout = None):
+        if not 1 <= jobs <= MAX_WORKERS:
+            raise ValueError("The number of workers must be between 1 and %d"
+                             % MAX_WORKERS)
+        self.jobs = jobs
+        self.log_dir = os.path.abspath(log_dir)
+        self.reuse = reuse
+        self.timeout = timeout
+        self._workers = Queue()
+        for index in range(jobs):
+            self._workers.put(index)
+        self._print_lock = threading.Lock()
+
+    def _run(self, path):
+        index = self._workers.get()
+        try:
+            cwd = os.path.join(self.log_dir, 'worker-%d' % index)
+            os.makedirs(cwd, exist_ok = True)
+            name = os.path.splitext(os.path.basename(path))[0]
+            output = os.path.join(cwd, name + '.out')
+
+            start = time.time()
+            with open(output, 'w') as out:
+                try:
+                    returncode = subprocess.call(
+                            [sys.executable, os.path.abspath(path)],
+                            stdout = out, stderr = subprocess.STDOUT,
+                            cwd = cwd, env = worker_environment(index, self.reuse),
+                            timeout = self.timeout)
+                except subprocess.TimeoutExpired:
+                    returncode = 'timeout'
+            result = TestResult(path, returncode, time.time() - start, output)
+        finally:
+            self._workers.put(index)
+
+        with self._print_lock:
+            print("%-50s %s (%.1fs, worker %d)" % (path,
+                  "OK" if result.success else "FAILED", result.duration, index))
+            sys.stdout.flush()
+        return result
+
+    def run(self, paths):
+        """ Run the test files, and return the list of TestResult """
+        with ThreadPoolExecutor(max_workers = self.jobs) as executor:
+            return list(executor.map(self._run, paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Run MORSE tests in parallel")
+    parser.add_argument('tests', nargs = '+', help = "the test files")
+    parser.add_argument('-j', '--jobs', type = int, default = os.cpu_count() or 1,
+                        help = "the number of tests run in parallel")
+    parser.add_argument('--reuse', action = 'store_true',
+                        help = "reuse the simulator between the tests of "
+                               "a file sharing the same builder script")
+    parser.add_argument('--log-dir', default = 'morse-tests',
+                        help = "where to store the outputs of the tests")
+    parser.add_argument('--timeout', type = float, default = None,
+                        help = "maximum duration of a test file, in seconds")
+    args = parser.parse_args()
+
+    start = time.time()
+    runner = ParallelRunner(min(args.jobs, MAX_WORKERS), args.log_dir,
+                            args.reuse, args.timeout)
+    results = runner.run(args.tests)
+
+    failures = [r for r in results if not r.success]
+    print("\nRan %d test files in %.1fs with %d workers" %
+          (len(results), time.time() - start, runner.jobs))
+    for result in failures:
+        print("FAILED: %s (see %s)" % (result.path, result.output))
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
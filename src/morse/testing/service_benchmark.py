@@ -0,0 +1,150 @@
+""" Micro-benchmarks of the service dispatch
+
+They measure, without Blender, the latency of synchronous and
+asynchronous services:
+
+- *dispatch*: the cost of
+  :py:meth:`morse.core.request_manager.RequestManager.on_incoming_request`
+  (and, for asynchronous services, of the notification of the completion)
+- *socket*: the round-trip time of a request sent by a client through the
+  :py:class:`morse.middleware.socket_request_manager.SocketRequestManager`,
+  the manager being driven as in the simulation loop.
+
+Run them with::
+
+    $ python3 -m morse.testing.service_benchmark
+"""
+
+import socket
+import timeit
+
+from morse.core import status
+from morse.core.request_manager import RequestManager
+from morse.middleware import socket_request_manager
+from morse.middleware.socket_request_manager import SocketRequestManager
+
+NUMBER = 10000
+SOCKET_NUMBER = 1000
+
+
+class FakeComponent(object):
+    """ Expose a synchronous service similar to get_local_data, and an
+    asynchronous service which completes at the next step """
+    def __init__(self):
+        self.local_data = {'x': 1.0, 'y': 2.0, 'z': 0.0, 'yaw': 0.5}
+        self._pending = []
+
+    def get_local_data(self):
+        return self.local_data
+
+    def set_speed(self, v, w):
+        return None
+
+    def start(self, result_setter, duration):
+        self._pending.append(result_setter)
+
+    def step(self):
+        for result_setter in self._pending:
+            result_setter((status.SUCCESS, None))
+        del self._pending[:]
+
+
+class BenchmarkRequestManager(RequestManager):
+    """ Request manager without middleware """
+    def initialization(self):
+        return True
+
+    def finalization(self):
+        return True
+
+    def post_registration(self, component, service, is_async):
+        return True
+
+    def on_service_completion(self, request_id, result):
+        self.completed += 1
+
+    def main(self):
+        pass
+
+
+def register(manager, component):
+    manager.completed = getattr(manager, 'completed', 0)
+    manager.register_service('robot', component.get_local_data)
+    manager.register_service('robot', component.set_speed)
+    manager.register_async_service('robot', component.start)
+
+
+def dispatch_benchmark():
+    """ Return the latency, in microseconds, of the dispatch of
+    synchronous and asynchronous services """
+    component = FakeComponent()
+    manager = BenchmarkRequestManager()
+    register(manager, component)
+    incoming = manager.on_incoming_request
+
+    res = {}
+    res['sync (no parameter)'] = timeit.timeit(
+            lambda: incoming('robot', 'get_local_data', None), number = NUMBER)
+    res['sync (2 parameters)'] = timeit.timeit(
+            lambda: incoming('robot', 'set_speed', [1.0, 0.5]), number = NUMBER)
+
+    def async_call():
+        incoming('robot', 'start', [1.0])
+        component.step()
+        manager.process()
+    res['async (start + completion)'] = timeit.timeit(async_call, number = NUMBER)
+    assert manager.completed == NUMBER
+
+    return dict((name, 1e6 * t / NUMBER) for name, t in res.items())
+
+
+def socket_benchmark(port = 4500):
+    """ Return the round-trip time, in microseconds, of synchronous and
+    asynchronous services called through the socket request manager """
+    socket_request_manager.SERVER_PORT = port
+    component = FakeComponent()
+    manager = SocketRequestManager()
+    register(manager, component)
+
+    client = socket.create_connection(('localhost', socket_request_manager.SERVER_PORT))
+    manager.process() # accept the connection
+
+    def call(request):
+        client.sendall(request)
+        answer = b''
+        while not answer.endswith(b'\n'):
+            component.step()
+            manager.process()
+            try:
+                answer += client.recv(4096, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                pass
+        return answer
+
+    res = {}
+    try:
+        for name, request in [('sync', b'1 robot get_local_data\n'),
+                              ('async', b'1 robot start [1.0]\n')]:
+            call(request) # warm up
+            res[name] = 1e6 * timeit.timeit(lambda: call(request),
+                                            number = SOCKET_NUMBER) / SOCKET_NUMBER
+
+        batch = b'1 batch [' + b', '.join([b'["robot", "get_local_data"]'] * 100) + b']\n'
+        res['batch of 100 sync'] = 1e6 * timeit.timeit(lambda: call(batch),
+                                           number = SOCKET_NUMBER) / SOCKET_NUMBER
+    finally:
+        client.close()
+        manager.finalization()
+    return res
+
+
+def main():
+    print("Service dispatch (us per call):")
+    for name, latency in sorted(dispatch_benchmark().items()):
+        print("  %-30s %8.2f" % (name, latency))
+    print("Socket round-trip (us per request):")
+    for name, latency in sorted(socket_benchmark().items()):
+        print("  %-30s %8.2f" % (name, latency))
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,26 @@ from abc import ABCMeta, abstractmethod
 import unittest
 import inspect
 import tempfile
-from time import sleep
+from time import sleep, time
 import threading # Used to be able to timeout when waiting for Blender initialization
 import subprocess
 import signal
+import socket
+import atexit
 
 from morse.testing.exceptions import MorseTestingError
 from morse.core.morse_time import TimeStrategies
 
 BLENDER_INITIALIZATION_TIMEOUT = 15 # seconds
+BLENDER_EXIT_TIMEOUT = 10 # seconds
+
+# Port of the socket service interface of the simulator. The parallel test
+# runner (see morse.testing.runner) gives a different one to each worker
+SERVICE_PORT = int(os.environ.get('MORSE_SERVICE_PORT', 4000))
+
+# The simulator kept running after a test, to be reused by the next test
+# if it has the same builder script (see MorseTestCase.reuse_simulator)
+_warm_simulator = None
 
 MODE_INDEX = 0
 CURRENT_TIME_MODE = None
@@ -44,21 +55,65 @@ class MorseTestRunner(unittest.TextTestRunner):
         global INITIALIZED_LOGGER
         if not INITIALIZED_LOGGER:
             self.setup_logging()
-        return unittest.TextTestRunner.run(self, suite)
+        try:
+            return unittest.TextTestRunner.run(self, suite)
+        finally:
+            stop_warm_simulator()
 
-def follow(file):
+def follow(file, process = None):
     """ Really emulate tail -f
 
     See http://stackoverflow.com/questions/1475950/tail-f-in-python-with-no-time-sleep
     for a detailled discussion on the subject
+
+    If process (a subprocess.Popen) is given, stop at the end of the file
+    once the process has exited.
     """
     while True:
         line = file.readline()
         if not line:
+            if process is not None and process.poll() is not None:
+                return
             sleep(0.1)    # Sleep briefly
             continue
         yield line
 
+def service_request(request, port = None, timeout = 1.0):
+    """ Send a request (without id, for instance 'simulation list_robots')
+    to the socket service interface of the simulator, and return its
+    answer (without id)
+
+    Return None if the simulator did not answer before timeout. Raise
+    socket.error if the connection is refused.
+    """
+    sock = socket.create_connection(("localhost", port or SERVICE_PORT), timeout)
+    try:
+        sock.sendall(("test %s\n" % request).encode())
+        answer = b''
+        while not answer.endswith(b'\n'):
+            data = sock.recv(4096)
+            if not data:
+                return None
+            answer += data
+        return answer.decode().strip().split(' ', 1)[1]
+    except socket.timeout:
+        return None
+    finally:
+        sock.close()
+
+def stop_warm_simulator():
+    """ Stop the simulator kept running for the next tests, if any """
+    global _warm_simulator
+    if _warm_simulator:
+        owner = _warm_simulator[1]
+        _warm_simulator = None
+        owner.stopmorse()
+        owner.tearDownMw()
+        owner.logfile.close()
+        owner.t.join()
+
+atexit.register(stop_warm_simulator)
+
 class MorseSwitchTimeMode(unittest.TestCase):
     def test_switch(self):
         global ALL_TIME_MODES
@@ -68,10 +123,21 @@ class MorseSwitchTimeMode(unittest.TestCase):
         MODE_INDEX += 1
 
 class MorseTestCase(unittest.TestCase):
+    """ Base class of the tests running a simulation
+
+    A new simulator is started for each test, with the simulation defined
+    by :py:meth:`setUpEnv`. If ``reuse_simulator`` is True, the simulator
+    is rather kept running after a test, and reused (after a call to
+    ``simulation.reset_objects``) by the next test if it has the same
+    builder script. By default, it is enabled by the environment variable
+    ``MORSE_TEST_REUSE=1`` (see :py:mod:`morse.testing.runner`).
+    """
 
     # Make this an abstract class
     __metaclass__ = ABCMeta
 
+    reuse_simulator = None
+
 
     def setUpMw(self):
         """ This method can be overloaded by subclasses to define
@@ -84,7 +150,7 @@ class MorseTestCase(unittest.TestCase):
         """ Check in the Morse output if some python error happens"""
 
         with open(self.logfile_name) as log:
-            lines = follow(log)
+            lines = follow(log, self.morse_process)
             for line in lines:
                 # Python Error Case
                 if "[ERROR][MORSE]" in line:
@@ -104,9 +170,10 @@ class MorseTestCase(unittest.TestCase):
         testlogger.info("Starting test " + self.id() + " in " + TimeStrategies.human_repr(CURRENT_TIME_MODE))
 
         self.logfile_name = self.__class__.__name__ + ".log"
-        # Wait for a second
-        #  to wait for ports open in previous tests to be closed
-        sleep(1)
+        self.service_port = SERVICE_PORT
+
+        if self._reuse_warm_simulator():
+            return
 
         self.morse_initialized = False
         self.setUpMw()
@@ -114,6 +181,48 @@ class MorseTestCase(unittest.TestCase):
         self.t = threading.Thread(target=self._checkMorseException)
         self.t.start()
 
+    def _reuse_enabled(self):
+        if self.reuse_simulator is None:
+            return os.environ.get('MORSE_TEST_REUSE', '0') != '0'
+        return self.reuse_simulator
+
+    def _reuse_warm_simulator(self):
+        """ Use the simulator of the previous test if it runs the same
+        builder script, after restoring the initial position of the
+        objects. Otherwise, stop it.
+        """
+        global _warm_simulator
+        if not _warm_simulator:
+            return False
+
+        script, owner = _warm_simulator
+        if not self._reuse_enabled() or \
+           script != self.builder_script_source(self) or \
+           owner.morse_process.poll() is not None:
+            stop_warm_simulator()
+            return False
+
+        _warm_simulator = None
+        try:
+            answer = service_request("simulation reset_objects",
+                                     timeout = BLENDER_INITIALIZATION_TIMEOUT)
+        except socket.error:
+            answer = None
+        if not answer or not answer.startswith("SUCCESS"):
+            testlogger.info("Could not reset the simulator, restarting it")
+            _warm_simulator = (script, owner)
+            stop_warm_simulator()
+            return False
+
+        testlogger.info("Reusing the simulator of the previous test")
+        for attr in ['morse_initialized', 'morse_process', 'pid', 'logfile',
+                     'logfile_name', 't', 'builder_script']:
+            setattr(self, attr, getattr(owner, attr))
+        # the middlewares were set up by the first test using this
+        # simulator, and will be cleaned up by it
+        self._mw_owner = getattr(owner, '_mw_owner', owner)
+        return True
+
     def tearDownMw(self):
         """ This method can be overloaded by subclasses to clean up
         environment setup
@@ -121,12 +230,17 @@ class MorseTestCase(unittest.TestCase):
         pass
     
     def tearDown(self):
+        global _warm_simulator
+        if self._reuse_enabled() and self.morse_process.poll() is None:
+            # Keep the simulator running for the next test
+            _warm_simulator = (self.builder_script,
+                               getattr(self, '_mw_owner', self))
+            return
         self.stopmorse()
-        self.tearDownMw()
+        getattr(self, '_mw_owner', self).tearDownMw()
         self.logfile.close() # force to flush
         self.t.join()
 
-        
     @abstractmethod
     def setUpEnv(self):
         """ This method must be overloaded by subclasses to define a
@@ -139,21 +253,43 @@ class MorseTestCase(unittest.TestCase):
         pass
 
     def wait_initialization(self):
-        """ Wait until Morse is initialized """
+        """ Wait until Morse is initialized
+
+        MORSE is ready as soon as its socket service interface answers.
+        For simulations without socket services, rely on the log.
+        """
 
         testlogger.info("Waiting for MORSE to initialize... (timeout: %s sec)" % \
                         BLENDER_INITIALIZATION_TIMEOUT)
+        deadline = time() + BLENDER_INITIALIZATION_TIMEOUT
+        scene_initialized = False
         with open(self.logfile_name) as log:
-            lines = follow(log)
-            for line in lines:
-                if  ("[ERROR][MORSE]" in line) or ("INITIALIZATION ERROR" in line):
-                    testlogger.error("Error during MORSE initialization! Check "
-                                     "the log file.")
-                    return
-                if "SCENE INITIALIZED" in line:
-                    self.morse_initialized = True
+            while time() < deadline:
+                for line in log:
+                    if  ("[ERROR][MORSE]" in line) or ("INITIALIZATION ERROR" in line):
+                        testlogger.error("Error during MORSE initialization! Check "
+                                         "the log file.")
+                        return
+                    if "SCENE INITIALIZED" in line:
+                        scene_initialized = True
+
+                if self.morse_process.poll() is not None:
+                    testlogger.error("MORSE exited during its initialization! "
+                                     "Check the log file.")
                     return
 
+                try:
+                    if service_request("simulation list_robots", self.service_port):
+                        self.morse_initialized = True
+                        return
+                except socket.error:
+                    # connection refused: the service interface is not
+                    # there (yet)
+                    if scene_initialized:
+                        self.morse_initialized = True
+                        return
+                sleep(0.05)
+
     def run(self, result=None):
         """ Overwrite unittest.TestCase::run
 
@@ -191,6 +327,7 @@ class MorseTestCase(unittest.TestCase):
         """
         
         temp_builder_script = self.generate_builder_script(test_case)
+        self.builder_script = self.builder_script_source(test_case)
         try:
             original_script_name = os.path.abspath(inspect.stack()[-1][1])
 
@@ -227,27 +364,33 @@ class MorseTestCase(unittest.TestCase):
     def stopmorse(self):
         """ Cleanly stop MORSE
         """
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
-            sock.connect(("localhost", 4000))
-            sock.send(b"id1 simulation quit\n")
+            service_request("simulation quit", self.service_port)
         except (socket.error, KeyboardInterrupt):
-            sock.close()
-            sock = None
             testlogger.info("MORSE crashed")
 
-        if sock:
-            sock.close()
-            with open(self.logfile_name) as log:
-                lines = follow(log)
-                for line in lines:
-                    if "EXITING SIMULATION" in line:
-                        return
-
-        if self.pid:
-            os.kill(self.pid, signal.SIGKILL)
+        try:
+            self.morse_process.wait(BLENDER_EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            if self.pid:
+                os.kill(self.pid, signal.SIGKILL)
+            self.morse_process.wait()
         testlogger.info("MORSE stopped")
+
+    def builder_script_source(self, test_case):
+        """ Return the builder script used to create the simulation of
+        test_case """
+        return b"".join([
+            b"from morse.builder import *\n",
+            b"from morse.builder.actuators import *\n",
+            b"from morse.builder.sensors import *\n",
+            b"from morse.builder.blenderobjects import *\n",
+            b"class MyEnv():\n",
+            inspect.getsource(test_case.setUpEnv).encode(),
+            b"        env.set_time_strategy(",
+            TimeStrategies.python_repr(CURRENT_TIME_MODE),
+            b")\n",
+            b"MyEnv().setUpEnv()\n"])
     
     def generate_builder_script(self, test_case):
         
@@ -257,16 +400,7 @@ class MorseTestCase(unittest.TestCase):
         # Blender must be restarted and called again with the right
         # environment.
         with tempfile.NamedTemporaryFile(delete = False) as tmp:
-            tmp.write(b"from morse.builder import *\n")
-            tmp.write(b"from morse.builder.actuators import *\n")
-            tmp.write(b"from morse.builder.sensors import *\n")
-            tmp.write(b"from morse.builder.blenderobjects import *\n")
-            tmp.write(b"class MyEnv():\n")
-            tmp.write(inspect.getsource(test_case.setUpEnv).encode())
-            tmp.write(b"        env.set_time_strategy(")
-            tmp.write(TimeStrategies.python_repr(CURRENT_TIME_MODE))
-            tmp.write(b")\n")
-            tmp.write(b"MyEnv().setUpEnv()\n")
+            tmp.write(self.builder_script_source(test_case))
             tmp.flush()
             tmp_name = tmp.name
         
@@ -336,6 +470,8 @@ class MorseBuilderFailureTestCase(MorseTestCase):
     # Make this an abstract class
     __metaclass__ = ABCMeta
 
+    reuse_simulator = False
+
     def wait_initialization(self):
         """ Wait until Morse is initialized """
 
@@ -346,7 +482,7 @@ class MorseBuilderFailureTestCase(MorseTestCase):
         self.morse_initialized = True
 
         with open(self.logfile_name) as log:
-            lines = follow(log)
+            lines = follow(log, self.morse_process)
             for line in lines:
                 if "Blender Game Engine Started" in line:
                     testlogger.error("Blender Game Engine started!"
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+"""
+This script tests the ArrayNoise modifier, on the ranges of a laser scanner
+"""
+
+from morse.testing.testing import MorseTestCase
+
+try:
+    # Include this import to be able to use your test file as a regular
+    # builder script, ie, usable with: 'morse [run|exec] <your test>.py
+    from morse.builder import *
+except ImportError:
+    pass
+
+import math
+from pymorse import Morse
+
+
+class ArrayNoiseTest(MorseTestCase):
+
+    def setUpEnv(self):
+
+        robot = ATRV()
+        robot.rotate(z = math.pi)
+        robot.translate(x = -4.5)
+
+        for name, batch in [('sick', False), ('sick_batch', True)]:
+            sick = Sick(name)
+            sick.translate(z=0.9)
+            sick.properties(laser_range = 10.0, Visible_arc = False,
+                            batch_scan = batch)
+            sick.create_laser_arc()
+            robot.append(sick)
+
+            sick_noised = Sick(name + '_noised')
+            sick_noised.translate(z=0.9)
+            sick_noised.properties(laser_range = 10.0, Visible_arc = False,
+                                   batch_scan = batch)
+            sick_noised.create_laser_arc()
+            sick_noised.alter('Noise', std = 0.1)
+            robot.append(sick_noised)
+
+        robot.add_default_interface('socket')
+        env = Environment('indoors-1/boxes', fastmode = True)
+        env.add_interface('socket')
+        env.set_noise_seed(42)
+
+    def test_noised_ranges(self):
+        """ Test if all the ranges are noised """
+        with Morse() as morse:
+            for name in ['sick', 'sick_batch']:
+                d = getattr(morse.robot, name).get()
+                dn = getattr(morse.robot, name + '_noised').get()
+                errors = [n - r for r, n in zip(d['range_list'], dn['range_list'])]
+                self.assertEqual(len(errors), len(d['range_list']))
+                for error in errors:
+                    self.assertNotAlmostEqual(error, 0.0, delta=1e-6)
+                self.assertAlmostEqual(sum(errors) / len(errors), 0.0, delta=0.05)
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(ArrayNoiseTest)
@@ -0,0 +1,72 @@
+#! /usr/bin/env python
+"""
+This script tests the profiler of the simulation loop.
+"""
+
+import os
+import json
+import tempfile
+from morse.testing.testing import MorseTestCase
+from pymorse import Morse
+
+# Include this import to be able to use your test file as a regular
+# builder script, ie, usable with: 'morse [run|exec] base_testing.py
+try:
+    from morse.builder import *
+except ImportError:
+    pass
+
+TRACE_FILE = os.path.join(tempfile.gettempdir(), 'morse_profiler_testing.json')
+
+class ProfilerTest(MorseTestCase):
+    def setUpEnv(self):
+        robot = ATRV()
+
+        pose = Pose()
+        robot.append(pose)
+        pose.add_stream('socket')
+
+        motion = MotionVW()
+        robot.append(motion)
+        motion.add_stream('socket')
+
+        env = Environment('empty', fastmode = True)
+        env.add_service('socket')
+        env.enable_profiler(trace_file = TRACE_FILE)
+
+    def _check_phase(self, stats):
+        self.assertTrue(stats['count'] > 0)
+        self.assertTrue(stats['p50'] <= stats['p95'] <= stats['p99'] <= stats['max'])
+
+    def test_profiler(self):
+        with Morse() as morse:
+            morse.sleep(1.0)
+            profile = morse.rpc('simulation', 'get_profile')
+
+            for phase in ['tick', 'stream_managers', 'time', 'services']:
+                self._check_phase(profile['simulation'][phase])
+            for phase in ['action', 'modifiers', 'datastreams']:
+                self._check_phase(profile['robot.pose'][phase])
+                self._check_phase(profile['robot.motion'][phase])
+            self._check_phase(profile['robot']['action'])
+
+            morse.rpc('simulation', 'reset_profiler')
+            morse.rpc('simulation', 'disable_profiler')
+            morse.sleep(0.5)
+            self.assertEqual(morse.rpc('simulation', 'get_profile'), {})
+
+            morse.rpc('simulation', 'enable_profiler', True)
+            morse.sleep(0.5)
+            path = morse.rpc('simulation', 'dump_profile', TRACE_FILE)
+
+        with open(path) as f:
+            trace = json.load(f)
+        names = set(event['name'] for event in trace['traceEvents'])
+        self.assertTrue('robot.pose.action' in names)
+        self.assertTrue('simulation.stream_managers' in names)
+        self.assertTrue(all(event['dur'] >= 0 for event in trace['traceEvents']))
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(ProfilerTest)
@@ -30,6 +30,14 @@ class Sick_Test(MorseTestCase):
         robot.append(sick)
         sick.add_stream('socket')
 
+        sick_batch = Sick('SickBatch')
+        sick_batch.translate(z=0.9)
+        sick_batch.properties(laser_range = 10.0, Visible_arc = False,
+                              batch_scan = True)
+        sick_batch.create_laser_arc()
+        robot.append(sick_batch)
+        sick_batch.add_stream('socket')
+
         env = Environment('indoors-1/boxes', fastmode = True)
         env.add_service('socket')
 
@@ -101,6 +109,25 @@ class Sick_Test(MorseTestCase):
                 length = sick['range_list'][index]
                 self.assertAlmostEqual(length, 5.8, delta=0.15)
 
+    def test_sick_batch(self):
+        """ The batch scan mode must give the same results than the
+        per-ray one.
+        """
+        with Morse() as morse:
+            sick = morse.robot.Sick.get()
+            sick_batch = morse.robot.SickBatch.get()
+
+            self.assertEqual(len(sick['range_list']),
+                             len(sick_batch['range_list']))
+            for index in range(len(sick['range_list'])):
+                self.assertAlmostEqual(sick['range_list'][index],
+                                       sick_batch['range_list'][index],
+                                       delta=0.01)
+                for i in range(3):
+                    self.assertAlmostEqual(sick['point_list'][index][i],
+                                           sick_batch['point_list'][index][i],
+                                           delta=0.01)
+
 
 
 ########################## Run these tests ##########################
@@ -0,0 +1,86 @@
+#! /usr/bin/env python
+"""
+This script tests the batch requests and the pipelining of requests on the
+socket service interface.
+"""
+
+import socket
+import json
+from morse.testing.testing import MorseTestCase
+from pymorse import Morse, MorseServiceFailed
+
+# Include this import to be able to use your test file as a regular
+# builder script, ie, usable with: 'morse [run|exec] base_testing.py
+try:
+    from morse.builder import *
+except ImportError:
+    pass
+
+class SocketBatchTest(MorseTestCase):
+    def setUpEnv(self):
+        robot = ATRV()
+        robot.translate(x = 1.0, y = 2.0)
+
+        pose = Pose()
+        robot.append(pose)
+        pose.add_stream('socket')
+
+        env = Environment('empty', fastmode = True)
+        env.add_service('socket')
+
+    def test_rpc_batch(self):
+        with Morse() as morse:
+            robots, pose, now = morse.rpc_batch([
+                                    ('simulation', 'list_robots'),
+                                    ('robot.pose', 'get_local_data'),
+                                    ('time', 'now')])
+            self.assertEqual(robots, ['robot'])
+            self.assertAlmostEqual(pose['x'], 1.0, delta = 0.01)
+            self.assertAlmostEqual(pose['y'], 2.0, delta = 0.01)
+            self.assertTrue(now > 0.0)
+
+            # an asynchronous service in the batch
+            results = morse.rpc_batch([('time', 'sleep', 0.5),
+                                       ('simulation', 'list_robots')])
+            self.assertEqual(results, [None, ['robot']])
+
+            with self.assertRaises(MorseServiceFailed):
+                morse.rpc_batch([('simulation', 'list_robots'),
+                                 ('simulation', 'no_such_service')])
+
+            results = morse.rpc_batch([('simulation', 'no_such_service'),
+                                       ('simulation', 'list_robots')],
+                                      return_exceptions = True)
+            self.assertTrue(isinstance(results[0], MorseServiceFailed))
+            self.assertEqual(results[1], ['robot'])
+
+            self.assertEqual(morse.rpc_batch([]), [])
+
+    def test_pipelining(self):
+        nb_requests = 200
+        with Morse():
+            sock = socket.create_connection(('localhost', 4000))
+            # many requests, and a large one, sent in one write
+            requests = ''.join('%d simulation list_robots\n' % i
+                               for i in range(nb_requests))
+            requests += 'big simulation list_robots [%s]\n' % ('0, ' * 100000 + '0')
+            sock.sendall(requests.encode())
+
+            answers = b''
+            while answers.count(b'\n') < nb_requests + 1:
+                answers += sock.recv(4096)
+            sock.close()
+
+            lines = answers.decode().split('\n')
+            for i in range(nb_requests):
+                id, status, result = lines[i].split(' ', 2)
+                self.assertEqual(id, str(i))
+                self.assertEqual(status, 'SUCCESS')
+                self.assertEqual(json.loads(result), ['robot'])
+            # wrong number of parameters
+            self.assertTrue(lines[nb_requests].startswith('big FAILED'))
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(SocketBatchTest)
@@ -0,0 +1,96 @@
+#! /usr/bin/env python
+"""
+This script tests the lockstep mode of the socket datastream manager.
+"""
+
+from morse.testing.testing import MorseTestCase
+
+try:
+    # Include this import to be able to use your test file as a regular
+    # builder script, ie, usable with: 'morse [run|exec] <your test>.py
+    from morse.builder import *
+except ImportError:
+    pass
+
+import time
+import socket
+from pymorse import Morse
+
+SYNC_PORT = 5001
+
+def read_replies(clients):
+    return [client.makefile().readline().split() for client in clients]
+
+def step(clients):
+    for client in clients:
+        client.sendall(b'step\n')
+    return read_replies(clients)
+
+
+class SocketLockstepTest(MorseTestCase):
+
+    def setUpEnv(self):
+        bpymorse.set_speed(fps=10)
+
+        robot = Morsy()
+
+        clock = Clock()
+        clock.add_stream('socket')
+        robot.append(clock)
+
+        env = Environment('empty')
+        env.configure_stream_manager('socket', time_sync = True,
+                                     sync_port = SYNC_PORT, lockstep = True,
+                                     sync_clients = 2, lockstep_ticks = 3)
+
+    def test_lockstep(self):
+        with Morse() as morse:
+            clock_stream = morse.robot.clock
+
+            first = socket.create_connection(('localhost', SYNC_PORT))
+            second = socket.create_connection(('localhost', SYNC_PORT))
+            try:
+                time.sleep(0.2)
+                prev_clock = clock_stream.last()
+                time.sleep(0.2)
+                self.assertEqual(clock_stream.last()['timestamp'],
+                                 prev_clock['timestamp'])
+
+                # Only one client acknowledged: still blocked
+                first.sendall(b'step\n')
+                time.sleep(0.2)
+                self.assertEqual(clock_stream.last()['timestamp'],
+                                 prev_clock['timestamp'])
+
+                second.sendall(b'step\n')
+                replies = read_replies([first, second])
+                self.assertEqual(replies[0], replies[1])
+
+                start = float(replies[0][1])
+                for i in range(10):
+                    replies = step([first, second])
+                    self.assertEqual(replies[0], replies[1])
+                now = float(replies[0][1])
+                # 10 steps of 3 ticks of 0.1 s
+                self.assertAlmostEqual(now - start, 3.0, delta = 0.001)
+            finally:
+                first.close()
+                second.close()
+
+            # Once the clients are disconnected, the simulation is free
+            time.sleep(0.2)
+            prev_clock = clock_stream.last()
+            time.sleep(0.2)
+            self.assertGreater(clock_stream.last()['timestamp'],
+                               prev_clock['timestamp'])
+
+            stats = morse.rpc('time', 'statistics')
+            self.assertEqual(stats['lockstep_clients'], 0)
+            self.assertEqual(stats['lockstep_steps'], 11)
+            self.assertGreaterEqual(stats['max_step_latency'],
+                                    stats['mean_step_latency'])
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(SocketLockstepTest, time_modes = [TimeStrategies.FixedSimulationStep])
@@ -0,0 +1,82 @@
+#! /usr/bin/env python
+"""
+This script tests the max_rate and skip_unchanged options of the socket
+publishers.
+"""
+
+from morse.testing.testing import MorseTestCase
+from pymorse import Morse
+
+# Include this import to be able to use your test file as a regular
+# builder script, ie, usable with: 'morse [run|exec] base_testing.py
+try:
+    from morse.builder import *
+except ImportError:
+    pass
+
+class SocketPublisherTest(MorseTestCase):
+    def setUpEnv(self):
+        robot = ATRV()
+
+        pose = Pose('pose')
+        pose.frequency(60)
+        robot.append(pose)
+        pose.add_stream('socket')
+
+        slow_pose = Pose('slow_pose')
+        slow_pose.frequency(60)
+        robot.append(slow_pose)
+        slow_pose.add_stream('socket', max_rate = 10.0)
+
+        static_pose = Pose('static_pose')
+        static_pose.frequency(60)
+        robot.append(static_pose)
+        static_pose.add_stream('socket', skip_unchanged = True)
+
+        motion = Teleport('motion')
+        robot.append(motion)
+        motion.add_stream('socket')
+
+        env = Environment('empty', fastmode = True)
+        env.add_service('socket')
+
+    def _count(self, morse, stream, duration):
+        messages = []
+        callback = messages.append
+        stream.subscribe(callback)
+        morse.sleep(duration)
+        stream.unsubscribe(callback)
+        return messages
+
+    def test_max_rate(self):
+        with Morse() as morse:
+            # the first subscription may miss the first messages
+            morse.sleep(0.5)
+            messages = self._count(morse, morse.robot.slow_pose, 2.0)
+            self.assertAlmostEqual(len(messages), 20, delta = 2)
+            for previous, current in zip(messages, messages[1:]):
+                self.assertAlmostEqual(current['timestamp'] - previous['timestamp'],
+                                       0.1, delta = 0.02)
+
+    def test_skip_unchanged(self):
+        with Morse() as morse:
+            # a new client receives the last message, even if unchanged
+            pose = morse.robot.static_pose.get()
+            self.assertAlmostEqual(pose['x'], 0.0, delta = 0.01)
+
+            # let the robot settle on the ground, then the pose does not
+            # change anymore (the pose stream would send 60 messages)
+            morse.sleep(1.0)
+            messages = self._count(morse, morse.robot.static_pose, 1.0)
+            self.assertTrue(len(messages) < 5)
+
+            morse.robot.motion.publish({'x': 2.0, 'y': 0.0, 'z': 0.0,
+                                        'yaw': 0.0, 'pitch': 0.0, 'roll': 0.0})
+            messages = self._count(morse, morse.robot.static_pose, 0.5)
+            self.assertTrue(len(messages) >= 1)
+            self.assertAlmostEqual(messages[-1]['x'], 2.0, delta = 0.01)
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(SocketPublisherTest)
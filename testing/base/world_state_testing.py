@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+"""
+This script tests the export of the state of all the robots, through the
+simulation.get_all_poses service and the world_state stream.
+"""
+
+import struct
+from morse.testing.testing import MorseTestCase
+from pymorse import Morse
+from pymorse.stream import ENCODING_STATE64F
+
+# Include this import to be able to use your test file as a regular
+# builder script, ie, usable with: 'morse [run|exec] base_testing.py
+try:
+    from morse.builder import *
+except ImportError:
+    pass
+
+NB_ROBOTS = 5
+
+class WorldStateTest(MorseTestCase):
+    def setUpEnv(self):
+        for i in range(NB_ROBOTS):
+            robot = ATRV('robot%d' % i)
+            robot.translate(x = 2.0 * i, y = 1.0)
+            robot.rotate(z = 0.1 * i)
+
+            pose = Pose()
+            robot.append(pose)
+            pose.add_stream('socket')
+
+        env = Environment('empty', fastmode = True)
+        env.add_service('socket')
+        env.configure_stream_manager('socket', world_state = True)
+
+    def test_world_state(self):
+        with Morse() as morse:
+            poses = morse.get_all_poses()
+            self.assertEqual(poses['robots'],
+                             ['robot%d' % i for i in range(NB_ROBOTS)])
+            self.assertEqual(len(poses['fields']), 12)
+            for i, state in enumerate(poses['states']):
+                self.assertEqual(len(state), 12)
+                self.assertAlmostEqual(state[0], 2.0 * i, delta = 0.01)
+                self.assertAlmostEqual(state[1], 1.0, delta = 0.01)
+                self.assertAlmostEqual(state[3], 0.1 * i, delta = 0.01)
+
+            frame = morse.world_state.get()
+            self.assertEqual(frame.encoding, ENCODING_STATE64F)
+            self.assertEqual(frame.width, 12)
+            self.assertEqual(frame.height, NB_ROBOTS)
+            values = struct.unpack('<%dd' % (12 * NB_ROBOTS), frame.data)
+            for i in range(NB_ROBOTS):
+                self.assertAlmostEqual(values[12 * i], 2.0 * i, delta = 0.01)
+                self.assertAlmostEqual(values[12 * i + 1], 1.0, delta = 0.01)
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(WorldStateTest)
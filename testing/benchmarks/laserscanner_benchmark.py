@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+"""
+This script compares the cost of the per-ray and of the batch scan
+modes of the laser scanner.
+
+The scene contains several Hokuyo (1080 rays) in each mode. Only one set
+of scanners is active at a time, and we measure the real time needed to
+simulate a fixed amount of simulated time.
+"""
+
+import time
+from morse.testing.testing import MorseTestCase
+from morse.core.morse_time import TimeStrategies
+from pymorse import Morse
+
+# Include this import to be able to use your test file as a regular
+# builder script, ie, usable with: 'morse [run|exec] base_testing.py
+try:
+    from morse.builder import *
+except ImportError:
+    pass
+
+NB_SCANNERS = 4
+SIMULATED_TIME = 5.0
+
+class LaserScannerBenchmark(MorseTestCase):
+    def setUpEnv(self):
+        robot = ATRV()
+
+        for i in range(NB_SCANNERS):
+            for mode in ['PerRay', 'Batch']:
+                hokuyo = Hokuyo('%s%d' % (mode, i))
+                hokuyo.translate(z = 0.9)
+                hokuyo.properties(laser_range = 30.0, Visible_arc = False,
+                                  batch_scan = (mode == 'Batch'))
+                hokuyo.create_laser_arc()
+                robot.append(hokuyo)
+
+        env = Environment('indoors-1/indoor-1', fastmode = True)
+        env.add_service('socket')
+
+    def _measure(self, morse, active, inactive):
+        for i in range(NB_SCANNERS):
+            morse.deactivate('robot.%s%d' % (inactive, i))
+            morse.activate('robot.%s%d' % (active, i))
+
+        start = time.time()
+        morse.sleep(SIMULATED_TIME)
+        return time.time() - start
+
+    def test_benchmark(self):
+        with Morse() as morse:
+            # warm up
+            morse.sleep(1.0)
+
+            per_ray = self._measure(morse, 'PerRay', 'Batch')
+            batch = self._measure(morse, 'Batch', 'PerRay')
+
+            print("%d x Hokuyo, %.1f simulated seconds" %
+                  (NB_SCANNERS, SIMULATED_TIME))
+            print("per-ray: %.3f s" % per_ray)
+            print("batch:   %.3f s (speedup x%.2f)" % (batch, per_ray / batch))
+
+########################## Run these tests ##########################
+if __name__ == "__main__":
+    from morse.testing.testing import main
+    main(LaserScannerBenchmark,
+         time_modes = [TimeStrategies.FixedSimulationStep])
@@ -0,0 +1,110 @@
+#! /usr/bin/env python
+"""
+This script compares the cost of looking for tagged objects by walking
+the whole scene, as the components used to do at each step, with the cost
+of querying the object registry and the spatial index.
+
+It does not need Blender: the scene is made of 10k stand-in objects
+exposing the subset of the KX_GameObject API used by the registry.
+"""
+
+import math
+import random
+import timeit
+
+from morse.core.object_registry import ObjectRegistry
+from morse.core.spatial_index import SpatialGrid
+
+NB_OBJECTS = 10000
+NB_TAGGED = 100
+WORLD_SIZE = 500.0
+RANGE = 20.0
+
+class FakeObject(object):
+    invalid = False
+
+    def __init__(self, name, properties, position):
+        self.name = name
+        self._properties = properties
+        self.worldPosition = position
+
+    def __contains__(self, key):
+        return key in self._properties
+
+    def __getitem__(self, key):
+        return self._properties[key]
+
+    def get(self, key, default = None):
+        return self._properties.get(key, default)
+
+    def getPropertyNames(self):
+        return list(self._properties.keys())
+
+class FakeScene(object):
+    def __init__(self, objects):
+        self.objects = objects
+
+def make_scene():
+    random.seed(42)
+    objects = []
+    for i in range(NB_OBJECTS):
+        properties = {'Type': random.choice(['Box', 'Shelf', 'Pallet'])}
+        if i % (NB_OBJECTS // NB_TAGGED) == 0:
+            properties['Robot_Tag'] = True
+        position = [random.uniform(0, WORLD_SIZE),
+                    random.uniform(0, WORLD_SIZE), 0.0]
+        objects.append(FakeObject('obj%d' % i, properties, position))
+    return FakeScene(objects)
+
+def scan(scene, center):
+    """ The former Proximity implementation """
+    res = {}
+    for obj in scene.objects:
+        try:
+            obj['Robot_Tag']
+            distance = math.sqrt(sum((obj.worldPosition[i] - center[i]) ** 2
+                                     for i in range(3)))
+            if distance <= RANGE:
+                res[obj.name] = distance
+        except KeyError:
+            pass
+    return res
+
+def main():
+    scene = make_scene()
+    center = [WORLD_SIZE / 2, WORLD_SIZE / 2, 0.0]
+
+    registry = None
+    def build():
+        nonlocal registry
+        registry = ObjectRegistry(scene)
+    build_time = timeit.timeit(build, number = 10) / 10
+
+    grid = SpatialGrid()
+    for obj in registry.with_property('Robot_Tag'):
+        grid.insert(obj)
+
+    def lookup():
+        return {obj.name: d for obj, d in grid.query_radius(center, RANGE)}
+
+    assert scan(scene, center) == lookup()
+
+    number = 100
+    scan_time = timeit.timeit(lambda: scan(scene, center), number = number)
+    property_time = timeit.timeit(lambda: list(registry.with_property('Robot_Tag')),
+                                  number = number)
+    type_time = timeit.timeit(lambda: list(registry.of_type('Shelf')),
+                              number = number)
+    grid_time = timeit.timeit(lookup, number = number)
+    update_time = timeit.timeit(grid.update, number = number)
+
+    print("%d objects, %d tagged" % (NB_OBJECTS, NB_TAGGED))
+    print("registry creation:        %8.3f ms" % (1000 * build_time))
+    print("scene scan (per step):    %8.3f ms" % (1000 * scan_time / number))
+    print("with_property (per step): %8.3f ms" % (1000 * property_time / number))
+    print("of_type (per step):       %8.3f ms" % (1000 * type_time / number))
+    print("grid radius query:        %8.3f ms" % (1000 * grid_time / number))
+    print("grid update:              %8.3f ms" % (1000 * update_time / number))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#! /usr/bin/env python
+"""
+This script measures the number of scans per second which can be packed
+as PointCloud2 data, with the former implementation (struct.pack of the
+flattened point list) and with the bulk NumPy packing, for:
+
+- a Hokuyo (1080 points)
+- a SickLDMRS (4 layers of 400 points, with the ring index)
+- a 32 layers scanner (32 layers of 1800 points, with intensity and ring)
+
+The points are given either as lists of [x, y, z] (per-ray scan mode), or
+as contiguous float32 arrays (batch scan mode).
+
+It does not need Blender, but needs the ROS Python packages.
+"""
+
+import struct
+import itertools
+import timeit
+import numpy
+
+from morse.middleware.ros.laserscanner import cloud_dtype, pack_cloud
+
+SCANNERS = [('Hokuyo', 1, 1080), ('SickLDMRS', 4, 400), ('32 layers', 32, 1800)]
+
+def legacy_pack(points):
+    flatten = itertools.chain.from_iterable(points)
+    return struct.pack('%if'%len(points)*3, *flatten)
+
+def scans_per_second(function, duration = 1.0):
+    number = 1
+    while True:
+        elapsed = timeit.timeit(function, number = number)
+        if elapsed > duration / 10:
+            return number / elapsed
+        number *= 10
+
+def main():
+    numpy.random.seed(42)
+    print("%-10s %7s %12s %12s %12s %12s" % ("scanner", "points", "legacy",
+          "list", "array", "all fields"))
+    for name, layers, per_layer in SCANNERS:
+        size = layers * per_layer
+        array = numpy.random.uniform(-30, 30, (size, 3)).astype(numpy.float32)
+        points = array.tolist()
+        intensity = numpy.random.uniform(0, 1, size).astype(numpy.float32)
+        ring = (numpy.arange(size) * layers // size).astype('<u2')
+
+        xyz = cloud_dtype()
+        full = cloud_dtype(intensity = True, ring = layers > 1)
+
+        assert legacy_pack(points) == pack_cloud(xyz, points)
+
+        legacy = scans_per_second(lambda: legacy_pack(points))
+        from_list = scans_per_second(lambda: pack_cloud(xyz, points))
+        from_array = scans_per_second(lambda: pack_cloud(xyz, array))
+        all_fields = scans_per_second(lambda: pack_cloud(full, array,
+                                          intensity, ring if layers > 1 else None))
+
+        print("%-10s %7d %12.0f %12.0f %12.0f %12.0f" % (name, size, legacy,
+              from_list, from_array, all_fields))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#! /usr/bin/env python
+"""
+This script measures the cost of routing the responses of the simulator
+to 1, 100 and 10k outstanding pymorse requests (as when starting a goto
+service on each robot of a large fleet):
+
+- *routing*: the cost of routing one response, with the single response
+  dispatcher of pymorse (:py:class:`pymorse.pymorse.ResponseDispatcher`),
+  and with the former implementation, where each response was parsed by
+  the callback of each pending request until one matched its id
+- *round-trip*: the time needed to send N asynchronous requests through
+  :py:class:`pymorse.Morse` to a local server, which answers them once it
+  received all of them, and to receive all the results
+
+It does not need Blender.
+"""
+
+import json
+import time
+import socket
+import threading
+
+from pymorse import Morse
+from pymorse.pymorse import ResponseDispatcher, parse_response
+
+OUTSTANDING = [1, 100, 10000]
+ROUTED = 100
+PORT = 61200
+
+class FakeStream(object):
+    def subscribe(self, callback):
+        pass
+
+    def unsubscribe(self, callback):
+        pass
+
+def response(req_id):
+    return '%d SUCCESS {"status": "Arrived"}' % req_id
+
+def dispatcher_routing(outstanding):
+    """ Return the cost, in microseconds, of routing a response """
+    dispatcher = ResponseDispatcher(FakeStream())
+    responses = [response(req_id) for req_id in range(outstanding)]
+    rounds = max(1, max(OUTSTANDING) // outstanding)
+    duration = 0.0
+    for i in range(rounds):
+        for req_id in range(outstanding):
+            dispatcher.register(str(req_id))
+        start = time.perf_counter()
+        for raw in responses:
+            dispatcher.dispatch(raw)
+        duration += time.perf_counter() - start
+    return 1e6 * duration / (rounds * outstanding)
+
+def legacy_routing(outstanding):
+    """ Return the cost, in microseconds, of routing a response when each
+    pending request parses it """
+    pending = [str(req_id) for req_id in range(outstanding)]
+    def route(raw):
+        for req_id in list(pending):
+            if parse_response(raw)['id'] == req_id:
+                pending.remove(req_id)
+    # the requests are answered in random order: in average, a response
+    # is parsed by half of the pending requests
+    count = min(ROUTED, outstanding)
+    responses = [response(req_id) for req_id in
+                 range(outstanding // 2, outstanding // 2 + count)]
+    start = time.perf_counter()
+    for raw in responses:
+        route(raw)
+    return 1e6 * (time.perf_counter() - start) / count
+
+class Server(threading.Thread):
+    """ Answer the requests of a pymorse client: the scene description at
+    once, the other requests by batches of self.batch requests """
+    def __init__(self, port):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.batch = 1
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(('localhost', port))
+        self.server.listen(1)
+        self.start()
+
+    def run(self):
+        client, _ = self.server.accept()
+        stream = client.makefile('rb')
+        waiting = []
+        for line in stream:
+            req_id, component, service, _ = line.decode().split(' ', 3)
+            if service == 'details':
+                client.sendall(('%s SUCCESS %s\n' % (req_id,
+                                json.dumps({'robots': []}))).encode())
+            elif component == 'simulation':
+                client.sendall(('%s FAILED "unknown stream"\n' % req_id).encode())
+            else:
+                waiting.append(int(req_id))
+                if len(waiting) == self.batch:
+                    client.sendall(''.join(response(i) + '\n' for i in
+                                           reversed(waiting)).encode())
+                    waiting = []
+
+def round_trip(morse, server, outstanding):
+    """ Return the time, in milliseconds, to get the results of
+    outstanding asynchronous requests """
+    server.batch = outstanding
+    start = time.perf_counter()
+    futures = [morse._rpc_future(morse._rpc_request('robot.motion', 'goto', i, 0, 0))
+               for i in range(outstanding)]
+    for future in futures:
+        future.result()
+    return 1e3 * (time.perf_counter() - start)
+
+def main():
+    print("Routing of a response (us):")
+    print("  %-12s %12s %12s" % ('outstanding', 'dispatcher', 'legacy'))
+    for outstanding in OUTSTANDING:
+        print("  %-12d %12.2f %12.2f" % (outstanding,
+              dispatcher_routing(outstanding), legacy_routing(outstanding)))
+
+    server = Server(PORT)
+    with Morse(port = PORT) as morse:
+        print("Round-trip of N asynchronous requests (ms):")
+        for outstanding in OUTSTANDING:
+            print("  %-12d %12.2f" % (outstanding,
+                  round_trip(morse, server, outstanding)))
+
+if __name__ == "__main__":
+    main()
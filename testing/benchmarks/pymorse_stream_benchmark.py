@@ -0,0 +1,112 @@
+#! /usr/bin/env python
+"""
+This script measures the number of 640x480 RGBA images per second which
+can be received by the pymorse streams:
+
+- as JSON, the image being base64-encoded (as published by the default
+  socket camera publishers), with StreamJSON and AsyncStreamJSON
+- as binary frames (as published by the binary camera publishers), with
+  StreamFrame and AsyncStreamFrame
+
+A local server sends the same image in loop, as fast as possible.
+
+It does not need Blender.
+"""
+
+import time
+import json
+import base64
+import socket
+import asyncio
+import asyncore
+import threading
+
+from pymorse.stream import StreamJSON, StreamFrame, PollThread, \
+                           FRAME_HEADER, ENCODING_RGBA8
+from pymorse.aio import AsyncStreamJSON, AsyncStreamFrame
+
+WIDTH = 640
+HEIGHT = 480
+DURATION = 3.0
+PORT = 61100
+
+def json_message(image):
+    return (json.dumps({'timestamp': 0.0, 'width': WIDTH, 'height': HEIGHT,
+                        'image': base64.b64encode(image).decode()}) +
+            '\n').encode()
+
+def frame_message(image):
+    return FRAME_HEADER.pack(0.0, WIDTH, HEIGHT, ENCODING_RGBA8,
+                             len(image)) + image
+
+class Server(threading.Thread):
+    """ Send message in loop to the first client """
+    def __init__(self, port, message):
+        threading.Thread.__init__(self)
+        self.message = message
+        self.running = True
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(('localhost', port))
+        self.server.listen(1)
+        self.start()
+
+    def run(self):
+        client, _ = self.server.accept()
+        try:
+            while self.running:
+                client.sendall(self.message)
+        except socket.error:
+            pass
+        client.close()
+        self.server.close()
+
+    def stop(self):
+        self.running = False
+        self.join()
+
+def sync_benchmark(stream_class, port):
+    """ Count the messages received by the stream during DURATION """
+    stream = stream_class('localhost', port)
+    count = [0]
+    def on_message(msg):
+        count[0] += 1
+    stream.subscribe(on_message)
+    poll_thread = PollThread()
+    poll_thread.start()
+    time.sleep(DURATION)
+    res = count[0]
+    poll_thread.syncstop()
+    asyncore.close_all()
+    return res / DURATION
+
+def async_benchmark(stream_class, port):
+    async def run():
+        stream = await stream_class.open('localhost', port)
+        count = [0]
+        def on_message(msg):
+            count[0] += 1
+        stream.subscribe(on_message)
+        await asyncio.sleep(DURATION)
+        stream.close()
+        return count[0]
+    return asyncio.run(run()) / DURATION
+
+def main():
+    image = bytes(range(256)) * (WIDTH * HEIGHT * 4 // 256)
+    benchmarks = [
+        ('StreamJSON (base64)', json_message(image), sync_benchmark, StreamJSON),
+        ('AsyncStreamJSON (base64)', json_message(image), async_benchmark, AsyncStreamJSON),
+        ('StreamFrame', frame_message(image), sync_benchmark, StreamFrame),
+        ('AsyncStreamFrame', frame_message(image), async_benchmark, AsyncStreamFrame),
+    ]
+    print("%dx%d RGBA images (%.1f MB)" % (WIDTH, HEIGHT, len(image) / 1e6))
+    for i, (name, message, benchmark, stream_class) in enumerate(benchmarks):
+        server = Server(PORT + i, message)
+        rate = benchmark(stream_class, PORT + i)
+        server.stop()
+        print("  %-26s %8.1f images/s %8.1f MB/s" % (name, rate,
+              rate * len(image) / 1e6))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#! /usr/bin/env python
+"""
+This script tests the snapshots of local_data sent to the threaded
+datastreams, without the simulator.
+"""
+
+import threading
+import unittest
+
+from morse.core.datastream import snapshot, DatastreamWorkerPool
+from morse.middleware import AbstractDatastream
+from morse.testing.fake_objects import FakeComponent
+
+class RecordingDatastream(AbstractDatastream):
+    """ Record the image of each frame, once the game thread let it go """
+    def initialize(self):
+        self.images = []
+        self.go = threading.Event()
+
+    def default(self, ci='unused'):
+        self.go.wait(1.0)
+        self.images.append(bytes(self.data['image']))
+
+class SnapshotTest(unittest.TestCase):
+
+    def test_copies(self):
+        image = bytearray(b'\x01' * 16)
+        points = memoryview(bytearray(b'\x02' * 12))
+        data = {'timestamp': 1.0, 'image': memoryview(image),
+                'points': points, 'list': [1, 2], 'name': 'camera',
+                'raw': b'\x03' * 4}
+        snap = snapshot(data)
+
+        # the game thread overwrites the buffers of the sensor
+        image[:] = b'\x00' * 16
+        points[:] = b'\x00' * 12
+        data['list'].append(3)
+
+        self.assertEqual(snap['image'], b'\x01' * 16)
+        self.assertEqual(snap['points'], b'\x02' * 12)
+        self.assertEqual(snap['list'], [1, 2])
+        self.assertEqual(snap['timestamp'], 1.0)
+        # immutable values are shared
+        self.assertIs(snap['name'], data['name'])
+        self.assertIs(snap['raw'], data['raw'])
+
+    def test_worker(self):
+        image = bytearray(b'\x01' * 16)
+        component = FakeComponent('camera', {'image': memoryview(image)})
+        datastream = RecordingDatastream(component, {})
+        pool = DatastreamWorkerPool(1)
+        try:
+            pool.submit(datastream, snapshot(component.local_data))
+            image[:] = b'\x00' * 16
+            datastream.go.set()
+        finally:
+            pool.finalize()
+        self.assertEqual(datastream.images, [b'\x01' * 16])
+
+if __name__ == "__main__":
+    unittest.main()
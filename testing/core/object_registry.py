@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+"""
+This script tests the detection of the objects added to or removed from the
+scene by the object registry, without the simulator: the scene is made of
+stand-in objects exposing the subset of the KX_GameObject API used by the
+registry.
+"""
+
+import unittest
+
+from morse.core.object_registry import ObjectRegistry
+from morse.testing.fake_objects import FakeObject, FakeScene
+
+class ObjectRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.robot = FakeObject('robot', {'Robot_Tag': True})
+        self.box = FakeObject('box', {'Type': 'Box'})
+        self.ground = FakeObject('ground', {})
+        self.scene = FakeScene(objects = [self.robot, self.box, self.ground])
+        self.registry = ObjectRegistry(self.scene)
+        self.changes = []
+        self.registry.subscribe(lambda added, removed:
+                                self.changes.append((added, removed)))
+
+    def test_unchanged(self):
+        self.registry.update()
+        self.assertEqual(self.changes, [])
+        self.assertEqual(list(self.registry.of_type('Box')), [self.box])
+
+    def test_add_remove(self):
+        bottle = FakeObject('bottle', {'Type': 'Bottle'})
+        self.scene.add(bottle)
+        self.registry.update()
+        self.assertEqual(self.changes, [([bottle], [])])
+
+        self.scene.remove(bottle)
+        self.registry.update()
+        self.assertEqual(self.changes[-1], ([], [bottle]))
+        self.assertNotIn(bottle, self.registry)
+
+    def test_add_and_remove_same_step(self):
+        # same number of objects after the step
+        bottle = FakeObject('bottle', {'Type': 'Bottle'})
+        self.scene.remove(self.box)
+        self.scene.add(bottle)
+        self.registry.update()
+        self.assertEqual(self.changes, [([bottle], [self.box])])
+        self.assertEqual(list(self.registry.of_type('Box')), [])
+        self.assertEqual(list(self.registry.of_type('Bottle')), [bottle])
+
+        # the last object is replaced
+        cup = FakeObject('cup', {'Type': 'Cup'})
+        self.scene.remove(bottle)
+        self.scene.add(cup)
+        self.registry.update()
+        self.assertEqual(self.changes[-1], ([cup], [bottle]))
+        self.assertIs(self.registry.get('cup'), cup)
+        self.assertIsNone(self.registry.get('bottle'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+"""
+This script tests the synchronisation of the camera scenes with the logic
+scene, without the simulator: the scenes are made of stand-in objects
+exposing the subset of the KX_GameObject API used by the synchronisation.
+"""
+
+import unittest
+
+from morse.core import blenderapi, scene_sync
+from morse.core.scene_sync import SceneSync
+from morse.helpers.transformation import set_world_pose, forget_world_pose
+from morse.testing.fake_objects import FakeObject, FakeScene
+
+def make_scene(name):
+    return FakeScene(name, [FakeObject('robot', {'Robot_Tag': True},
+                                       physics_type = 'RIGID_BODY'),
+                            FakeObject('table'),
+                            FakeObject('wall')])
+
+class SceneSyncTest(unittest.TestCase):
+
+    def setUp(self):
+        # The physics type is read from the Blender data, not available here
+        self._physics_type = scene_sync.physics_type
+        scene_sync.physics_type = lambda obj: obj.physics_type
+        self.storage = {}
+        self._persistantstorage = blenderapi.persistantstorage
+        blenderapi.persistantstorage = lambda: self.storage
+
+        self.logic = make_scene('S.MORSE_LOGIC')
+        self.overlay = make_scene('S.256x256')
+        self.sync = SceneSync(self.overlay, self.logic)
+        self.storage['scene_syncs'] = {'S.256x256': self.sync}
+
+    def tearDown(self):
+        scene_sync.physics_type = self._physics_type
+        blenderapi.persistantstorage = self._persistantstorage
+
+    def test_static(self):
+        self.assertEqual(len(self.sync), 1)
+        self.assertEqual(self.sync.nb_static, 2)
+
+        self.logic.objects['robot'].worldPosition = (1.0, 0.0, 0.0)
+        self.assertEqual(self.sync.copy(), 1)
+        self.assertEqual(self.overlay.objects['robot'].worldPosition,
+                         (1.0, 0.0, 0.0))
+        self.assertEqual(self.sync.copy(), 0)
+
+    def test_static_moved(self):
+        table = self.logic.objects['table']
+        set_world_pose(table, (2.0, 0.0, 0.0))
+        self.assertEqual(self.sync.nb_static, 1)
+        self.assertEqual(self.sync.copy(), 1)
+        self.assertEqual(self.overlay.objects['table'].worldPosition,
+                         (2.0, 0.0, 0.0))
+
+        # the table is now synchronised at each move
+        table.worldPosition = (3.0, 0.0, 0.0)
+        self.assertEqual(self.sync.copy(), 1)
+        self.assertEqual(self.overlay.objects['table'].worldPosition,
+                         (3.0, 0.0, 0.0))
+
+    def test_static_not_moved(self):
+        # the static objects are put back to their pose at reset
+        wall = self.logic.objects['wall']
+        set_world_pose(wall, (0.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+        forget_world_pose(wall)
+        self.assertEqual(self.sync.nb_static, 2)
+        self.assertEqual(self.sync.copy(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
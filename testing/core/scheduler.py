@@ -0,0 +1,168 @@
+#! /usr/bin/env python
+"""
+This script tests the tick scheduler, and the selection of the robots and
+components it runs, without the simulator: the components and their logic
+bricks are replaced by stand-in objects.
+"""
+
+import unittest
+
+from morse.core import blenderapi
+from morse.core.scheduler import TickScheduler, create_tick_scheduler, \
+                                 ROBOTS, ACTUATORS, SENSORS
+from morse.blender import calling
+from morse.testing.fake_objects import FakeObject, FakeComponent
+
+class FakeSensor(object):
+    positive = True
+
+    def __init__(self, name = 'MORSE_LOGIC', always = True, frequency = 0):
+        self.name = name
+        self.always = always
+        self.frequency = frequency
+        self.usePosPulseMode = True
+
+class FakeController(object):
+    def __init__(self, owner):
+        self.owner = owner
+        self.sensors = owner.sensors
+
+class FakeScene(object):
+    name = 'S.MORSE_LOGIC'
+
+class Component(FakeComponent):
+    """ Component recording the ticks of its actions """
+    tick_scheduled = False
+
+    def __init__(self, name, clock = None, sensors = None):
+        FakeComponent.__init__(self, name)
+        self.clock = clock
+        self.ticks = []
+        obj = self.bge_object
+        obj.sensors = sensors if sensors is not None else [FakeSensor()]
+        obj.controllers = [FakeController(obj)]
+
+    def action(self):
+        self.ticks.append(self.clock() if self.clock else None)
+
+class Failing(Component):
+    def action(self):
+        raise ValueError("failing action")
+
+class TickSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tick = 0
+
+    def clock(self):
+        return self.tick
+
+    def test_period_phase(self):
+        scheduler = TickScheduler(stagger = False)
+        every = Component('every', self.clock)
+        third = Component('third', self.clock)
+        pinned = Component('pinned', self.clock)
+        self.assertEqual(scheduler.add(every, SENSORS), (1, 0))
+        self.assertEqual(scheduler.add(third, SENSORS, 3), (3, 0))
+        self.assertEqual(scheduler.add(pinned, SENSORS, 3, phase = 4), (3, 1))
+        self.assertEqual(len(scheduler), 3)
+
+        self.assertEqual(scheduler.due(0), [every, third])
+        self.assertEqual(scheduler.due(1), [every, pinned])
+        self.assertEqual(scheduler.due(2), [every])
+        for self.tick in range(6):
+            scheduler.run()
+        self.assertEqual(every.ticks, list(range(6)))
+        self.assertEqual(third.ticks, [0, 3])
+        self.assertEqual(pinned.ticks, [1, 4])
+
+    def test_categories(self):
+        scheduler = TickScheduler()
+        sensor = Component('sensor')
+        actuator = Component('actuator')
+        robot = Component('robot')
+        scheduler.add(sensor, SENSORS)
+        scheduler.add(actuator, ACTUATORS)
+        scheduler.add(robot, ROBOTS)
+        # robots, then actuators, then sensors
+        self.assertEqual(scheduler.due(), [robot, actuator, sensor])
+
+    def test_stagger(self):
+        for stagger, load in [(True, [2] * 6), (False, [12, 0, 0, 0, 0, 0])]:
+            scheduler = TickScheduler(stagger = stagger)
+            for i in range(12):
+                scheduler.add(Component('camera%d' % i), SENSORS, 6)
+            self.assertEqual([len(scheduler.due(t)) for t in range(6)], load)
+
+        # an explicit phase is not changed by the stagger
+        scheduler = TickScheduler()
+        scheduler.add(Component('a'), SENSORS, 2)
+        self.assertEqual(scheduler.add(Component('b'), SENSORS, 2, 0), (2, 0))
+        self.assertEqual(scheduler.add(Component('c'), SENSORS, 2), (2, 1))
+
+    def test_failing_action(self):
+        scheduler = TickScheduler()
+        failing = Failing('failing')
+        after = Component('after', self.clock)
+        scheduler.add(failing, ROBOTS)
+        scheduler.add(after, SENSORS)
+        with self.assertLogs('morse.morse.core.scheduler', 'ERROR'):
+            scheduler.run()
+        self.assertEqual(after.ticks, [0])
+        self.assertEqual(scheduler.tick, 1)
+
+class CreateTickSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.simu = blenderapi.PersistantStorage()
+        self.simu.morse_initialised = True
+        self.ssr = {'tick_scheduler': True}
+        self._patched = {}
+        for name, value in [('persistantstorage', lambda: self.simu),
+                            ('getssr', lambda: self.ssr),
+                            ('scene', lambda: FakeScene()),
+                            ('getalwayssensors', lambda obj:
+                                [s for s in obj.sensors if s.always])]:
+            self._patched[name] = getattr(blenderapi, name)
+            setattr(blenderapi, name, value)
+
+    def tearDown(self):
+        for name, value in self._patched.items():
+            setattr(blenderapi, name, value)
+
+    def test_disabled(self):
+        self.ssr = {}
+        self.assertIsNone(create_tick_scheduler())
+
+    def test_logic_bricks(self):
+        camera = Component('camera', sensors = [FakeSensor(frequency = 5)])
+        # read their own logic bricks from their action
+        gripper = Component('gripper', sensors = [FakeSensor(),
+                                    FakeSensor('Radar', always = False)])
+        collision = Component('collision',
+                              sensors = [FakeSensor('Collision', always = False)])
+        sound = Component('sound')
+        sound.bge_object.actuators = ['Sound']
+        self.simu.robotDict = {}
+        self.simu.componentDict = dict((c.name(), c) for c in
+                                       [camera, gripper, collision, sound])
+
+        scheduler = create_tick_scheduler()
+        self.assertEqual(len(scheduler), 1)
+        self.assertTrue(camera.tick_scheduled)
+        self.assertFalse(camera.bge_object.sensors[0].usePosPulseMode)
+        self.assertEqual(scheduler.due(0), [camera])
+        for component in [gripper, collision, sound]:
+            self.assertFalse(component.tick_scheduled)
+            self.assertTrue(component.bge_object.sensors[0].usePosPulseMode)
+
+        # the other components are still run by their logic bricks
+        self.simu.tick_scheduler = scheduler
+        for component in [camera, gripper, collision, sound]:
+            calling.component_action(FakeController(component.bge_object))
+        self.assertEqual(camera.ticks, [])
+        for component in [gripper, collision, sound]:
+            self.assertEqual(component.ticks, [None])
+
+if __name__ == "__main__":
+    unittest.main()
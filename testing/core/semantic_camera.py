@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+"""
+This script tests the selection, through the spatial index, of the objects
+which may be seen by the semantic camera, without the simulator: the camera
+and the tracked objects are replaced by stand-in objects.
+"""
+
+import unittest
+
+from morse.core.spatial_index import SpatialGrid
+from morse.sensors.semantic_camera import SemanticCamera
+from morse.testing.fake_objects import FakeObject
+
+class FakeCamera(object):
+    """ Perspective camera at the origin, looking along the X axis, with
+    horizontal and vertical half fields of view of atan(0.5) """
+    perspective = True
+    projection_matrix = [[2.0, 0.0, 0.0, 0.0],
+                         [0.0, 2.0, 0.0, 0.0],
+                         [0.0, 0.0, -1.0, -1.0],
+                         [0.0, 0.0, -1.0, 0.0]]
+    worldPosition = (0.0, 0.0, 0.0)
+    far = 10.0
+
+    def getAxisVect(self, axis):
+        return (1.0, 0.0, 0.0)
+
+class CandidatesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.camera = SemanticCamera.__new__(SemanticCamera)
+        self.camera.blender_cam = FakeCamera()
+        self.camera._grid = SpatialGrid(cell_size = 2.0)
+
+    def test_frustum_corner(self):
+        # close to the corner of the far plane, 12.1 m away from the camera
+        corner = FakeObject('corner', position = (9.9, 4.9, 4.9))
+        center = FakeObject('center', position = (9.9, 0.0, 0.0))
+        behind = FakeObject('behind', position = (-1.0, 0.0, 0.0))
+        beyond = FakeObject('beyond', position = (10.5, 5.2, 5.2))
+        for obj in [corner, center, behind, beyond]:
+            self.camera._grid.insert(obj)
+
+        candidates = self.camera._candidates()
+        self.assertIn(corner, candidates)
+        self.assertIn(center, candidates)
+        self.assertNotIn(behind, candidates)
+        self.assertNotIn(beyond, candidates)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#! /usr/bin/env python
+"""
+This script tests the lazy computations of Transformation3d, the world
+matrices cached per frame and the cache of the sensor mount, without the
+simulator: the Blender objects are replaced by stand-in objects.
+
+It needs the mathutils module of Blender.
+"""
+
+import math
+import unittest
+
+from morse.core import blenderapi, mathutils
+from morse.core.sensor import Sensor
+from morse.helpers import transformation
+from morse.helpers.transformation import Transformation3d, world_matrix, \
+                                         set_world_pose, forget_world_pose
+from morse.testing.fake_objects import FakeObject
+
+HAS_MATHUTILS = mathutils.Matrix() is not None
+
+def make_object(name, position, yaw = 0.0, parent = None):
+    obj = FakeObject(name, position = mathutils.Vector(position),
+                     orientation = mathutils.Matrix.Rotation(yaw, 3, 'Z'),
+                     parent = parent)
+    obj.localTransform = mathutils.Matrix.Translation(position)
+    return obj
+
+@unittest.skipUnless(HAS_MATHUTILS, "needs the mathutils module of Blender")
+class Transformation3dTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = 1.0
+        self._frame_time = blenderapi.frame_time
+        blenderapi.frame_time = lambda: self.frame
+
+    def tearDown(self):
+        blenderapi.frame_time = self._frame_time
+
+    def test_lazy_invalidation(self):
+        t = Transformation3d(None)
+        self.assertAlmostEqual(t.yaw, 0.0)
+        self.assertAlmostEqual(t.inverse[0][3], 0.0)
+
+        t.translation = (1.0, 2.0, 3.0)
+        self.assertEqual([t.inverse[i][3] for i in range(3)], [-1.0, -2.0, -3.0])
+
+        t.rotation = mathutils.Euler((0.0, 0.0, 0.5)).to_quaternion()
+        self.assertAlmostEqual(t.yaw, 0.5)
+        self.assertAlmostEqual(t.x, 1.0)
+
+        t.matrix = mathutils.Matrix.Rotation(-0.25, 4, 'Z')
+        self.assertAlmostEqual(t.yaw, -0.25)
+        self.assertAlmostEqual(t.inverse.to_euler().z, 0.25)
+
+        # the setters do not modify a matrix shared with another
+        # transformation
+        u = Transformation3d.from_matrix(t.matrix)
+        t.translation = (4.0, 0.0, 0.0)
+        self.assertAlmostEqual(u.x, 0.0)
+
+    def test_world_matrix_cache(self):
+        robot = make_object('robot', (1.0, 0.0, 0.0))
+        sensor = make_object('sensor', (1.5, 0.0, 0.0), parent = robot)
+        self.assertAlmostEqual(Transformation3d(robot).x, 1.0)
+        self.assertAlmostEqual(Transformation3d(sensor).x, 1.5)
+
+        # read once per frame
+        robot.worldPosition = mathutils.Vector((2.0, 0.0, 0.0))
+        self.assertAlmostEqual(world_matrix(robot)[0][3], 1.0)
+
+        # moved during the frame: the robot and its children are read again
+        set_world_pose(robot, (3.0, 0.0, 0.0), mathutils.Matrix.Rotation(0.5, 3, 'Z'))
+        sensor.worldPosition = mathutils.Vector((3.5, 0.0, 0.0))
+        self.assertAlmostEqual(Transformation3d(robot).x, 3.0)
+        self.assertAlmostEqual(Transformation3d(robot).yaw, 0.5)
+        self.assertAlmostEqual(Transformation3d(sensor).x, 3.5)
+
+        robot.worldPosition = mathutils.Vector((4.0, 0.0, 0.0))
+        forget_world_pose(robot)
+        self.assertAlmostEqual(Transformation3d(robot).x, 4.0)
+
+        # next frame
+        robot.worldPosition = mathutils.Vector((5.0, 0.0, 0.0))
+        self.frame = 2.0
+        self.assertAlmostEqual(Transformation3d(robot).x, 5.0)
+
+    def test_mount_cache(self):
+        robot_obj = make_object('robot', (1.0, 0.0, 0.0))
+        sensor_obj = make_object('sensor', (1.5, 0.0, 0.0),
+                                 parent = robot_obj)
+
+        robot = Sensor.__new__(Sensor)
+        robot.bge_object = robot_obj
+        robot.position_3d = Transformation3d(robot_obj)
+        sensor = Sensor.__new__(Sensor)
+        sensor.bge_object = sensor_obj
+        sensor.robot_parent = robot
+        sensor.position_3d = Transformation3d(sensor_obj)
+        sensor._mount = None
+        sensor._sensor_to_robot = None
+
+        mount = sensor.sensor_to_robot_position_3d()
+        self.assertAlmostEqual(mount.x, 0.5)
+        self.assertIs(sensor.sensor_to_robot_position_3d(), mount)
+
+        # the sensor is moved relatively to the robot (by a PTU, ...)
+        sensor_obj.localTransform = mathutils.Matrix.Translation((1.0, 0.0, 0.0))
+        set_world_pose(sensor_obj, (2.0, 0.0, 0.0))
+        sensor.position_3d.update(sensor_obj)
+        mount = sensor.sensor_to_robot_position_3d()
+        self.assertAlmostEqual(mount.x, 1.0)
+        self.assertIs(sensor.sensor_to_robot_position_3d(), mount)
+
+        # not a descendant of the robot: never cached
+        sensor_obj.parent = None
+        self.assertIsNot(sensor.sensor_to_robot_position_3d(),
+                         sensor.sensor_to_robot_position_3d())
+
+if __name__ == "__main__":
+    unittest.main()
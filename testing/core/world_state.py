@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+"""
+This script tests the packing of the state of the robots, without the
+simulator: the robots are replaced by stand-in objects.
+"""
+
+import unittest
+
+from morse.core import blenderapi
+from morse.core.world_state import WorldState, STATE_FIELDS
+from morse.testing.fake_objects import FakeObject
+
+class FakePose(object):
+    """ Pose read from the object by update, as Transformation3d """
+    def __init__(self, obj):
+        self.yaw = self.pitch = self.roll = 0.0
+        self.update(obj)
+
+    def update(self, obj):
+        self.x, self.y, self.z = obj.worldPosition
+
+class FakeRobot(object):
+    def __init__(self, name, position):
+        self._name = name
+        self.bge_object = FakeObject(name, position = position)
+        self.bge_object.worldLinearVelocity = [0.1, 0.0, 0.0]
+        self.bge_object.worldAngularVelocity = [0.0, 0.0, 0.2]
+        self.position_3d = FakePose(self.bge_object)
+
+    def name(self):
+        return self._name
+
+class WorldStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.robot = FakeRobot('robot', (1.0, 0.0, 0.0))
+        self.external = FakeRobot('external', (2.0, 0.0, 0.0))
+        self.storage = {'robotDict': {'robot': self.robot},
+                        'externalRobotDict': {'external': self.external}}
+        self._persistantstorage = blenderapi.persistantstorage
+        blenderapi.persistantstorage = lambda: self.storage
+
+    def tearDown(self):
+        blenderapi.persistantstorage = self._persistantstorage
+
+    def test_pack(self):
+        world_state = WorldState()
+        self.assertEqual(world_state.names, ['external', 'robot'])
+        state = world_state.pack()
+        self.assertEqual(len(state), 2 * len(STATE_FIELDS))
+        self.assertEqual(list(state[len(STATE_FIELDS):]),
+                         [1.0, 0.0, 0.0, 0.0, 0.0, 0.0,
+                          0.1, 0.0, 0.0, 0.0, 0.0, 0.2])
+
+    def test_external_robot_moved(self):
+        world_state = WorldState()
+        # moved by another simulation node: Robot.action is not called
+        self.external.bge_object.worldPosition = (3.0, 4.0, 0.0)
+        state = world_state.pack()
+        self.assertEqual(list(state[:3]), [3.0, 4.0, 0.0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+"""
+This script tests the packing of the PointCloud2 of the laser scanners,
+without the simulator.
+"""
+
+import unittest
+
+import numpy
+from sensor_msgs.msg import PointField
+from morse.middleware.ros.laserscanner import cloud_dtype, point_fields, \
+                                             pack_cloud, XYZ_DTYPE
+
+POINTS = [[1.0, 2.0, 3.0], [-1.5, 0.25, 0.0], [10.0, -3.0, 0.5]]
+
+class PointCloud2Test(unittest.TestCase):
+
+    def check_fields(self, dtype, names):
+        fields = point_fields(dtype)
+        self.assertEqual([f.name for f in fields], names)
+        for f in fields:
+            self.assertEqual(f.offset, dtype.fields[f.name][1])
+            self.assertEqual(f.count, 1)
+        # the fields are aligned, and fit in the point step
+        last = fields[-1]
+        size = 2 if last.datatype == PointField.UINT16 else 4
+        self.assertLessEqual(last.offset + size, dtype.itemsize)
+        for f in fields:
+            self.assertEqual(f.offset % (2 if f.datatype == PointField.UINT16
+                                         else 4), 0)
+        return fields
+
+    def test_fields(self):
+        fields = self.check_fields(XYZ_DTYPE, ['x', 'y', 'z'])
+        self.assertEqual([f.offset for f in fields], [0, 4, 8])
+        self.assertEqual(XYZ_DTYPE.itemsize, 12)
+
+        fields = self.check_fields(cloud_dtype(intensity = True, ring = True),
+                                   ['x', 'y', 'z', 'intensity', 'ring'])
+        self.assertEqual([f.datatype for f in fields],
+                         [PointField.FLOAT32] * 4 + [PointField.UINT16])
+        self.check_fields(cloud_dtype(ring = True), ['x', 'y', 'z', 'ring'])
+
+    def test_xyz(self):
+        data = pack_cloud(XYZ_DTYPE, POINTS)
+        self.assertEqual(data, numpy.array(POINTS, '<f4').tobytes())
+        # batch scan mode
+        array = numpy.array(POINTS, numpy.float32)
+        self.assertEqual(pack_cloud(XYZ_DTYPE, array), data)
+
+    def test_round_trip(self):
+        dtype = cloud_dtype(intensity = True, ring = True)
+        intensity = [0.5, 1.0, 0.0]
+        ring = [0, 1, 3]
+        for points in [POINTS, numpy.array(POINTS, numpy.float32)]:
+            data = pack_cloud(dtype, points, intensity, ring)
+            self.assertEqual(len(data), len(POINTS) * dtype.itemsize)
+
+            # read back as a PointCloud2 consumer would, from the fields
+            for f in point_fields(dtype):
+                type_ = '<u2' if f.datatype == PointField.UINT16 else '<f4'
+                values = numpy.ndarray(len(POINTS), type_, data, f.offset,
+                                       (dtype.itemsize,))
+                if f.name in 'xyz':
+                    expected = [p['xyz'.index(f.name)] for p in POINTS]
+                else:
+                    expected = {'intensity': intensity, 'ring': ring}[f.name]
+                self.assertEqual(values.tolist(), expected)
+
+if __name__ == "__main__":
+    unittest.main()
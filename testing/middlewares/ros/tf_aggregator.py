@@ -0,0 +1,99 @@
+#! /usr/bin/env python
+"""
+This script tests the aggregation of the TF transforms, without the
+simulator: the ROS publishers are replaced by stand-in objects.
+"""
+
+import unittest
+
+from geometry_msgs.msg import TransformStamped
+from morse.middleware.ros.tf_aggregator import TFAggregator, STATIC
+
+class FakePublisher(object):
+    def __init__(self):
+        self.messages = []
+        self.unregistered = False
+
+    def publish(self, message):
+        self.messages.append(message)
+
+    def unregister(self):
+        self.unregistered = True
+
+def transform(child, parent, x = 0.0):
+    t = TransformStamped()
+    t.header.frame_id = parent
+    t.child_frame_id = child
+    t.transform.translation.x = x
+    t.transform.rotation.w = 1.0
+    return t
+
+class TFAggregatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tf = FakePublisher()
+        self.tf_static = FakePublisher()
+        self.aggregator = TFAggregator(self.tf, self.tf_static, list)
+
+    def test_one_message_per_step(self):
+        for i in range(10):
+            self.aggregator.add(transform('robot%d' % i, '/map', i))
+        # the same frame sent twice in a step: only the last one is kept
+        self.aggregator.add(transform('robot0', '/map', 42.0))
+        self.aggregator.flush()
+
+        self.assertEqual(len(self.tf.messages), 1)
+        message = self.tf.messages[0]
+        self.assertEqual(len(message), 10)
+        self.assertEqual(message[0].transform.translation.x, 42.0)
+
+        # nothing sent, nothing published
+        self.aggregator.flush()
+        self.assertEqual(len(self.tf.messages), 1)
+
+    def test_static(self):
+        for step in range(5):
+            self.aggregator.add(transform('robot/laser', 'base_link', 0.3),
+                                STATIC)
+            self.aggregator.add(transform('robot/camera', 'base_link', 0.1),
+                                STATIC)
+            self.aggregator.add(transform('base_link', '/odom', step))
+            self.aggregator.flush()
+
+        # static transforms are published once, in the same message
+        self.assertEqual(len(self.tf_static.messages), 1)
+        self.assertEqual([t.child_frame_id for t in self.tf_static.messages[0]],
+                         ['robot/laser', 'robot/camera'])
+        self.assertEqual(len(self.tf.messages), 5)
+        for message in self.tf.messages:
+            self.assertEqual([t.child_frame_id for t in message], ['base_link'])
+
+    def test_static_changed(self):
+        self.aggregator.add(transform('robot/ptu', 'base_link', 0.0), STATIC)
+        self.aggregator.add(transform('robot/laser', 'base_link', 0.3), STATIC)
+        self.aggregator.flush()
+        self.aggregator.add(transform('robot/ptu', 'base_link', 0.1), STATIC)
+        self.aggregator.add(transform('robot/laser', 'base_link', 0.3), STATIC)
+        self.aggregator.flush()
+
+        # the moving frame is removed from /tf_static, and sent on /tf
+        self.assertEqual(len(self.tf_static.messages), 2)
+        self.assertEqual([t.child_frame_id for t in self.tf_static.messages[1]],
+                         ['robot/laser'])
+        self.assertEqual(len(self.tf.messages), 1)
+        self.assertEqual(self.tf.messages[0][0].transform.translation.x, 0.1)
+
+        self.aggregator.add(transform('robot/ptu', 'base_link', 0.1), STATIC)
+        self.aggregator.flush()
+        self.assertEqual(len(self.tf.messages), 2)
+        self.assertEqual(len(self.tf_static.messages), 2)
+
+    def test_finalize(self):
+        self.aggregator.add(transform('base_link', '/odom'))
+        self.aggregator.finalize()
+        self.assertEqual(len(self.tf.messages), 1)
+        self.assertTrue(self.tf.unregistered)
+        self.assertTrue(self.tf_static.unregistered)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#! /usr/bin/env python
+"""
+This script tests the registration of the streams and the services of the
+socket datastream manager, without the simulator: the components are
+replaced by stand-in objects.
+"""
+
+import time
+import socket
+import unittest
+
+from morse.core.exceptions import MorseRPCInvokationError
+from morse.middleware.socket_datastream import SocketDatastreamManager, \
+                                              SocketPublisher
+from morse.testing.fake_objects import FakeComponent
+
+PUBLISHER = 'morse.middleware.socket_datastream.SocketPublisher'
+BINARY_PUBLISHER = 'morse.middleware.socket_datastream.SocketBinaryPublisher'
+
+class SocketManagerTest(unittest.TestCase):
+
+    def manager(self, **kwargs):
+        manager = SocketDatastreamManager([], kwargs)
+        self.addCleanup(manager.finalize)
+        return manager
+
+    def register(self, manager, name, classpath = PUBLISHER, **kwargs):
+        component = FakeComponent(name, {'timestamp': 0.0, 'x': 0.0})
+        manager.register_component(name, component,
+                                   ['socket', classpath, 'OUT', kwargs])
+        return manager._stream_dict[name]
+
+    def test_register(self):
+        manager = self.manager()
+        stream = self.register(manager, 'pose')
+        self.assertIsNotNone(stream._server)
+        self.assertEqual(manager.get_stream_port('pose'), stream.kwargs['port'])
+        self.assertEqual(manager.get_stream_format('pose'), 'json')
+
+    def test_register_multiplexed(self):
+        manager = self.manager(multiplex = True, multiplex_port = 0)
+        stream = self.register(manager, 'pose')
+        self.assertIs(stream._mux, manager._mux)
+        self.assertIsNone(stream._server)
+        self.assertEqual(manager.get_stream_format('pose'), 'multiplexed')
+
+        # streams with an explicit port, and binary streams, keep their
+        # own server
+        stream = self.register(manager, 'odometry', port = 0)
+        self.assertIsNone(stream._mux)
+        self.assertEqual(manager.get_stream_format('odometry'), 'json')
+        stream = self.register(manager, 'camera', BINARY_PUBLISHER)
+        self.assertIsNone(stream._mux)
+        self.assertEqual(manager.get_stream_format('camera'), 'binary')
+
+    def test_stream_statistics(self):
+        manager = self.manager()
+        stream = SocketPublisher(FakeComponent('pose', {'timestamp': 0.0}),
+                                 {'port': 0})
+        manager._stream_dict['pose'] = stream
+        self.assertEqual(manager.get_stream_statistics('pose'), [])
+
+        client = socket.create_connection(('localhost',
+                                 stream._server.getsockname()[1]))
+        self.addCleanup(client.close)
+        time.sleep(0.05)
+        # the client is accepted at the first tick
+        for i in range(2):
+            stream.default()
+
+        statistics, = manager.get_stream_statistics('pose')
+        self.assertEqual(statistics['sent'] + statistics['dropped'], 2)
+        self.assertGreaterEqual(statistics['sent'], 1)
+        self.assertEqual(statistics['lag'], 0)
+
+        with self.assertRaises(MorseRPCInvokationError):
+            manager.get_stream_statistics('unknown')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+"""
+This script tests the socket publisher with a connected client, without
+the simulator: the component is replaced by a stand-in object, and the
+ticks of the simulation by explicit calls to the publisher.
+"""
+
+import json
+import time
+import select
+import socket
+import unittest
+
+from morse.middleware.socket_datastream import SocketPublisher
+from morse.testing.fake_objects import FakeComponent
+
+class SocketPublisherTest(unittest.TestCase):
+
+    def publisher(self, **kwargs):
+        self.component = FakeComponent('pose', {'timestamp': 0.0, 'x': 0.0})
+        kwargs['port'] = 0
+        publisher = SocketPublisher(self.component, kwargs)
+        self.buffers = {}
+        return publisher
+
+    def connect(self, publisher):
+        client = socket.create_connection(('localhost',
+                                 publisher._server.getsockname()[1]))
+        self.addCleanup(client.close)
+        self.buffers[client] = b''
+        return client
+
+    def tick(self, publisher, dt = 1.0 / 60):
+        self.component.local_data['timestamp'] += dt
+        publisher.default()
+
+    def receive(self, client):
+        """ Return the messages received by client """
+        while select.select([client], [], [], 0.01)[0]:
+            data = client.recv(4096)
+            if not data:
+                break
+            self.buffers[client] += data
+        lines = self.buffers[client].split(b'\n')
+        self.buffers[client] = lines.pop()
+        return [json.loads(line.decode()) for line in lines]
+
+    def test_max_rate(self):
+        publisher = self.publisher(max_rate = 10)
+        client = self.connect(publisher)
+        time.sleep(0.05)
+        messages = []
+        # one second at 60 Hz: most ticks are throttled
+        for i in range(60):
+            self.component.local_data['x'] = float(i)
+            self.tick(publisher)
+            messages.extend(self.receive(client))
+        self.assertGreaterEqual(len(messages), 9)
+        self.assertLessEqual(len(messages), 10)
+        for previous, message in zip(messages, messages[1:]):
+            self.assertGreaterEqual(message['timestamp'] - previous['timestamp'],
+                                    0.099 - 1e-9)
+
+    def test_skip_unchanged(self):
+        publisher = self.publisher(skip_unchanged = True)
+        # published before the client connects: received as the last message
+        self.tick(publisher)
+        client = self.connect(publisher)
+        time.sleep(0.05)
+        messages = []
+        for i in range(20):
+            self.tick(publisher)
+            messages.extend(self.receive(client))
+        self.component.local_data['x'] = 1.0
+        for i in range(20):
+            self.tick(publisher)
+            messages.extend(self.receive(client))
+        self.assertEqual([m['x'] for m in messages], [0.0, 1.0])
+
+    def test_late_joiner(self):
+        publisher = self.publisher(skip_unchanged = True)
+        # the client connects just before the only publication
+        client = self.connect(publisher)
+        time.sleep(0.05)
+        messages = []
+        for i in range(20):
+            self.tick(publisher)
+            messages.extend(self.receive(client))
+        self.assertEqual([m['x'] for m in messages], [0.0])
+
+        # a new client receives the last message, even if unchanged
+        other = self.connect(publisher)
+        time.sleep(0.05)
+        for i in range(5):
+            self.tick(publisher)
+        self.assertEqual([m['x'] for m in self.receive(other)], [0.0])
+        self.assertEqual(self.receive(client), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#! /usr/bin/env python
+"""
+This script tests the encoding of the binary multi-node protocol, without
+the simulator.
+"""
+
+import math
+import unittest
+
+from morse.multinode import protocol
+
+class BinaryProtocolTest(unittest.TestCase):
+
+    def test_frames(self):
+        data = protocol.encode_hello('nodeA') + \
+               protocol.encode_names([(0, 'robot1'), (1, 'röbot2')]) + \
+               protocol.encode_subscribe(['robot3', 'robot4']) + \
+               protocol.encode_subscribe() + \
+               protocol.encode_update(4.5, [(0, 1, 2, 3, 0, 0, 0.5),
+                                            (1, -1, -2, -3, 0.25, 0, 0)])
+        reader = protocol.FrameReader()
+        frames = []
+        # the frames may be received in several chunks
+        for i in range(0, len(data), 7):
+            frames.extend(reader.feed(data[i:i + 7]))
+
+        self.assertEqual([kind for kind, _ in frames], [protocol.HELLO,
+                         protocol.NAMES, protocol.SUBSCRIBE, protocol.SUBSCRIBE,
+                         protocol.UPDATE])
+        self.assertEqual(frames[0][1], b'nodeA')
+        self.assertEqual(protocol.decode_names(frames[1][1]),
+                         [(0, 'robot1'), (1, 'röbot2')])
+        self.assertEqual(protocol.decode_subscribe(frames[2][1]),
+                         set(['robot3', 'robot4']))
+        self.assertIsNone(protocol.decode_subscribe(frames[3][1]))
+        timestamp, records = protocol.decode_update(frames[4][1])
+        self.assertEqual(timestamp, 4.5)
+        self.assertEqual(records, [(0, 1, 2, 3, 0, 0, 0.5),
+                                   (1, -1, -2, -3, 0.25, 0, 0)])
+
+    def test_interest(self):
+        data = protocol.encode_interest([(0, 0, 10, 10), (-5, -5, 5, 5)],
+                                        [(3, 20.0)])
+        (kind, payload), = protocol.FrameReader().feed(data)
+        self.assertEqual(kind, protocol.INTEREST)
+        self.assertEqual(protocol.decode_interest(payload),
+                         ([(0, 0, 10, 10), (-5, -5, 5, 5)], [(3, 20.0)]))
+
+    def test_interest_grid(self):
+        grid = protocol.InterestGrid(cell_size = 10.0)
+        for i in range(100):
+            grid.move('robot%d' % i, i * 3.0, -i * 3.0)
+        self.assertEqual(len(grid), 100)
+        self.assertEqual(grid.query_box(0, -10, 10, 0),
+                         set(['robot0', 'robot1', 'robot2', 'robot3']))
+        self.assertEqual(grid.query_radius(30, -30, 5),
+                         set(['robot9', 'robot10', 'robot11']))
+        # a query larger than the populated area
+        self.assertEqual(len(grid.query_box(-1e4, -1e4, 1e4, 1e4)), 100)
+
+        # moving to another cell
+        grid.move('robot0', 500, 500)
+        self.assertEqual(grid.position('robot0'), (500, 500))
+        self.assertNotIn('robot0', grid.query_box(0, -10, 10, 0))
+        self.assertEqual(grid.query_radius(500, 500, 1), set(['robot0']))
+
+    def test_record_size(self):
+        update = protocol.encode_update(0.0, [(i, 0, 0, 0, 0, 0, 0)
+                                              for i in range(500)])
+        self.assertEqual(len(update), protocol.HEADER.size +
+                         protocol.UPDATE_HEADER.size + 500 * 28)
+
+    def test_invalid(self):
+        reader = protocol.FrameReader()
+        with self.assertRaises(protocol.ProtocolError):
+            reader.feed(b'["node1", {}]\n')
+
+    def test_moved(self):
+        pose = (1.0, 0.0, 0.0, 0.0, 0.0, math.pi)
+        self.assertTrue(protocol.moved(pose, None, 0.01, 0.01))
+        self.assertFalse(protocol.moved(pose, (1.005, 0, 0, 0, 0, math.pi),
+                                        0.01, 0.01))
+        self.assertTrue(protocol.moved(pose, (1.02, 0, 0, 0, 0, math.pi),
+                                       0.01, 0.01))
+        # the angles wrap around
+        self.assertFalse(protocol.moved(pose, (1.0, 0, 0, 0, 0, -math.pi),
+                                        0.01, 0.01))
+        self.assertTrue(protocol.moved(pose, (1.0, 0, 0, 0.1, 0, math.pi),
+                                       0.01, 0.01))
+
+if __name__ == "__main__":
+    unittest.main()